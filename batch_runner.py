@@ -0,0 +1,197 @@
+import argparse
+import csv
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from typing import Any, Callable, Dict, Iterable, List, Optional, TextIO
+
+from dotenv import load_dotenv
+
+from intent_router import route_query, run_route
+from jira_utils import JiraBotError, get_jira_client
+from llm_rate_limiter import llm_priority, PRIORITY_BACKGROUND
+
+load_dotenv()
+
+BATCH_MAX_WORKERS = int(os.getenv("BATCH_MAX_WORKERS", "4"))
+# Tools that ask for confirmation on stdin cannot run unattended.
+BATCH_EXCLUDED_TOOLS = {"create_ticket_tool"}
+CSV_COLUMNS = ["id", "query", "tool", "route", "ok", "latency_seconds", "output", "error"]
+
+
+def read_jobs(lines: Iterable[str]) -> List[Dict[str, Any]]:
+    """
+    Parses JSONL jobs: {"query": "..."} runs through the router or agent, {"tool": "...", "input": {...}}
+    calls a tool directly. "id" is optional and defaults to the line number. Lines that do not parse
+    become jobs carrying an error, so they are reported alongside the others.
+    """
+    jobs = []
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            job = json.loads(line)
+            if not isinstance(job, dict) or not (job.get("query") or job.get("tool")):
+                raise ValueError("expected an object with a 'query' or a 'tool'")
+        except ValueError as e:
+            job = {"error": f"Line {line_number} is not a valid job: {e}"}
+        job.setdefault("id", str(line_number))
+        jobs.append(job)
+    return jobs
+
+
+class BatchRunner:
+    """
+    Runs batch jobs on a worker pool. The Jira client, the LLM clients and the agent are built once
+    and shared by every worker; LLM calls run at background priority.
+    """
+
+    def __init__(self, use_router: bool = True):
+        self.use_router = use_router
+        self._agent = None
+        self._agent_lock = threading.Lock()
+
+    def warm_up(self) -> None:
+        """Connects the shared Jira and Azure OpenAI clients before the workers start."""
+        from llm_config import get_llm, get_shared_azure_openai_client
+        for warm_up in (get_jira_client, get_shared_azure_openai_client, get_llm):
+            try:
+                warm_up()
+            except Exception as e:
+                print(f"WARNING: Could not warm up a client: {e}", file=sys.stderr)
+
+    def _batch_tools(self) -> list:
+        from jira_tools import ALL_JIRA_TOOLS
+        return [tool for tool in ALL_JIRA_TOOLS if tool.name not in BATCH_EXCLUDED_TOOLS]
+
+    def _get_agent(self):
+        with self._agent_lock:
+            if self._agent is None:
+                from jira_agent import get_jira_agent
+                self._agent = get_jira_agent(tools=self._batch_tools())
+            return self._agent
+
+    def _run_tool(self, tool_name: str, tool_input: Dict[str, Any]) -> Any:
+        if tool_name in BATCH_EXCLUDED_TOOLS:
+            raise JiraBotError(f"'{tool_name}' needs interactive confirmation and cannot run in a batch.")
+        tool = next((tool for tool in self._batch_tools() if tool.name == tool_name), None)
+        if tool is None:
+            raise JiraBotError(f"Unknown tool '{tool_name}'.")
+        return tool.invoke(tool_input)
+
+    def run_job(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Runs one job and returns its result record; failures are recorded rather than raised."""
+        record = {"id": job["id"], "query": job.get("query"), "tool": job.get("tool"), "route": None, "ok": False, "output": None, "error": job.get("error")}
+        started = time.perf_counter()
+        if record["error"] is None:
+            try:
+                with llm_priority(PRIORITY_BACKGROUND):
+                    if job.get("tool"):
+                        record["route"] = job["tool"]
+                        record["output"] = self._run_tool(job["tool"], job.get("input") or {})
+                    else:
+                        route = route_query(job["query"]) if self.use_router else None
+                        if route is not None:
+                            record["route"] = route[0]
+                            result = run_route(route)
+                        else:
+                            record["route"] = "agent"
+                            result = self._get_agent().invoke({"input": job["query"], "chat_history": []})
+                        record["output"] = result.get("output")
+                        issues = [output for _, output in result.get("intermediate_steps", []) if isinstance(output, list)]
+                        if issues:
+                            record["issues"] = issues[0]
+                record["ok"] = True
+            except Exception as e:
+                record["error"] = str(e)
+        record["latency_seconds"] = round(time.perf_counter() - started, 3)
+        return record
+
+    def run(self, jobs: List[Dict[str, Any]], write: Callable[[Dict[str, Any]], None], max_workers: int = BATCH_MAX_WORKERS) -> List[Dict[str, Any]]:
+        """Runs the jobs concurrently and passes each record to write as soon as its job finishes."""
+        records = []
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(jobs) or 1))) as executor:
+            futures = [executor.submit(self.run_job, job) for job in jobs]
+            for future in as_completed(futures):
+                record = future.result()
+                write(record)
+                records.append(record)
+        return records
+
+
+class RecordWriter:
+    """Writes result records as JSONL or CSV, flushing after each one so results stream out."""
+
+    def __init__(self, stream: TextIO, output_format: str = "jsonl"):
+        self._stream = stream
+        self._lock = threading.Lock()
+        self._csv = csv.DictWriter(stream, fieldnames=CSV_COLUMNS, extrasaction="ignore") if output_format == "csv" else None
+        if self._csv is not None:
+            self._csv.writeheader()
+
+    def __call__(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            if self._csv is not None:
+                row = dict(record)
+                if not isinstance(row.get("output"), (str, type(None))):
+                    row["output"] = json.dumps(row["output"], ensure_ascii=False)
+                self._csv.writerow(row)
+            else:
+                self._stream.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            self._stream.flush()
+
+
+def print_latency_summary(records: List[Dict[str, Any]], wall_seconds: float, stream: TextIO = sys.stderr) -> None:
+    """Prints each job's route and latency, then totals and percentiles."""
+    print("\n--- Batch Latency Summary ---", file=stream)
+    for record in sorted(records, key=lambda record: record["latency_seconds"], reverse=True):
+        status = "ok" if record["ok"] else "FAILED"
+        print(f"{record['id']:>8}  {record['latency_seconds']:8.2f}s  {status:6}  {record['route'] or '-'}  {record['query'] or record['tool'] or ''}", file=stream)
+    latencies = sorted(record["latency_seconds"] for record in records)
+    if not latencies:
+        print("No jobs were run.", file=stream)
+        return
+    p95 = latencies[min(len(latencies) - 1, int(round(0.95 * (len(latencies) - 1))))]
+    failed = sum(1 for record in records if not record["ok"])
+    print(f"Jobs: {len(records)} ({failed} failed) | Wall time: {wall_seconds:.2f}s | Sum of latencies: {sum(latencies):.2f}s", file=stream)
+    print(f"Latency p50: {statistics.median(latencies):.2f}s | p95: {p95:.2f}s | max: {latencies[-1]:.2f}s", file=stream)
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Runs JIRA queries from a JSONL file without the interactive prompt.")
+    parser.add_argument("input", nargs="?", default="-", help="JSONL file of jobs, or '-' for stdin (default)")
+    parser.add_argument("-o", "--output", default="-", help="Where to write results, or '-' for stdout (default)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Output format (default: from the output file extension, else jsonl)")
+    parser.add_argument("--workers", type=int, default=BATCH_MAX_WORKERS, help="Jobs run at once")
+    parser.add_argument("--no-router", action="store_true", help="Send every query to the agent instead of routing simple ones to their tool")
+    args = parser.parse_args(argv)
+
+    output_format = args.format or ("csv" if args.output.lower().endswith(".csv") else "jsonl")
+    if args.input == "-":
+        jobs = read_jobs(sys.stdin)
+    else:
+        with open(args.input, encoding="utf-8") as f:
+            jobs = read_jobs(f)
+
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        # Tool progress messages go to stderr, so stdout carries only the results.
+        with redirect_stdout(sys.stderr):
+            runner = BatchRunner(use_router=not args.no_router)
+            runner.warm_up()
+            started = time.perf_counter()
+            records = runner.run(jobs, RecordWriter(output, output_format), max_workers=args.workers)
+        print_latency_summary(records, time.perf_counter() - started)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 0 if all(record["ok"] for record in records) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+import os
+import re
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from llm_config import get_llm
+from summarization import count_tokens
+
+if TYPE_CHECKING:
+    from langchain_core.messages import BaseMessage
+
+load_dotenv()
+
+# Token budget for the history sent with each agent turn (rolling summary plus the recent turns).
+CHAT_HISTORY_TOKEN_BUDGET = int(os.getenv("CHAT_HISTORY_TOKEN_BUDGET", "2000"))
+# Most turns kept verbatim. Past that, the older turns are folded into the rolling summary in one batch,
+# leaving about half of them, so the summary is updated every few turns rather than on each one.
+CHAT_HISTORY_RECENT_TURNS = int(os.getenv("CHAT_HISTORY_RECENT_TURNS", "4"))
+# Answers longer than this are stored as a compact reference (issue keys plus one-line gists).
+CHAT_HISTORY_ANSWER_TOKENS = int(os.getenv("CHAT_HISTORY_ANSWER_TOKENS", "300"))
+CHAT_HISTORY_SUMMARY_TOKENS = int(os.getenv("CHAT_HISTORY_SUMMARY_TOKENS", "500"))
+# Tickets listed in one compact reference.
+CHAT_HISTORY_REFERENCE_ITEMS = 15
+
+_ISSUE_KEY = re.compile(r'\b[A-Z][A-Z0-9]+-[1-9]\d*\b')
+
+Turn = Tuple[str, str]
+
+
+def _gist(text: str, max_chars: int = 160) -> str:
+    """First sentence of text that is not a header or a URL, cut to max_chars."""
+    for line in text.splitlines():
+        line = re.sub(r'https?://\S+', '', line).strip(" -*#:")
+        if len(line) > 20:
+            sentence = re.split(r'(?<=[.!?])\s', line, maxsplit=1)[0]
+            return sentence if len(sentence) <= max_chars else sentence[:max_chars - 3] + "..."
+    return ""
+
+def compact_answer(result: Dict[str, Any]) -> str:
+    """
+    Returns the answer to keep in history for an agent (or router) result. Short answers are kept as they are;
+    long ones, and ticket lists from tools, become a reference: the tools used, the issue keys and a one-line gist each.
+    """
+    answer = result.get("output") or ""
+    steps = result.get("intermediate_steps") or []
+    listed = [item for _, output in steps if isinstance(output, list) for item in output if isinstance(item, dict) and 'key' in item]
+    if not listed and count_tokens(answer) <= CHAT_HISTORY_ANSWER_TOKENS:
+        return answer
+    tools = ", ".join(dict.fromkeys(action.tool for action, _ in steps)) or "answer"
+    if listed:
+        lines = [f"- {item['key']}: {item.get('summary', '')}" for item in listed[:CHAT_HISTORY_REFERENCE_ITEMS]]
+        total = len(listed)
+    else:
+        # Each ticket's gist is taken from the text following its first mention.
+        keys = list(dict.fromkeys(_ISSUE_KEY.findall(answer)))
+        lines = [f"- {key}: {_gist(answer[answer.index(key) + len(key):])}".rstrip(": ") for key in keys[:CHAT_HISTORY_REFERENCE_ITEMS]]
+        total = len(keys)
+        if not lines:
+            lines = [_gist(answer)]
+    more = f"\n(and {total - len(lines)} more)" if total > len(lines) else ""
+    return f"[Compacted {tools} result ({count_tokens(answer)} tokens); ask again for the full text]\n" + "\n".join(lines) + more
+
+def _summarize_turns(summary: str, turns: List[Turn]) -> str:
+    transcript = "\n".join(f"User: {user}\nAssistant: {answer}" for user, answer in turns)
+    prompt = f"""
+    You maintain the running summary of a JIRA triage conversation.
+    Update the summary below with the new exchanges. Keep issue keys, programs, projects and decisions the user made;
+    drop pleasantries and detail that was only shown once. Stay under {CHAT_HISTORY_SUMMARY_TOKENS * 3 // 4} words.
+
+    **Summary So Far:**
+    {summary or "(empty)"}
+
+    **New Exchanges:**
+    {transcript}
+    """
+    return get_llm(temperature=0.0).invoke(prompt).content.strip()
+
+def _newest_lines_within_budget(lines: List[str]) -> str:
+    kept = []
+    for line in reversed(lines):
+        if count_tokens("\n".join([line] + kept)) > CHAT_HISTORY_SUMMARY_TOKENS:
+            break
+        kept.insert(0, line)
+    if not kept and lines:
+        # A single line over budget keeps its end, at about four characters per token.
+        return lines[-1][-CHAT_HISTORY_SUMMARY_TOKENS * 4:]
+    return "\n".join(kept)
+
+def _fallback_summary(summary: str, turns: List[Turn]) -> str:
+    """Appends one line per turn to the summary, keeping the newest lines that fit the summary budget."""
+    lines = summary.splitlines() + [f"- User asked: {user[:200]} -> {_gist(answer, 120) or answer[:120]}" for user, answer in turns]
+    return _newest_lines_within_budget(lines)
+
+
+class ChatHistoryManager:
+    """
+    Keeps the chat history sent to the agent within a token budget: the last few turns verbatim
+    (with long answers compacted), and everything older folded into one rolling summary.
+    """
+
+    def __init__(self, token_budget: int = CHAT_HISTORY_TOKEN_BUDGET, recent_turns: int = CHAT_HISTORY_RECENT_TURNS, summarize: Optional[Callable[[str, List[Turn]], str]] = None):
+        self.token_budget = token_budget
+        self.recent_turns = max(1, recent_turns)
+        self.summary = ""
+        self.turns: List[Turn] = []
+        self._summarize = summarize or _summarize_turns
+
+    def _over_budget(self) -> bool:
+        return len(self.turns) > 1 and self.prompt_tokens() > self.token_budget
+
+    def add_turn(self, user_input: str, result: Dict[str, Any]) -> None:
+        self.turns.append((user_input, compact_answer(result)))
+        if len(self.turns) <= self.recent_turns and not self._over_budget():
+            return
+        keep = max(1, self.recent_turns // 2)
+        folded = self.turns[:-keep]
+        self.turns = self.turns[-keep:]
+        while self._over_budget():
+            folded.append(self.turns.pop(0))
+        if folded:
+            self._fold(folded)
+
+    def _fold(self, turns: List[Turn]) -> None:
+        try:
+            # Runs before the next prompt is shown, so the user does wait on it; folding in batches keeps it rare.
+            summary = self._summarize(self.summary, turns)
+        except Exception as e:
+            print(f"WARNING: Could not summarize older chat turns, keeping a short digest instead: {e}")
+            summary = _fallback_summary(self.summary, turns)
+        if count_tokens(summary) > CHAT_HISTORY_SUMMARY_TOKENS:
+            summary = _newest_lines_within_budget(summary.splitlines())
+        self.summary = summary
+
+    def prompt_tokens(self) -> int:
+        """Approximate tokens the history adds to each agent prompt."""
+        return count_tokens(self.summary) + sum(count_tokens(user) + count_tokens(answer) for user, answer in self.turns)
+
+    def messages(self) -> List["BaseMessage"]:
+        """The history as LangChain messages for the agent's chat_history placeholder."""
+        from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+        messages = []
+        if self.summary:
+            messages.append(SystemMessage(content=f"Summary of the earlier conversation:\n{self.summary}"))
+        for user, answer in self.turns:
+            messages.extend([HumanMessage(content=user), AIMessage(content=answer)])
+        return messages
@@ -0,0 +1,137 @@
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from jql_builder import (
+    _is_valid_jira_key_format, _fast_extract_params, FAST_PATH_FILLER_WORDS, program_map, triage_assignment_map
+)
+
+load_dotenv()
+
+INTENT_ROUTER_ENABLED = os.getenv("INTENT_ROUTER_ENABLED", "true").lower() == "true"
+
+# Words that pick the tool. A request naming more than one of these intents goes to the agent.
+INTENT_WORDS = {
+    "summarize": {"summarize", "summarise", "summary", "summaries", "recap", "overview"},
+    "duplicates": {"duplicate", "duplicates", "duplicated", "dupe", "dupes"},
+    "similar": {"similar", "alike"},
+    "options": {"options", "values", "choices"},
+}
+# Words that may surround a routed request without changing what it asks for.
+# Any other word (e.g. "why", "root", "compare", "create") sends the request to the agent.
+ROUTER_FILLER_WORDS = FAST_PATH_FILLER_WORDS | {
+    "up", "do", "does", "there", "other", "possible", "potential", "these", "this", "those", "both",
+    "them", "it", "about", "like", "valid", "available", "allowed", "are", "were", "field", "tell",
+    "check", "could", "would", "have", "has", "need", "each", "every", "how", "many", "be", "me", "i",
+}
+# "system" and "triage assignment" come first: their questions also name the program or category they depend on.
+OPTION_FIELDS = ("silicon revision", "triage assignment", "triage category", "severity", "system", "program")
+_OPTION_FIELD_WORDS = {word for field in OPTION_FIELDS for word in field.split()} | {"systems", "revisions", "categories", "assignments", "levels"}
+
+Route = Tuple[str, Dict[str, Any]]
+
+
+def _words(query: str) -> List[str]:
+    return [word.strip(".,;:!?()'\"") for word in query.split()]
+
+def _issue_keys(words: List[str]) -> List[str]:
+    keys = []
+    for word in words:
+        if '-' in word and _is_valid_jira_key_format(word) and word.upper() not in keys:
+            keys.append(word.upper())
+    return keys
+
+def _route_field_options(query: str, leftover: List[str]) -> Optional[Route]:
+    lowered = query.lower()
+    field_name = next((field for field in OPTION_FIELDS if field in lowered), None)
+    if field_name is None:
+        return None
+    leftover = [word for word in leftover if word not in _OPTION_FIELD_WORDS]
+    dependencies = {"system": program_map, "triage assignment": triage_assignment_map}.get(field_name)
+    depends_on = None
+    if dependencies is not None:
+        depends_on = next((word.upper() for word in leftover if word.upper() in dependencies), None)
+        if depends_on is None:
+            return None
+        leftover = [word for word in leftover if word.upper() != depends_on]
+    if leftover:
+        return None
+    tool_input = {"field_name": field_name}
+    if depends_on:
+        tool_input["depends_on"] = depends_on
+    return ("get_field_options_tool", tool_input)
+
+def route_query(query: str) -> Optional[Route]:
+    """
+    Maps an unambiguous request to a (tool name, tool input) pair that can skip the agent, e.g.
+    "summarize PLAT-1234" or "find duplicates of PLAT-99". Returns None for anything else: several
+    intents, no intent, the wrong number of issue keys, or words the router does not understand.
+    """
+    words = _words(query)
+    keys = _issue_keys(words)
+    lowered = [word.lower() for word in words if word and word.upper() not in keys]
+    intents = {intent for intent, verbs in INTENT_WORDS.items() if verbs.intersection(lowered)}
+    leftover = [word for word in lowered if word not in ROUTER_FILLER_WORDS and not any(word in verbs for verbs in INTENT_WORDS.values())]
+
+    if not intents:
+        # Plain searches the local parser understands (no LLM call) are routed as well.
+        if not keys and _fast_extract_params(query) is not None:
+            return ("jira_search_tool", {"original_query": query})
+        return None
+    if len(intents) > 1:
+        return None
+    intent = intents.pop()
+    if intent == "options":
+        return None if keys else _route_field_options(query, leftover)
+    if leftover:
+        return None
+    if intent == "summarize" and len(keys) == 1:
+        return ("summarize_ticket_tool", {"issue_key": keys[0]})
+    if intent == "summarize" and len(keys) > 1:
+        return ("summarize_multiple_tickets_tool", {"issue_keys": keys})
+    if intent == "duplicates" and len(keys) == 1:
+        return ("find_duplicate_tickets_tool", {"issue_key": keys[0]})
+    if intent == "similar" and len(keys) == 1:
+        return ("find_similar_tickets_tool", {"issue_key": keys[0]})
+    return None
+
+
+def _render_output(output: Any) -> str:
+    """Renders a tool's result as the answer text; ticket lists become one line per ticket."""
+    if isinstance(output, list):
+        lines = []
+        for item in output:
+            if isinstance(item, dict) and 'key' in item:
+                lines.append(f"- {item['key']}: {item.get('summary', '')} ({item.get('status', '')}) {item.get('url', '')}".rstrip())
+            else:
+                lines.append(str(item))
+        return "\n".join(lines)
+    return str(output)
+
+def route_tool(route: Route) -> Any:
+    """Returns the tool a route calls, announcing the route."""
+    from jira_tools import ALL_JIRA_TOOLS
+
+    tool_name, tool_input = route
+    print(f"--- Routed directly to {tool_name} with {tool_input} ---")
+    return next(tool for tool in ALL_JIRA_TOOLS if tool.name == tool_name)
+
+def route_result(route: Route, output: Any) -> Dict[str, Any]:
+    """
+    Wraps a routed tool's output in the shape of the agent's invoke result
+    ({"output", "intermediate_steps"}), so callers can print and record it the same way.
+    """
+    from langchain_core.agents import AgentAction
+
+    tool_name, tool_input = route
+    if tool_name == "jira_search_tool":
+        answer = f"Found {len(output)} issues." if output else "No issues found."
+    else:
+        answer = _render_output(output)
+    action = AgentAction(tool=tool_name, tool_input=tool_input, log=f"Routed directly to {tool_name}.\n")
+    return {"output": answer, "intermediate_steps": [(action, output)]}
+
+def run_route(route: Route) -> Dict[str, Any]:
+    """Calls the routed tool directly and returns its result in the agent's shape."""
+    return route_result(route, route_tool(route).invoke(route[1]))
@@ -1,20 +1,76 @@
-import os
-from langchain.tools import tool
-from typing import List, Dict, Any, Optional
-from jira import JIRA
-from langchain.agents import AgentExecutor, create_tool_calling_agent
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_core.language_models.chat_models import BaseChatModel
-from jira_utils import search_jira_issues, get_ticket_details, initialize_jira_client, create_jira_issue, JiraBotError
-from jql_builder import (
-    extract_params, build_jql, program_map, system_map,
-    VALID_SILICON_REVISIONS, VALID_TRIAGE_CATEGORIES, triage_assignment_map,
-    VALID_SEVERITY_LEVELS
-)
+import json
+from typing import TYPE_CHECKING, Any, List, Optional, Sequence, Tuple
 from llm_config import get_llm
-from jira_tools import ALL_JIRA_TOOLS
 
-def get_jira_agent() -> AgentExecutor:
+if TYPE_CHECKING:
+    from langchain.agents import AgentExecutor
+    from langchain_core.agents import AgentAction
+    from langchain_core.messages import BaseMessage
+    from langchain_core.tools import BaseTool
+
+# Column order for ticket lists in the scratchpad; any other fields follow in first-seen order.
+TICKET_TABLE_COLUMNS = ["key", "summary", "status", "assignee", "priority", "created", "updated"]
+
+
+def _table_cell(value: Any) -> str:
+    return " ".join(str(value).split()).replace("|", "/") if value is not None else ""
+
+def encode_tool_observation(observation: Any) -> str:
+    """
+    Renders a tool result for the agent scratchpad. Ticket lists become a header row plus one
+    pipe-separated row per ticket, with browse URLs left out when they can be derived from the key;
+    lists of messages become one line each. Anything else is encoded as the default formatter would.
+    """
+    if isinstance(observation, str):
+        return observation
+    if isinstance(observation, list) and observation and all(isinstance(item, str) for item in observation):
+        return "\n".join(observation)
+    if isinstance(observation, list) and observation and all(isinstance(item, dict) and 'key' in item for item in observation):
+        from jira_utils import _issue_url  # Imported here so loading the agent module does not load the jira library.
+
+        derived_urls = all(item.get('url') in (None, _issue_url(item['key'])) for item in observation)
+        columns = [column for column in TICKET_TABLE_COLUMNS if any(column in item for item in observation)]
+        for item in observation:
+            columns.extend(column for column in item if column not in columns and not (column == "url" and derived_urls))
+        lines = [f"Tickets: {len(observation)}." + (f" URL of each: {_issue_url('<key>')}" if derived_urls else ""), "|".join(columns)]
+        lines.extend("|".join(_table_cell(item.get(column)) for column in columns) for item in observation)
+        return "\n".join(lines)
+    try:
+        return json.dumps(observation, ensure_ascii=False)
+    except TypeError:
+        return str(observation)
+
+def format_compact_tool_messages(intermediate_steps: Sequence[Tuple["AgentAction", Any]]) -> List["BaseMessage"]:
+    """
+    LangChain's format_to_tool_messages, but with tool results encoded by encode_tool_observation.
+    The scratchpad is re-sent on every agent iteration, so its size is paid for many times; the full
+    results still reach the caller through intermediate_steps.
+    """
+    from langchain.agents.output_parsers.tools import ToolAgentAction
+    from langchain_core.messages import AIMessage, ToolMessage
+
+    messages = []
+    for agent_action, observation in intermediate_steps:
+        if isinstance(agent_action, ToolAgentAction):
+            tool_message = ToolMessage(
+                tool_call_id=agent_action.tool_call_id,
+                content=encode_tool_observation(observation),
+                additional_kwargs={"name": agent_action.tool}
+            )
+            messages.extend(message for message in [*agent_action.message_log, tool_message] if message not in messages)
+        else:
+            messages.append(AIMessage(content=agent_action.log))
+    return messages
+
+
+def get_jira_agent(tools: Optional[Sequence["BaseTool"]] = None) -> "AgentExecutor":
+    # LangChain's agent machinery and the tools are imported here rather than at module level,
+    # so importing this module stays cheap until an agent is actually built.
+    from langchain.agents import AgentExecutor, create_tool_calling_agent
+    from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+    from jira_tools import ALL_JIRA_TOOLS
+
+    tools = list(tools) if tools is not None else ALL_JIRA_TOOLS
     llm = get_llm()
 
     system_message = """
@@ -45,11 +101,11 @@ def get_jira_agent() -> AgentExecutor:
         ]
     )
 
-    agent = create_tool_calling_agent(llm, ALL_JIRA_TOOLS, prompt)
+    agent = create_tool_calling_agent(llm, tools, prompt, message_formatter=format_compact_tool_messages)
 
     agent_executor = AgentExecutor(
         agent=agent,
-        tools=ALL_JIRA_TOOLS,
+        tools=tools,
         verbose=False, 
         handle_parsing_errors=True,
         max_iterations=15,
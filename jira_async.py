@@ -0,0 +1,297 @@
+import asyncio
+import os
+import random
+import threading
+from typing import Any, Awaitable, Dict, List, Optional, Tuple, TypeVar
+
+import httpx
+from jira.resources import dict2resource
+
+from jira_transport import (
+    JIRA_CONNECT_TIMEOUT, JIRA_SEARCH_READ_TIMEOUT, JIRA_ISSUE_READ_TIMEOUT, JIRA_HTTP_POOL_SIZE,
+    JIRA_HTTP_MAX_RETRIES, JIRA_HTTP_BACKOFF_FACTOR, JIRA_HTTP_BACKOFF_JITTER, JIRA_HTTP_BACKOFF_MAX, RETRY_STATUS_CODES
+)
+from jira_utils import (
+    JIRA_SERVER_URL, JIRA_USERNAME, JIRA_PASSWORD, JIRA_SEARCH_PAGE_SIZE, JIRA_SEARCH_MAX_RESULTS, JIRA_BULK_FETCH_CHUNK_SIZE,
+    SEARCH_RESULT_FIELDS, SearchResults, TICKET_DETAIL_FIELDS, TICKET_DETAIL_CACHE_FIELDS, TICKET_ANALYSIS_FIELDS, COMMENT_TAIL_SIZE, JiraBotError,
+    _get_mirror, _get_mirrored_issue, _format_search_result, _format_ticket_details,
+    _comment_tail_request, _comment_tail_from_page, _attach_comment_tail, _trim_embedded_comments,
+    _start_bulk_results, _cached_entries, _reuse_entries
+)
+from ticket_cache import get_ticket_cache
+
+# Upper bound on Jira requests in flight at once, shared by every coroutine using the client.
+JIRA_ASYNC_MAX_CONCURRENCY = int(os.getenv("JIRA_ASYNC_MAX_CONCURRENCY", "8"))
+
+T = TypeVar("T")
+
+
+class AsyncJiraClient:
+    """
+    A minimal asyncio client for the Jira REST endpoints the bot reads (search, issue and comments).
+    Requests share one connection pool, are bounded by a semaphore, and are retried on 429/5xx
+    with the same backoff settings as the synchronous transport.
+    """
+
+    def __init__(self, server: Optional[str] = None, auth: Optional[Tuple[str, str]] = None, max_concurrency: int = JIRA_ASYNC_MAX_CONCURRENCY, transport: Optional[httpx.AsyncBaseTransport] = None):
+        server = server or JIRA_SERVER_URL
+        auth = auth or (JIRA_USERNAME, JIRA_PASSWORD)
+        if not server or not all(auth):
+            raise JiraBotError("JIRA environment variables (URL, USERNAME, PASSWORD) are not set. Please check .env file.")
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._http = httpx.AsyncClient(
+            base_url=f"{server.rstrip('/')}/rest/api/2",
+            auth=auth,
+            headers={"Accept": "application/json"},
+            limits=httpx.Limits(max_connections=JIRA_HTTP_POOL_SIZE, max_keepalive_connections=JIRA_HTTP_POOL_SIZE),
+            timeout=httpx.Timeout(JIRA_ISSUE_READ_TIMEOUT, connect=JIRA_CONNECT_TIMEOUT),
+            transport=transport
+        )
+
+    @staticmethod
+    def _backoff(attempt: int, response: Optional[httpx.Response]) -> float:
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), JIRA_HTTP_BACKOFF_MAX)
+        delay = JIRA_HTTP_BACKOFF_FACTOR * (2 ** attempt) + random.uniform(0, JIRA_HTTP_BACKOFF_JITTER)
+        return min(delay, JIRA_HTTP_BACKOFF_MAX)
+
+    async def get_json(self, path: str, params: Dict[str, Any], read_timeout: float = JIRA_ISSUE_READ_TIMEOUT) -> Dict[str, Any]:
+        """GETs a REST path and returns the decoded JSON, raising JiraBotError (with status_code and retries) on failure."""
+        timeout = httpx.Timeout(read_timeout, connect=JIRA_CONNECT_TIMEOUT)
+        async with self._semaphore:
+            for attempt in range(JIRA_HTTP_MAX_RETRIES + 1):
+                response = None
+                try:
+                    response = await self._http.get(path, params=params, timeout=timeout)
+                except httpx.TransportError as e:
+                    if attempt == JIRA_HTTP_MAX_RETRIES:
+                        raise JiraBotError(f"Jira request to '{path}' failed: {e} (gave up after {attempt} retries)", retries=attempt)
+                else:
+                    if response.status_code not in RETRY_STATUS_CODES or attempt == JIRA_HTTP_MAX_RETRIES:
+                        break
+                await asyncio.sleep(self._backoff(attempt, response))
+        if response.is_success:
+            return response.json()
+        message = f"Jira request to '{path}' failed: {response.text[:500]}. Status code: {response.status_code}"
+        if attempt:
+            message = f"{message} (gave up after {attempt} retries)"
+        error = JiraBotError(message, retries=attempt)
+        error.status_code = response.status_code
+        raise error
+
+    async def search(self, jql: str, start_at: int, max_results: int, fields: str, validate_query: bool = True) -> Dict[str, Any]:
+        params = {"jql": jql, "startAt": start_at, "maxResults": max_results, "fields": fields}
+        if not validate_query:
+            # Jira then skips unknown or hidden keys instead of rejecting the whole query.
+            params["validateQuery"] = "false"
+        return await self.get_json("/search", params, read_timeout=JIRA_SEARCH_READ_TIMEOUT)
+
+    async def issue(self, issue_key: str, fields: str) -> Dict[str, Any]:
+        return await self.get_json(f"/issue/{issue_key}", {"fields": fields})
+
+    async def comment_tail(self, issue_key: str, tail_size: int = COMMENT_TAIL_SIZE) -> Tuple[List[dict], int]:
+        """Returns the newest tail_size comments (oldest first) and the total comment count."""
+        path = f"/issue/{issue_key}/comment"
+        page = await self.get_json(path, _comment_tail_request(tail_size))
+        total = page.get("total", 0)
+        tail = _comment_tail_from_page(page, tail_size)
+        if tail is None:
+            page = await self.get_json(path, {"startAt": max(0, total - tail_size), "maxResults": tail_size})
+            tail = _comment_tail_from_page(page, tail_size, ordered=False)
+        return tail, total
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+
+# All async Jira work runs on one long-lived event loop in a daemon thread, so the client's
+# pool and semaphore stay bound to a single loop while synchronous callers (the tools) submit work.
+_LOOP = None
+_LOOP_LOCK = threading.Lock()
+_ASYNC_CLIENT = None
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    global _LOOP
+    if _LOOP is None:
+        with _LOOP_LOCK:
+            if _LOOP is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="jira-async-loop", daemon=True).start()
+                _LOOP = loop
+    return _LOOP
+
+def run_async(coroutine: Awaitable[T]) -> T:
+    """Runs a coroutine on the shared Jira event loop and blocks until it finishes. Safe to call from any thread."""
+    return asyncio.run_coroutine_threadsafe(coroutine, _get_loop()).result()
+
+def get_async_jira_client() -> AsyncJiraClient:
+    """Returns the process-wide AsyncJiraClient. Must be called from the shared event loop (i.e. inside run_async)."""
+    global _ASYNC_CLIENT
+    if _ASYNC_CLIENT is None:
+        _ASYNC_CLIENT = AsyncJiraClient()
+    return _ASYNC_CLIENT
+
+
+async def async_search_jira_issues(jql_query: str, client: Optional[AsyncJiraClient] = None, limit: Optional[int] = 20, page_size: int = JIRA_SEARCH_PAGE_SIZE) -> SearchResults:
+    """
+    Async counterpart of search_jira_issues. After the first page reports the total,
+    the remaining pages are requested concurrently.
+    """
+    client = client or get_async_jira_client()
+    if limit is None or limit > JIRA_SEARCH_MAX_RESULTS:
+        limit = JIRA_SEARCH_MAX_RESULTS
+    if page_size <= 0:
+        raise JiraBotError(f"Search page size must be a positive number, got {page_size}.")
+    if (mirror := _get_mirror()) is not None and (mirrored_issues := mirror.search(jql_query, limit)) is not None:
+        print(f"\nServed JIRA search from the local mirror: {jql_query} | {len(mirrored_issues)} issues")
+        return SearchResults(mirrored_issues, limit)
+    print(f"\nAttempting async JIRA search with JQL: {jql_query} | Limit: {limit}")
+
+    async def fetch_page(start_at: int) -> List[dict]:
+        try:
+            page = await client.search(jql_query, start_at, min(page_size, limit - start_at), SEARCH_RESULT_FIELDS)
+        except JiraBotError as e:
+            raise JiraBotError(f"JIRA search failed for JQL '{jql_query}': {e}. Please refine the query.", retries=e.retries)
+        return page
+
+    first_page = await fetch_page(0)
+    raw_issues = list(first_page.get("issues", []))
+    total = min(first_page.get("total", len(raw_issues)), limit)
+    if len(raw_issues) < total:
+        remaining = await asyncio.gather(*(fetch_page(start_at) for start_at in range(len(raw_issues), total, page_size)))
+        for page in remaining:
+            raw_issues.extend(page.get("issues", []))
+
+    formatted_issues = SearchResults((_format_search_result(dict2resource(raw)) for raw in raw_issues[:limit]), limit)
+    if not formatted_issues:
+        print("No issues found for the given JQL.")
+        return formatted_issues
+    print(f"Successfully found {len(formatted_issues)} issues.")
+    return formatted_issues
+
+async def _fetch_issue(issue_key: str, fields: str, client: AsyncJiraClient, action: str, with_comment_tail: bool = False):
+    """
+    Async counterpart of jira_utils._fetch_issue: serves the mirror or a current ticket cache entry when
+    possible, so a ticket fetched by one tool is not downloaded again by the next.
+    """
+    issue = _get_mirrored_issue(issue_key)
+    if issue is not None:
+        return issue
+    cache_fields = f"{fields},comment" if with_comment_tail else fields
+    cache = get_ticket_cache()
+    try:
+        if cache is not None:
+            entry = cache.lookup(issue_key, cache_fields)
+            if entry is not None:
+                revalidate = cache.needs_revalidation(entry)
+                if not revalidate or (await client.issue(issue_key, "updated")).get("fields", {}).get("updated") == entry["updated"]:
+                    cache.record_hit(issue_key, revalidated=revalidate)
+                    return dict2resource(entry["raw"])
+            cache.record_miss()
+        if with_comment_tail:
+            # The issue and its newest comments are independent requests, so they run concurrently.
+            raw, (comments, total) = await asyncio.gather(client.issue(issue_key, fields), client.comment_tail(issue_key))
+        else:
+            raw = await client.issue(issue_key, fields)
+        issue = dict2resource(raw)
+        issue.raw = raw
+        if with_comment_tail:
+            issue = _attach_comment_tail(issue, comments, total)
+        if cache is not None:
+            cache.put(issue_key, cache_fields, raw)
+        return issue
+    except JiraBotError as e:
+        if getattr(e, "status_code", None) == 404:
+            raise JiraBotError(f"Ticket '{issue_key}' not found.")
+        raise JiraBotError(f"Failed to get {action} for '{issue_key}': {e}", retries=e.retries)
+
+async def _async_reuse_cached_issues(issue_keys: List[str], client: AsyncJiraClient) -> dict:
+    """Async counterpart of jira_utils._reuse_cached_issues."""
+    cache, entries, to_revalidate = _cached_entries(issue_keys)
+    current_updated = {}
+    if to_revalidate:
+        try:
+            page = await client.search(f"key in ({', '.join(to_revalidate)})", 0, len(to_revalidate), "updated", validate_query=False)
+            current_updated = {raw["key"]: raw.get("fields", {}).get("updated") for raw in page.get("issues", [])}
+        except JiraBotError as e:
+            print(f"WARNING: Could not revalidate cached tickets ({e}). Fetching them again.")
+    return _reuse_entries(cache, entries, to_revalidate, current_updated) if cache is not None else {}
+
+async def async_get_multiple_ticket_issues(issue_keys: List[str], client: Optional[AsyncJiraClient] = None, chunk_size: int = JIRA_BULK_FETCH_CHUNK_SIZE) -> dict:
+    """
+    Async counterpart of get_multiple_ticket_issues. The chunked searches run concurrently, and so do
+    the comment requests for tickets Jira embedded only some comments of and the direct fetches of
+    keys the searches skipped.
+    """
+    client = client or get_async_jira_client()
+    results, valid_keys = _start_bulk_results(issue_keys)
+    cached_issues = await _async_reuse_cached_issues(valid_keys, client)
+    results.update(cached_issues)
+    valid_keys = [key for key in valid_keys if key not in cached_issues]
+    cache = get_ticket_cache()
+
+    async def fetch_chunk(chunk: List[str]) -> List[dict]:
+        print(f"Fetching details for {len(chunk)} tickets in one request: {', '.join(chunk)}")
+        try:
+            page = await client.search(f"key in ({', '.join(chunk)})", 0, len(chunk), TICKET_DETAIL_CACHE_FIELDS, validate_query=False)
+        except JiraBotError as e:
+            if e.retries:
+                # Jira is already throttling or failing; one request per key would only add to the load.
+                error = JiraBotError(f"Failed to fetch ticket details: {e}", retries=e.retries)
+                for key in chunk:
+                    results[key] = error
+            else:
+                print(f"WARNING: Bulk fetch failed ({e}). Falling back to fetching these tickets one by one.")
+            return []
+        return page.get("issues", [])
+
+    async def complete(raw: dict):
+        issue = dict2resource(raw)
+        issue.raw = raw
+        try:
+            if not _trim_embedded_comments(issue):
+                comments, total = await client.comment_tail(issue.key)
+                issue = _attach_comment_tail(issue, comments, total)
+        except JiraBotError as e:
+            return JiraBotError(f"An unexpected error occurred while fetching ticket details: {e}", retries=e.retries)
+        if cache is not None:
+            cache.put(issue.key, TICKET_DETAIL_CACHE_FIELDS, raw)
+            cache.record_miss()
+        return issue
+
+    async def fetch_one(key: str):
+        try:
+            return await _fetch_issue(key, TICKET_DETAIL_FIELDS, client, "details", with_comment_tail=True)
+        except JiraBotError as e:
+            return e
+
+    pages = await asyncio.gather(*(fetch_chunk(valid_keys[i:i + chunk_size]) for i in range(0, len(valid_keys), chunk_size)))
+    found = [raw for page in pages for raw in page if raw.get("key") in results and results[raw["key"]] is None]
+    for raw, issue in zip(found, await asyncio.gather(*(complete(raw) for raw in found))):
+        results[raw["key"]] = issue
+    # Keys the searches did not return are missing, forbidden or moved; a direct fetch gives the precise reason.
+    missing = [key for key in valid_keys if results[key] is None]
+    for key, issue in zip(missing, await asyncio.gather(*(fetch_one(key) for key in missing))):
+        results[key] = issue
+    return results
+
+async def async_get_ticket_details(issue_key: str, client: Optional[AsyncJiraClient] = None) -> Tuple[str, str]:
+    """Async counterpart of get_ticket_details. Returns (details_as_text, ticket_url)."""
+    print(f"Fetching details for ticket: {issue_key}")
+    issue = await _fetch_issue(issue_key, TICKET_DETAIL_FIELDS, client or get_async_jira_client(), "details", with_comment_tail=True)
+    return _format_ticket_details(issue)
+
+async def async_get_ticket_data_for_analysis(issue_key: str, client: Optional[AsyncJiraClient] = None) -> dict:
+    """Async counterpart of get_ticket_data_for_analysis."""
+    print(f"Fetching data for ticket {issue_key} for analysis...")
+    issue = await _fetch_issue(issue_key, TICKET_ANALYSIS_FIELDS, client or get_async_jira_client(), "data")
+    data = {
+        "key": issue.key,
+        "summary": issue.fields.summary,
+        "description": issue.fields.description or "",
+        "project": issue.fields.project.key
+    }
+    if getattr(issue.fields, 'customfield_13002', None):
+        data['program'] = issue.fields.customfield_13002
+    return data
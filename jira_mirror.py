@@ -0,0 +1,328 @@
+import argparse
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from jira import JIRA
+from jira.resources import dict2resource
+
+from jira_utils import (
+    JiraBotError, initialize_jira_client, iter_raw_issues, _format_search_result,
+    TICKET_DETAIL_FIELDS, JIRA_USERNAME
+)
+from local_store import open_database
+
+load_dotenv()
+
+JIRA_MIRROR_ENABLED = os.getenv("JIRA_MIRROR_ENABLED", "false").lower() == "true"
+# A project is served from the mirror only if it was synced within this many seconds.
+JIRA_MIRROR_MAX_AGE_SECONDS = int(os.getenv("JIRA_MIRROR_MAX_AGE_SECONDS", "900"))
+# JQL dates are read in the Jira user's timezone, so incremental syncs re-read this much
+# before the watermark; re-read issues are simply overwritten.
+JIRA_MIRROR_WATERMARK_OVERLAP_MINUTES = int(os.getenv("JIRA_MIRROR_WATERMARK_OVERLAP_MINUTES", "1440"))
+JIRA_MIRROR_PAGE_SIZE = int(os.getenv("JIRA_MIRROR_PAGE_SIZE", "100"))
+MIRROR_FIELDS = f"{TICKET_DETAIL_FIELDS},comment,priority,reporter"
+
+_QUOTED = r'''(?:'([^']*)'|"([^"]*)")'''
+_CLAUSES = [
+    ("project", re.compile(rf'project\s*=\s*{_QUOTED}', re.IGNORECASE)),
+    ("exclude_key", re.compile(rf'(?:issueKey|key)\s*!=\s*{_QUOTED}', re.IGNORECASE)),
+    ("priority", re.compile(rf'priority\s*=\s*{_QUOTED}', re.IGNORECASE)),
+    ("program", re.compile(rf'(?:program|"program")\s*=\s*{_QUOTED}', re.IGNORECASE)),
+    ("status", re.compile(r'status\s+in\s*\(([^)]*)\)', re.IGNORECASE)),
+    ("date", re.compile(rf'(created|updated)\s*(<=|>=|<|>)\s*{_QUOTED}', re.IGNORECASE)),
+    ("user", re.compile(rf'(assignee|reporter)\s*=\s*(?:(currentUser\(\))|{_QUOTED})', re.IGNORECASE)),
+    ("text", re.compile(r'\(((?:(?:summary|description)\s*~\s*"[^"]*"(?:\s+OR\s+)?)+)\)', re.IGNORECASE)),
+]
+_AND = re.compile(r'\s+AND\s+', re.IGNORECASE)
+_ORDER_BY = re.compile(r'\s*ORDER BY\s+(created|updated)\s+(ASC|DESC)\s*$', re.IGNORECASE)
+
+
+def _to_utc_iso(jira_timestamp: Optional[str]) -> Optional[str]:
+    """Converts a Jira timestamp like '2024-01-03T10:00:00.000+0100' to a sortable UTC 'YYYY-MM-DDTHH:MM:SS'."""
+    if not jira_timestamp:
+        return None
+    parsed = datetime.strptime(jira_timestamp, "%Y-%m-%dT%H:%M:%S.%f%z")
+    return parsed.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+
+def _jql_date_to_utc_iso(value: str) -> Optional[str]:
+    """Resolves the relative ('-30d', '-2w') and absolute ('YYYY-MM-DD') dates build_jql emits."""
+    if match := re.fullmatch(r'-(\d+)([dw])', value):
+        days = int(match.group(1)) * (7 if match.group(2) == "w" else 1)
+        return (datetime.now(timezone.utc) - timedelta(days=days)).strftime("%Y-%m-%dT%H:%M:%S")
+    if re.fullmatch(r'\d{4}-\d{2}-\d{2}', value):
+        return f"{value}T00:00:00"
+    return None
+
+def _quoted_value(match: re.Match, first_group: int) -> str:
+    single, double = match.group(first_group), match.group(first_group + 1)
+    return single if single is not None else double
+
+def _first_program(value: Any) -> Optional[str]:
+    """Reduces the Program custom field (string, option or list of either) to its first value."""
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        value = value.get("value")
+    return str(value) if value else None
+
+def translate_jql(jql: str) -> Optional[Tuple[str, List[Any], str, List[str]]]:
+    """
+    Translates the subset of JQL the bot generates into (where_sql, params, order_sql, projects).
+    Returns None for anything outside that subset, so the caller falls back to the live server.
+    Text search ('~') is approximated with a case-insensitive substring match.
+    """
+    order_sql = "created_utc DESC"
+    if order_match := _ORDER_BY.search(jql):
+        order_sql = f"{order_match.group(1).lower()}_utc {order_match.group(2).upper()}"
+        jql = jql[:order_match.start()]
+
+    conditions, params, projects = [], [], []
+    position = 0
+    jql = jql.strip()
+    while position < len(jql):
+        for kind, pattern in _CLAUSES:
+            match = pattern.match(jql, position)
+            if match:
+                break
+        else:
+            return None
+
+        if kind == "project":
+            projects.append(_quoted_value(match, 1))
+            conditions.append("project = ?")
+            params.append(projects[-1])
+        elif kind == "exclude_key":
+            conditions.append("key != ?")
+            params.append(_quoted_value(match, 1).upper())
+        elif kind in ("priority", "program"):
+            conditions.append(f"{kind} = ?")
+            params.append(_quoted_value(match, 1))
+        elif kind == "status":
+            statuses = re.findall(r'"([^"]*)"|\'([^\']*)\'', match.group(1))
+            values = [double or single for double, single in statuses]
+            conditions.append(f"status IN ({', '.join('?' for _ in values)})")
+            params.extend(values)
+        elif kind == "date":
+            cutoff = _jql_date_to_utc_iso(_quoted_value(match, 3))
+            if cutoff is None:
+                return None
+            conditions.append(f"{match.group(1).lower()}_utc {match.group(2)} ?")
+            params.append(cutoff)
+        elif kind == "user":
+            field = match.group(1).lower()
+            name = JIRA_USERNAME if match.group(2) else _quoted_value(match, 3)
+            conditions.append(f"({field}_name = ? OR {field}_display = ?)")
+            params.extend([name, name])
+        elif kind == "text":
+            text_conditions = []
+            for field, term in re.findall(r'(summary|description)\s*~\s*"([^"]*)"', match.group(1), re.IGNORECASE):
+                text_conditions.append(f"{field.lower()} LIKE ?")
+                params.append(f"%{term}%")
+            conditions.append(f"({' OR '.join(text_conditions)})")
+
+        position = match.end()
+        if position < len(jql):
+            separator = _AND.match(jql, position)
+            if not separator:
+                return None
+            position = separator.end()
+
+    if not projects:
+        return None
+    return " AND ".join(conditions), params, order_sql, projects
+
+
+class JiraMirror:
+    """
+    A local SQLite copy of Jira issues and their comments, refreshed incrementally by 'updated' watermark.
+    Reads fall back to the live server (by returning None) whenever a project is not mirrored or is stale.
+    Issues deleted in Jira stay in the mirror until a full sync of their project.
+    """
+
+    def __init__(self, filename: str = "jira_mirror.sqlite3", max_age_seconds: int = JIRA_MIRROR_MAX_AGE_SECONDS):
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._db = open_database(filename)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS issues (
+                key TEXT PRIMARY KEY,
+                project TEXT NOT NULL,
+                program TEXT,
+                status TEXT,
+                priority TEXT,
+                assignee_name TEXT,
+                assignee_display TEXT,
+                reporter_name TEXT,
+                reporter_display TEXT,
+                summary TEXT,
+                description TEXT,
+                created_utc TEXT,
+                updated_utc TEXT,
+                raw TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_issues_project ON issues (project);
+            CREATE INDEX IF NOT EXISTS idx_issues_program ON issues (program);
+            CREATE INDEX IF NOT EXISTS idx_issues_status ON issues (status);
+            CREATE INDEX IF NOT EXISTS idx_issues_assignee ON issues (assignee_display);
+            CREATE INDEX IF NOT EXISTS idx_issues_updated ON issues (updated_utc);
+            CREATE TABLE IF NOT EXISTS comments (
+                issue_key TEXT NOT NULL,
+                comment_id TEXT NOT NULL,
+                created_utc TEXT,
+                raw TEXT NOT NULL,
+                PRIMARY KEY (issue_key, comment_id)
+            );
+            CREATE TABLE IF NOT EXISTS sync_state (
+                project TEXT PRIMARY KEY,
+                watermark_utc TEXT,
+                last_synced_at REAL NOT NULL
+            );
+        """)
+        self._db.commit()
+
+    def _upsert_issue(self, raw: Dict[str, Any]) -> None:
+        fields = dict(raw.get("fields") or {})
+        comment_field = fields.pop("comment", None) or {}
+        assignee = fields.get("assignee") or {}
+        reporter = fields.get("reporter") or {}
+        self._db.execute(
+            "INSERT OR REPLACE INTO issues VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                raw["key"], (fields.get("project") or {}).get("key"), _first_program(fields.get("customfield_13002")),
+                (fields.get("status") or {}).get("name"), (fields.get("priority") or {}).get("name"),
+                assignee.get("name"), assignee.get("displayName"), reporter.get("name"), reporter.get("displayName"),
+                fields.get("summary"), fields.get("description"),
+                _to_utc_iso(fields.get("created")), _to_utc_iso(fields.get("updated")),
+                json.dumps({"key": raw["key"], "fields": fields})
+            )
+        )
+        self._db.execute("DELETE FROM comments WHERE issue_key = ?", (raw["key"],))
+        self._db.executemany(
+            "INSERT INTO comments VALUES (?, ?, ?, ?)",
+            [(raw["key"], str(comment.get("id")), _to_utc_iso(comment.get("created")), json.dumps(comment)) for comment in comment_field.get("comments", [])]
+        )
+
+    def sync_project(self, client: JIRA, project: str, full: bool = False) -> int:
+        """
+        Pulls every issue of the project updated since the last watermark (or all issues when full=True)
+        and returns how many were written.
+        """
+        with self._lock:
+            row = self._db.execute("SELECT watermark_utc FROM sync_state WHERE project = ?", (project,)).fetchone()
+            if full:
+                self._db.execute("DELETE FROM comments WHERE issue_key IN (SELECT key FROM issues WHERE project = ?)", (project,))
+                self._db.execute("DELETE FROM issues WHERE project = ?", (project,))
+                self._db.commit()
+        watermark = row[0] if row and not full else None
+
+        jql = f'project = "{project}"'
+        if watermark:
+            since = datetime.strptime(watermark, "%Y-%m-%dT%H:%M:%S") - timedelta(minutes=JIRA_MIRROR_WATERMARK_OVERLAP_MINUTES)
+            jql += f' AND updated >= "{since.strftime("%Y/%m/%d %H:%M")}"'
+        jql += " ORDER BY updated ASC"
+
+        print(f"Syncing Jira mirror for project '{project}' with JQL: {jql}")
+        sync_started_at = time.time()
+        written = 0
+        newest = watermark
+        for issue in iter_raw_issues(jql, client, page_size=JIRA_MIRROR_PAGE_SIZE, fields=MIRROR_FIELDS):
+            with self._lock:
+                self._upsert_issue(issue.raw)
+                written += 1
+                if written % JIRA_MIRROR_PAGE_SIZE == 0:
+                    self._db.commit()
+            updated = _to_utc_iso(issue.raw.get("fields", {}).get("updated"))
+            if updated and (newest is None or updated > newest):
+                newest = updated
+
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO sync_state (project, watermark_utc, last_synced_at) VALUES (?, ?, ?)",
+                (project, newest, sync_started_at)
+            )
+            self._db.commit()
+        print(f"Mirror sync for '{project}' wrote {written} issues. Watermark is now {newest}.")
+        return written
+
+    def is_fresh(self, project: str) -> bool:
+        with self._lock:
+            row = self._db.execute("SELECT last_synced_at FROM sync_state WHERE project = ?", (project,)).fetchone()
+        return row is not None and time.time() - row[0] <= self.max_age_seconds
+
+    def search(self, jql: str, limit: int) -> Optional[List[dict]]:
+        """Answers a JQL search from the mirror in the same format as search_jira_issues, or returns None to go live."""
+        translated = translate_jql(jql)
+        if translated is None:
+            return None
+        where_sql, params, order_sql, projects = translated
+        if not all(self.is_fresh(project) for project in projects):
+            return None
+        with self._lock:
+            rows = self._db.execute(f"SELECT raw FROM issues WHERE {where_sql} ORDER BY {order_sql} LIMIT ?", (*params, limit)).fetchall()
+        return [_format_search_result(dict2resource(json.loads(raw))) for (raw,) in rows]
+
+    def get_issue(self, issue_key: str):
+        """Returns the mirrored issue with its comments as a jira-style resource, or None if it is missing or stale."""
+        with self._lock:
+            row = self._db.execute("SELECT raw, project FROM issues WHERE key = ?", (issue_key.upper(),)).fetchone()
+            if row is None:
+                return None
+            comments = self._db.execute(
+                "SELECT raw FROM comments WHERE issue_key = ? ORDER BY created_utc", (issue_key.upper(),)
+            ).fetchall()
+        if not self.is_fresh(row[1]):
+            return None
+        raw = json.loads(row[0])
+        comment_list = [json.loads(comment) for (comment,) in comments]
+        raw["fields"]["comment"] = {"comments": comment_list, "total": len(comment_list)}
+        return dict2resource(raw)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            issues = self._db.execute("SELECT COUNT(*) FROM issues").fetchone()[0]
+            projects = self._db.execute("SELECT project, watermark_utc, last_synced_at FROM sync_state").fetchall()
+        return {
+            "issues": issues,
+            "projects": {project: {"watermark": watermark, "age_seconds": round(time.time() - synced)} for project, watermark, synced in projects},
+        }
+
+
+_MIRROR = None
+_MIRROR_LOCK = threading.Lock()
+
+def get_mirror() -> Optional[JiraMirror]:
+    """Returns the process-wide Jira mirror, or None unless JIRA_MIRROR_ENABLED is true."""
+    global _MIRROR
+    if not JIRA_MIRROR_ENABLED:
+        return None
+    if _MIRROR is None:
+        with _MIRROR_LOCK:
+            if _MIRROR is None:
+                _MIRROR = JiraMirror()
+    return _MIRROR
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync the local Jira mirror for one or more projects.")
+    parser.add_argument("projects", nargs="+", help="Project keys to mirror, e.g. PLAT SWDEV")
+    parser.add_argument("--full", action="store_true", help="Drop the mirrored issues and re-read the whole project")
+    args = parser.parse_args()
+
+    try:
+        client = initialize_jira_client()
+        mirror = JiraMirror()
+        for project in args.projects:
+            mirror.sync_project(client, project.upper(), full=args.full)
+        print(json.dumps(mirror.stats(), indent=2))
+    except JiraBotError as e:
+        print(f"Mirror sync failed: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,114 @@
 import os
 from langchain.tools import tool
-from typing import List, Dict, Any, Optional
-from jira import JIRA
-from jira_utils import search_jira_issues, get_ticket_details, initialize_jira_client, create_jira_issue, JiraBotError, get_ticket_data_for_analysis
+from langchain_core.runnables.config import ContextThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
+from jira_utils import search_jira_issues, get_ticket_issue, get_jira_client, create_jira_issue, JiraBotError, get_ticket_data_for_analysis, _format_ticket_details
+from jira_async import run_async, async_search_jira_issues, async_get_ticket_data_for_analysis, async_get_multiple_ticket_issues
 from jql_builder import (
     extract_params, build_jql, program_map, system_map,
     VALID_SILICON_REVISIONS, VALID_TRIAGE_CATEGORIES, triage_assignment_map,
-    VALID_SEVERITY_LEVELS, extract_keywords_from_text, get_summary_similarity_score
+    VALID_SEVERITY_LEVELS, extract_keywords_from_text, get_summary_similarity_scores
 )
 from llm_config import get_llm
+from similarity_index import SummaryIndex
+from summarization import compact_ticket_text, get_token_budget, reduce_summaries
+from summary_store import get_summary_store, ticket_state, plan_refresh
 
-JIRA_CLIENT_INSTANCE = None
-try:
-    JIRA_CLIENT_INSTANCE = initialize_jira_client()
-except JiraBotError as e:
-    print(f"CRITICAL ERROR: Could not initialize JIRA client at startup. Tools will not work: {e}")
-
-def _get_single_ticket_summary(issue_key: str, question: str) -> str:
-    """Internal helper to get a summary for one ticket, tailored to a specific question."""
-    if JIRA_CLIENT_INSTANCE is None:
-        raise JiraBotError("JIRA client not initialized.")
-    sanitized_key = issue_key.replace('_', '-').upper()
+# Upper bound on the per-ticket LLM calls summarize_multiple_tickets_tool runs at once.
+SUMMARY_MAX_WORKERS = int(os.getenv("SUMMARY_MAX_WORKERS", "4"))
+
+# Duplicate detection ranks every candidate locally and only asks the LLM to confirm the best few.
+DUPLICATE_CANDIDATE_LIMIT = int(os.getenv("DUPLICATE_CANDIDATE_LIMIT", "300"))
+DUPLICATE_CONFIRM_TOP_K = int(os.getenv("DUPLICATE_CONFIRM_TOP_K", "5"))
+LOCAL_SIMILARITY_THRESHOLD = float(os.getenv("LOCAL_SIMILARITY_THRESHOLD", "0.3"))
+SIMILARITY_THRESHOLD = 8
+
+
+def _find_likely_duplicates(source_summary: str, candidate_tickets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Ranks all candidates against the source summary with the local TF-IDF index,
+    then confirms only the top DUPLICATE_CONFIRM_TOP_K with one batched LLM similarity request.
+    """
+    candidates = [candidate for candidate in candidate_tickets if candidate.get('summary')]
+    if not candidates:
+        return []
+    index = SummaryIndex([candidate['summary'] for candidate in candidates])
+    shortlist = index.top_k(source_summary, DUPLICATE_CONFIRM_TOP_K, min_score=LOCAL_SIMILARITY_THRESHOLD)
+    print(f"--- Local similarity shortlisted {len(shortlist)} of {len(candidates)} candidates for LLM confirmation. ---")
+    if not shortlist:
+        return []
+    shortlisted = [candidates[position] for position, _ in shortlist]
+    try:
+        similarity_scores = get_summary_similarity_scores(source_summary, [candidate['summary'] for candidate in shortlisted])
+    except JiraBotError as e:
+        print(f"WARNING: Could not compare summaries with the LLM. Error: {e}")
+        return []
+    duplicate_tickets = []
+    for candidate, (_, local_score), similarity_score in zip(shortlisted, shortlist, similarity_scores):
+        if similarity_score >= SIMILARITY_THRESHOLD:
+            print(f"--- Found likely duplicate: {candidate['key']} with score {similarity_score} (local {local_score:.2f}) ---")
+            duplicate_tickets.append(candidate)
+    return duplicate_tickets
+
+def _sanitize_issue_key(issue_key: str) -> str:
+    return issue_key.strip().replace('_', '-').upper()
+
+def _render_comments(comments: List[Any]) -> str:
+    return "\n".join(
+        f"Comment by {getattr(comment.author, 'displayName', 'Unknown author')} on {comment.created[:10]}:\n{comment.body}\n{'-' * 10}"
+        for comment in comments
+    )
+
+def _get_single_ticket_summary(issue_key: str, question: str, issue: Optional[Any] = None, token_budget: Optional[int] = None) -> str:
+    """
+    Internal helper to get a summary for one ticket, tailored to a specific question.
+    Pass a pre-fetched issue (e.g. from async_get_multiple_ticket_issues) to skip the Jira round trip.
+    The ticket text is compacted to token_budget (the summarize_ticket_tool budget by default).
+    A stored summary is returned as is while the ticket is unchanged, and updated from just the
+    new comments when nothing else changed.
+    """
+    sanitized_key = _sanitize_issue_key(issue_key)
     print(f"Generating summary for {sanitized_key} based on question: '{question}'...")
-    details_text, ticket_url = get_ticket_details(sanitized_key, JIRA_CLIENT_INSTANCE)
-    llm = get_llm()
-    prompt = f"""
+    if issue is None:
+        issue = get_ticket_issue(sanitized_key, get_jira_client())
+    details_text, ticket_url = _format_ticket_details(issue)
+
+    store = get_summary_store()
+    stored = store.get(sanitized_key, question) if store is not None else None
+    state = ticket_state(issue, details_text)
+    comments = list(getattr(getattr(issue.fields, 'comment', None), 'comments', None) or [])
+    action, new_comments = plan_refresh(stored, state, comments)
+    if action == "reuse":
+        print(f"--- {sanitized_key} has not changed since its last summary. Reusing it. ---")
+        store.record("reused")
+        return stored["summary"]
+
+    llm = get_llm(temperature=0.0)
+    if action == "incremental":
+        print(f"--- Updating the stored summary of {sanitized_key} with {len(new_comments)} new comments. ---")
+        prompt = f"""
+    You are an expert engineering assistant. Below is your previous answer to a user's question about a JIRA ticket,
+    followed by the comments added to the ticket since then. Nothing else on the ticket has changed.
+
+    **User's Question:** "{question}"
+    **Previous Answer:**
+    ---
+    {stored["summary"]}
+    ---
+    **New Comments (oldest first):**
+    ---
+    {_render_comments(new_comments)}
+    ---
+
+    **Instructions:**
+    1.  Rewrite the previous answer so it reflects the new comments, keeping its structure and its first line with the ticket key and link.
+    2.  Update the analysis, root cause and blockers where the new comments change them; keep everything that is still accurate.
+
+    **Answer:**
+    """
+    else:
+        details_text = compact_ticket_text(details_text, token_budget or get_token_budget("summarize_ticket_tool"), question=question)
+        prompt = f"""
     You are an expert engineering assistant. Your task is to answer a user's question based on the provided 'Ticket Details'.
 
     **User's Question:** "{question}"
@@ -47,6 +131,9 @@ def _get_single_ticket_summary(issue_key: str, question: str) -> str:
         final_output = summary_content
     else:
         final_output = f"Summary for {sanitized_key}: {ticket_url}\n\n{summary_content}"
+    if store is not None:
+        store.record(action)
+        store.put(sanitized_key, question, state, final_output)
     return final_output
 
 @tool
@@ -84,78 +171,67 @@ def get_field_options_tool(field_name: str, depends_on: Optional[str] = None) ->
     return f"Sorry, I cannot provide options for the field '{field_name}'."
 
 
-@tool
-def create_ticket_tool(summary: str, program: str, system: str, silicon_revision: str, bios_version: str, triage_category: str, triage_assignment: str, severity: str, project: str = "PLATFORM") -> str:
+STEPS_DELIMITER = "\n\n---STEPS-TO-REPRODUCE---\n"
+
+def validate_ticket_fields(summary: str, program: str, system: str, silicon_revision: str, bios_version: str, triage_category: str, triage_assignment: str, severity: str, project: str = "PLATFORM") -> Dict[str, str]:
     """
-    Use this tool to create a new Jira ticket with a hardcoded issue type of 'Draft'. 
-    It will first automatically check for potential duplicates.
+    Checks the fields of a new ticket against the known options and returns them normalized
+    as create_jira_issue expects them. Raises JiraBotError describing the first invalid field.
     """
-    if JIRA_CLIENT_INSTANCE is None:
-        raise JiraBotError("JIRA client not initialized.")
-
-    # Proactive Duplicate Check
-    print("\n--- Running proactive duplicate check before creating ticket... ---")
-    try:
-        program_code_for_dupe_check = program.upper()
-        if program_code_for_dupe_check in program_map:
-            program_full_name_for_dupe_check = program_map[program_code_for_dupe_check]
-            dupe_jql = f'project = "{project}" AND "Program" = "{program_full_name_for_dupe_check}"'
-            candidate_tickets = search_jira_issues(dupe_jql, JIRA_CLIENT_INSTANCE, limit=25)
-            potential_duplicates = []
-            if candidate_tickets:
-                print(f"--- Found {len(candidate_tickets)} candidates. Comparing summaries... ---")
-                SIMILARITY_THRESHOLD = 8
-                for candidate in candidate_tickets:
-                    if candidate_summary := candidate.get('summary'):
-                        score = get_summary_similarity_score(summary, candidate_summary)
-                        if score >= SIMILARITY_THRESHOLD:
-                            potential_duplicates.append(candidate)
-            if potential_duplicates:
-                print("\n--- WARNING: Found potential duplicate tickets! ---")
-                for i, issue in enumerate(potential_duplicates):
-                    print(f"{i+1}. Key: {issue['key']} - {issue['status']}")
-                    print(f"   Summary: {issue['summary']}")
-                    print(f"   URL: {issue['url']}")
-                    print("-" * 20)
-                confirmation = input("Do you still want to continue creating a new ticket? (yes/no): ")
-                if confirmation.lower().strip() != 'yes':
-                    return "Ticket creation cancelled by user after duplicate check."
-    except Exception as e:
-        print(f"\nWARNING: Could not perform duplicate check due to an error: {e}. Proceeding with ticket creation.")
-    
-    # Validation logic
     program_code = program.upper()
     if program_code not in program_map:
-        return f"Error: Invalid program code '{program}'. Valid options are: {list(program_map.keys())}."
+        raise JiraBotError(f"Invalid program code '{program}'. Valid options are: {list(program_map.keys())}.")
 
     valid_systems = system_map.get(program_code)
     if valid_systems is None:
-        return f"Error: The program '{program_code}' exists, but has no valid Systems defined for it."
+        raise JiraBotError(f"The program '{program_code}' exists, but has no valid Systems defined for it.")
     if system not in valid_systems:
-        return f"Error: Invalid system '{system}' for program '{program_code}'. Valid options are: {valid_systems}"
+        raise JiraBotError(f"Invalid system '{system}' for program '{program_code}'. Valid options are: {valid_systems}")
 
     if silicon_revision.upper() not in VALID_SILICON_REVISIONS:
-        return f"Error: Invalid silicon revision '{silicon_revision}'. Valid options are: {list(VALID_SILICON_REVISIONS)}."
+        raise JiraBotError(f"Invalid silicon revision '{silicon_revision}'. Valid options are: {list(VALID_SILICON_REVISIONS)}.")
     
     triage_cat_upper = triage_category.upper()
     if triage_cat_upper not in VALID_TRIAGE_CATEGORIES:
-        return f"Error: Invalid triage category '{triage_category}'. Valid options are: {list(VALID_TRIAGE_CATEGORIES)}."
+        raise JiraBotError(f"Invalid triage category '{triage_category}'. Valid options are: {list(VALID_TRIAGE_CATEGORIES)}.")
 
     valid_assignments = triage_assignment_map.get(triage_cat_upper)
     if valid_assignments is None:
-        return f"Error: The Triage Category '{triage_cat_upper}' exists, but has no valid Triage Assignments defined for it."
+        raise JiraBotError(f"The Triage Category '{triage_cat_upper}' exists, but has no valid Triage Assignments defined for it.")
     if triage_assignment not in valid_assignments:
-        return f"Error: Invalid triage assignment '{triage_assignment}' for category '{triage_cat_upper}'. Valid options are: {valid_assignments}"
+        raise JiraBotError(f"Invalid triage assignment '{triage_assignment}' for category '{triage_cat_upper}'. Valid options are: {valid_assignments}")
     
     severity_title = severity.title()
     if severity_title not in VALID_SEVERITY_LEVELS:
-        return f"Error: Invalid severity '{severity}'. Valid options are: {list(VALID_SEVERITY_LEVELS)}."
+        raise JiraBotError(f"Invalid severity '{severity}'. Valid options are: {list(VALID_SEVERITY_LEVELS)}.")
 
-    program_full_name = program_map[program_code]
+    return {
+        "project": project, "summary": summary, "program": program_map[program_code], "system": system,
+        "silicon_revision": silicon_revision.upper(), "bios_version": bios_version, "triage_category": triage_cat_upper,
+        "triage_assignment": triage_assignment, "severity": severity_title
+    }
 
-    # Description file workflow
-    steps_delimiter = "\n\n---STEPS-TO-REPRODUCE---\n"
-    description_template = f"""---DESCRIPTION---
+def find_creation_duplicates(summary: str, program: str, project: str) -> List[Dict[str, Any]]:
+    """Finds likely duplicates of a ticket about to be created. Returns [] if the check cannot run."""
+    print("\n--- Running proactive duplicate check before creating ticket... ---")
+    try:
+        program_code_for_dupe_check = program.upper()
+        if program_code_for_dupe_check not in program_map:
+            return []
+        program_full_name_for_dupe_check = program_map[program_code_for_dupe_check]
+        dupe_jql = f'project = "{project}" AND "Program" = "{program_full_name_for_dupe_check}"'
+        candidate_tickets = search_jira_issues(dupe_jql, get_jira_client(), limit=DUPLICATE_CANDIDATE_LIMIT)
+        if not candidate_tickets:
+            return []
+        print(f"--- Found {len(candidate_tickets)} candidates. Comparing summaries... ---")
+        return _find_likely_duplicates(summary, candidate_tickets)
+    except Exception as e:
+        print(f"\nWARNING: Could not perform duplicate check due to an error: {e}. Proceeding with ticket creation.")
+        return []
+
+def build_description_template(summary: str, system: str, bios_version: str) -> str:
+    """The description template the reporter fills in; the steps to reproduce go below STEPS_DELIMITER."""
+    return f"""---DESCRIPTION---
 Detailed Summary: {summary}
 
 System Level Signature:
@@ -184,12 +260,50 @@ Expected behavior:
 Actual Behavior:
 
 All Scandump Links:
-{steps_delimiter}(Please provide detailed steps to reproduce the issue below this line)
+{STEPS_DELIMITER}(Please provide detailed steps to reproduce the issue below this line)
 """
+
+def parse_description_text(full_text_input: str) -> Tuple[str, str]:
+    """Splits a filled-in template into (description, steps to reproduce)."""
+    if STEPS_DELIMITER in full_text_input:
+        description_part, steps_part = full_text_input.split(STEPS_DELIMITER, 1)
+        return description_part.replace("---DESCRIPTION---", "").strip(), steps_part.strip()
+    return full_text_input.replace("---DESCRIPTION---", "").strip(), "Not provided."
+
+def submit_ticket(fields: Dict[str, str], description: str, steps_to_reproduce: str) -> Tuple[str, str]:
+    """Creates the ticket from validated fields. Returns (issue key, permalink)."""
+    new_issue = create_jira_issue(client=get_jira_client(), description=description, steps_to_reproduce=steps_to_reproduce, **fields)
+    return new_issue.key, new_issue.permalink()
+
+@tool
+def create_ticket_tool(summary: str, program: str, system: str, silicon_revision: str, bios_version: str, triage_category: str, triage_assignment: str, severity: str, project: str = "PLATFORM") -> str:
+    """
+    Use this tool to create a new Jira ticket with a hardcoded issue type of 'Draft'. 
+    It will first automatically check for potential duplicates.
+    """
+    # Proactive Duplicate Check
+    potential_duplicates = find_creation_duplicates(summary, program, project)
+    if potential_duplicates:
+        print("\n--- WARNING: Found potential duplicate tickets! ---")
+        for i, issue in enumerate(potential_duplicates):
+            print(f"{i+1}. Key: {issue['key']} - {issue['status']}")
+            print(f"   Summary: {issue['summary']}")
+            print(f"   URL: {issue['url']}")
+            print("-" * 20)
+        confirmation = input("Do you still want to continue creating a new ticket? (yes/no): ")
+        if confirmation.lower().strip() != 'yes':
+            return "Ticket creation cancelled by user after duplicate check."
+    
+    try:
+        fields = validate_ticket_fields(summary, program, system, silicon_revision, bios_version, triage_category, triage_assignment, severity, project)
+    except JiraBotError as e:
+        return f"Error: {e}"
+
+    # Description file workflow
     description_filename = "ticket_description.txt"
     try:
         with open(description_filename, "w") as f:
-            f.write(description_template)
+            f.write(build_description_template(summary, system, bios_version))
         print("\n----------------------------------------------------------------")
         print(f"ACTION REQUIRED: I have created a template file named '{description_filename}'.")
         print("Please open it, complete the details, and save the file.")
@@ -200,13 +314,7 @@ All Scandump Links:
         if os.path.exists(description_filename):
             os.remove(description_filename)
 
-    if steps_delimiter in full_text_input:
-        description_part, steps_part = full_text_input.split(steps_delimiter, 1)
-        final_description = description_part.replace("---DESCRIPTION---", "").strip()
-        final_steps = steps_part.strip()
-    else:
-        final_description = full_text_input.replace("---DESCRIPTION---", "").strip()
-        final_steps = "Not provided."
+    final_description, final_steps = parse_description_text(full_text_input)
 
     print("\n---")
     print("A new Jira ticket will be created with the following details:")
@@ -222,14 +330,8 @@ All Scandump Links:
     if confirmation.lower().strip() != 'yes':
         return "Ticket creation cancelled by user."
 
-    new_issue = create_jira_issue(
-        client=JIRA_CLIENT_INSTANCE, project=project, summary=summary, description=final_description,
-        program=program_full_name, system=system, silicon_revision=silicon_revision.upper(),
-        bios_version=bios_version, triage_category=triage_cat_upper, triage_assignment=triage_assignment,
-        severity=severity_title, steps_to_reproduce=final_steps
-    )
-    return f"Successfully created ticket {new_issue.key}. You can view it here: {new_issue.permalink()}"
-
+    issue_key, permalink = submit_ticket(fields, final_description, final_steps)
+    return f"Successfully created ticket {issue_key}. You can view it here: {permalink}"
 
 @tool
 def summarize_ticket_tool(issue_key: str, question: Optional[str] = "Provide a full 4-point summary.") -> str:
@@ -246,15 +348,31 @@ def summarize_multiple_tickets_tool(issue_keys: List[str]) -> str:
     if not issue_keys:
         return "Please provide at least one issue key."
 
-    # 1. Generate individual summaries
-    summaries = []
+    # 1. Fetch every ticket in bulk (the chunked searches and any follow-up requests run concurrently), then generate individual summaries
+    sanitized_keys = [_sanitize_issue_key(key) for key in issue_keys]
+    try:
+        ticket_issues = run_async(async_get_multiple_ticket_issues(sanitized_keys))
+    except JiraBotError as e:
+        # A failed connection or bulk search is reported against every key, as the per-ticket fetches used to do.
+        ticket_issues = {key: e for key in sanitized_keys}
     question_for_each = "Provide a full 4-point summary."
-    for key in issue_keys:
+    token_budget = get_token_budget("summarize_multiple_tickets_tool")
+
+    def summarize_one(item) -> str:
+        key, issue = item
+        if isinstance(issue, JiraBotError):
+            return f"Could not generate summary for {key}: {issue}"
         try:
-            summary_text = _get_single_ticket_summary(key, question_for_each)
-            summaries.append(summary_text)
-        except JiraBotError as e:
-            summaries.append(f"Could not generate summary for {key}: {e}")
+            return _get_single_ticket_summary(key, question_for_each, issue=issue, token_budget=token_budget)
+        except Exception as e:
+            return f"Could not generate summary for {key}: {e}"
+
+    # The LLM calls run concurrently; map() keeps the summaries in request order. The workers run in
+    # copies of this context, so LangChain's callbacks (e.g. --stream) and the LLM priority carry over.
+    max_workers = max(1, min(SUMMARY_MAX_WORKERS, len(ticket_issues)))
+    print(f"--- Summarizing {len(ticket_issues)} tickets with up to {max_workers} concurrent LLM calls... ---")
+    with ContextThreadPoolExecutor(max_workers=max_workers) as executor:
+        summaries = list(executor.map(summarize_one, ticket_issues.items()))
 
     individual_summaries_text = "\n\n---\n\n".join(summaries)
 
@@ -263,7 +381,19 @@ def summarize_multiple_tickets_tool(issue_keys: List[str]) -> str:
     
     if len(successful_summaries) > 1:
         print("\n--- Generating aggregate summary for all tickets... ---")
-        llm = get_llm()
+        llm = get_llm(temperature=0.0)
+        # Large sets are first reduced batch by batch, so the final prompt stays bounded however many tickets there are.
+        try:
+            reduced = reduce_summaries(successful_summaries)
+        except Exception as e:
+            print(f"WARNING: Could not generate aggregate summary due to an error: {e}")
+            return individual_summaries_text
+        if len(reduced) == len(successful_summaries):
+            aggregate_input_label = "Individual Ticket Summaries"
+            aggregate_input_text = individual_summaries_text
+        else:
+            aggregate_input_label = f"Partial Analyses (each covering a group of the {len(successful_summaries)} tickets)"
+            aggregate_input_text = "\n\n---\n\n".join(reduced)
         
         aggregate_prompt = f"""
         You are an expert engineering program manager. Your task is to analyze the following collection of JIRA ticket summaries and provide a high-level aggregate summary.
@@ -275,9 +405,9 @@ def summarize_multiple_tickets_tool(issue_keys: List[str]) -> str:
         - **Potential Shared Root Causes:**
         - **Overarching Blockers or Dependencies:**
 
-        **Individual Ticket Summaries:**
+        **{aggregate_input_label}:**
         ---
-        {individual_summaries_text}
+        {aggregate_input_text}
         ---
 
         **Aggregate Analysis:**
@@ -308,19 +438,22 @@ def jira_search_tool(original_query: str) -> List[Dict[str, Any]]:
     Use this tool to search for Jira issues based on a user's natural language query.
     You must pass the user's complete, original query to the 'original_query' parameter.
     """
-    if JIRA_CLIENT_INSTANCE is None: raise JiraBotError("JIRA client not initialized.")
     try:
         params = extract_params(original_query)
         print(f"DEBUG: Extracted parameters from LLM: {params}")
         limit_str = params.get("maxResults", "20")
-        try:
-            limit = int(limit_str)
-            print(f"DEBUG: Successfully set limit to {limit}.")
-        except (ValueError, TypeError):
-            limit = 20
-            print(f"DEBUG: Could not parse '{limit_str}' as an integer. Defaulting limit to {limit}.")
+        if str(limit_str).strip().lower() == "all":
+            limit = None
+            print("DEBUG: Query asks for all results. Paging through every match up to the result cap.")
+        else:
+            try:
+                limit = int(limit_str)
+                print(f"DEBUG: Successfully set limit to {limit}.")
+            except (ValueError, TypeError):
+                limit = 20
+                print(f"DEBUG: Could not parse '{limit_str}' as an integer. Defaulting limit to {limit}.")
         jql_query = build_jql(params)
-        return search_jira_issues(jql_query, JIRA_CLIENT_INSTANCE, limit=limit)
+        return search_jira_issues(jql_query, get_jira_client(), limit=limit)
     except JiraBotError as e:
         raise e
     except Exception as e:
@@ -335,7 +468,7 @@ def find_similar_tickets_tool(issue_key: str) -> List[Dict[str, Any]]:
     """
     print(f"\n--- TOOL CALLED: find_similar_tickets_tool ---")
     print(f"--- Received issue_key: {issue_key} ---")
-    source_ticket_data = get_ticket_data_for_analysis(issue_key, JIRA_CLIENT_INSTANCE)
+    source_ticket_data = get_ticket_data_for_analysis(issue_key, get_jira_client())
     text_to_analyze = f"{source_ticket_data.get('summary', '')}\n{source_ticket_data.get('description', '')}"
     if not text_to_analyze.strip():
         return ["Could not find enough text in the source ticket to perform a similarity search."]
@@ -347,7 +480,7 @@ def find_similar_tickets_tool(issue_key: str) -> List[Dict[str, Any]]:
         'maxResults': 10
     }
     similar_jql = build_jql(params, exclude_key=issue_key)
-    similar_issues = search_jira_issues(similar_jql, JIRA_CLIENT_INSTANCE, limit=params['maxResults'])
+    similar_issues = search_jira_issues(similar_jql, get_jira_client(), limit=params['maxResults'])
     if not similar_issues:
         return [f"No similar issues found for {issue_key} based on keywords: '{extracted_keywords}'."]
     return similar_issues
@@ -360,7 +493,7 @@ def find_duplicate_tickets_tool(issue_key: str) -> List[Dict[str, Any]]:
     """
     print(f"\n--- TOOL CALLED: find_duplicate_tickets_tool ---")
     print(f"--- Received source issue_key: {issue_key} ---")
-    source_ticket_data = get_ticket_data_for_analysis(issue_key, JIRA_CLIENT_INSTANCE)
+    source_ticket_data = run_async(async_get_ticket_data_for_analysis(issue_key))
     source_summary = source_ticket_data.get('summary')
     source_project = source_ticket_data.get('project')
     program_field_value = source_ticket_data.get('program')
@@ -376,24 +509,12 @@ def find_duplicate_tickets_tool(issue_key: str) -> List[Dict[str, Any]]:
         return [f"Source ticket {issue_key} is missing a summary, project, or program field. Cannot search for duplicates."]
     jql_query = f'project = "{source_project}" AND "Program" = "{source_program}" AND key != "{issue_key}"'
     print(f"--- Searching for candidate tickets with JQL: {jql_query} ---")
-    candidate_tickets = search_jira_issues(jql_query, JIRA_CLIENT_INSTANCE, limit=25)
+    # The candidate pages are fetched concurrently once the first page reports the total.
+    candidate_tickets = run_async(async_search_jira_issues(jql_query, limit=DUPLICATE_CANDIDATE_LIMIT))
     if not candidate_tickets:
         return [f"No other tickets found in the same project and program as {issue_key}."]
     print(f"--- Found {len(candidate_tickets)} candidates. Now comparing summaries... ---")
-    SIMILARITY_THRESHOLD = 8
-    duplicate_tickets = []
-    for candidate in candidate_tickets:
-        candidate_summary = candidate.get('summary')
-        if not candidate_summary:
-            continue
-        try:
-            similarity_score = get_summary_similarity_score(source_summary, candidate_summary)
-            if similarity_score >= SIMILARITY_THRESHOLD:
-                print(f"--- Found likely duplicate: {candidate['key']} with score {similarity_score} ---")
-                duplicate_tickets.append(candidate)
-        except JiraBotError as e:
-            print(f"WARNING: Could not compare summary for {candidate['key']}. Error: {e}")
-            continue
+    duplicate_tickets = _find_likely_duplicates(source_summary, candidate_tickets)
     if not duplicate_tickets:
          return [f"Searched {len(candidate_tickets)} tickets, but no likely duplicates were found for {issue_key}."]
     return duplicate_tickets
@@ -0,0 +1,75 @@
+import os
+from typing import Tuple
+
+import requests
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError
+from urllib3.util.retry import Retry
+
+load_dotenv()
+
+JIRA_HTTP_POOL_SIZE = int(os.getenv("JIRA_HTTP_POOL_SIZE", "20"))
+JIRA_HTTP_MAX_RETRIES = int(os.getenv("JIRA_HTTP_MAX_RETRIES", "4"))
+JIRA_HTTP_BACKOFF_FACTOR = float(os.getenv("JIRA_HTTP_BACKOFF_FACTOR", "0.5"))
+JIRA_HTTP_BACKOFF_JITTER = float(os.getenv("JIRA_HTTP_BACKOFF_JITTER", "0.5"))
+JIRA_HTTP_BACKOFF_MAX = float(os.getenv("JIRA_HTTP_BACKOFF_MAX", "30"))
+JIRA_CONNECT_TIMEOUT = float(os.getenv("JIRA_CONNECT_TIMEOUT", "5"))
+# Searches scan many issues server-side, so they get a longer read timeout than single-issue GETs.
+JIRA_SEARCH_READ_TIMEOUT = float(os.getenv("JIRA_SEARCH_READ_TIMEOUT", "30"))
+JIRA_ISSUE_READ_TIMEOUT = float(os.getenv("JIRA_ISSUE_READ_TIMEOUT", "10"))
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+def build_retry_policy(max_retries: int = JIRA_HTTP_MAX_RETRIES) -> Retry:
+    """
+    Retries idempotent requests on connection errors and 429/5xx with exponential backoff plus jitter,
+    waiting for Retry-After when Jira sends it. After the last attempt the final response is returned
+    (not raised) so the jira library turns it into a JIRAError that still carries the retry history.
+    """
+    return Retry(
+        total=max_retries,
+        backoff_factor=JIRA_HTTP_BACKOFF_FACTOR,
+        backoff_jitter=JIRA_HTTP_BACKOFF_JITTER,
+        backoff_max=JIRA_HTTP_BACKOFF_MAX,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=frozenset({"GET", "HEAD", "OPTIONS"}),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+
+
+class JiraTransportAdapter(HTTPAdapter):
+    """An HTTPAdapter with a sized connection pool, the retry policy above and per-endpoint timeouts."""
+
+    def __init__(self, pool_size: int = JIRA_HTTP_POOL_SIZE, max_retries: int = JIRA_HTTP_MAX_RETRIES):
+        super().__init__(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=build_retry_policy(max_retries))
+
+    @staticmethod
+    def timeout_for(url: str) -> Tuple[float, float]:
+        """Returns the (connect, read) timeout for a Jira REST URL."""
+        if "/search" in url:
+            return (JIRA_CONNECT_TIMEOUT, JIRA_SEARCH_READ_TIMEOUT)
+        return (JIRA_CONNECT_TIMEOUT, JIRA_ISSUE_READ_TIMEOUT)
+
+    def send(self, request, **kwargs):
+        kwargs["timeout"] = self.timeout_for(request.url)
+        return super().send(request, **kwargs)
+
+
+def mount_jira_transport(session: requests.Session, pool_size: int = JIRA_HTTP_POOL_SIZE, max_retries: int = JIRA_HTTP_MAX_RETRIES) -> None:
+    """Installs JiraTransportAdapter on a requests session (e.g. the jira client's ResilientSession)."""
+    adapter = JiraTransportAdapter(pool_size=pool_size, max_retries=max_retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+def retry_count(error: Exception) -> int:
+    """Returns how many times the transport retried the request that ended in this error."""
+    response = getattr(error, "response", None)
+    retries = getattr(getattr(response, "raw", None), "retries", None)
+    if isinstance(retries, Retry):
+        return len(retries.history)
+    if isinstance(error, requests.exceptions.ConnectionError) and error.args and isinstance(error.args[0], MaxRetryError):
+        return JIRA_HTTP_MAX_RETRIES
+    return 0
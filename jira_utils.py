@@ -1,7 +1,12 @@
 import os
+import re
+import threading
 from jira import JIRA, JIRAError
+from jira.resources import dict2resource
 from dotenv import load_dotenv
-from typing import Tuple, Optional
+from typing import Tuple, Optional, Iterator, Dict, List, Union
+from jira_transport import JIRA_CONNECT_TIMEOUT, JIRA_ISSUE_READ_TIMEOUT, mount_jira_transport, retry_count
+from ticket_cache import TicketCache, get_ticket_cache
 
 load_dotenv()
 
@@ -9,9 +14,59 @@ JIRA_SERVER_URL = os.getenv("JIRA_SERVER_URL")
 JIRA_USERNAME = os.getenv("JIRA_USERNAME")
 JIRA_PASSWORD = os.getenv("JIRA_PASSWORD")
 
+# Only the fields rendered for a search result are requested from Jira.
+SEARCH_RESULT_FIELDS = "summary,status,assignee,priority,created,updated"
+JIRA_SEARCH_PAGE_SIZE = int(os.getenv("JIRA_SEARCH_PAGE_SIZE", "50"))
+JIRA_SEARCH_MAX_RESULTS = int(os.getenv("JIRA_SEARCH_MAX_RESULTS", "500"))
+# Fields needed to render a ticket for summarization. A single ticket's comments are fetched separately,
+# newest first, because 'comment' as a field returns every comment on the ticket.
+TICKET_DETAIL_FIELDS = "project,customfield_13002,summary,status,resolution,assignee,created,updated,description"
+# Cache entries for rendered tickets also hold the comment tail. Bulk searches ask for these fields:
+# a separate comment request per ticket would cost more than the comments it saves.
+TICKET_DETAIL_CACHE_FIELDS = f"{TICKET_DETAIL_FIELDS},comment"
+# 'updated' is included so the ticket cache can revalidate these payloads too.
+TICKET_ANALYSIS_FIELDS = "summary,description,project,customfield_13002,updated"
+JIRA_BULK_FETCH_CHUNK_SIZE = int(os.getenv("JIRA_BULK_FETCH_CHUNK_SIZE", "50"))
+JIRA_KEY_PATTERN = re.compile(r'^[A-Z][A-Z0-9]+-[1-9]\d*$')
+# Long-running bugs collect hundreds of comments with pasted logs; only the newest few are
+# rendered, each body and the comments together capped at a byte budget.
+COMMENT_TAIL_SIZE = int(os.getenv("COMMENT_TAIL_SIZE", "5"))
+COMMENT_BODY_MAX_BYTES = int(os.getenv("COMMENT_BODY_MAX_BYTES", "4000"))
+COMMENTS_MAX_BYTES = int(os.getenv("COMMENTS_MAX_BYTES", "12000"))
+
+class SearchResults(list):
+    """The formatted issues of a search, plus the result limit that applied (the requested count or the JIRA_SEARCH_MAX_RESULTS cap)."""
+    def __init__(self, issues=(), limit: Optional[int] = None):
+        super().__init__(issues)
+        self.limit = limit
+
 class JiraBotError(Exception):
-    """Custom exception for Jira Bot related errors."""
-    pass
+    """Custom exception for Jira Bot related errors. `retries` is how often the failed request was retried."""
+    def __init__(self, message: str = "", retries: int = 0):
+        super().__init__(message)
+        self.retries = retries
+
+def _jira_error(message: str, error: Exception) -> JiraBotError:
+    """Wraps a Jira/transport error, noting how many retries were spent before giving up."""
+    retries = retry_count(error)
+    if retries:
+        message = f"{message} (gave up after {retries} retries)"
+    return JiraBotError(message, retries=retries)
+
+def _get_mirror():
+    """Returns the local Jira mirror when enabled. Imported lazily because jira_mirror builds on this module."""
+    from jira_mirror import get_mirror
+    return get_mirror()
+
+def _get_mirrored_issue(issue_key: str):
+    """Returns the issue from a fresh local mirror, or None when it has to be fetched live."""
+    mirror = _get_mirror()
+    if mirror is None:
+        return None
+    issue = mirror.get_issue(issue_key)
+    if issue is not None:
+        print(f"Serving {issue_key} from the local Jira mirror.")
+    return issue
 
 def initialize_jira_client():
     """Initializes and returns a JIRA client using basic_auth with username and password."""
@@ -21,8 +76,11 @@ def initialize_jira_client():
         jira_client = JIRA(
             server=JIRA_SERVER_URL,
             basic_auth=(JIRA_USERNAME, JIRA_PASSWORD),
-            timeout=10
+            timeout=(JIRA_CONNECT_TIMEOUT, JIRA_ISSUE_READ_TIMEOUT),
+            # Retries are handled by the transport below, which also honours Retry-After and covers 5xx.
+            max_retries=0
         )
+        mount_jira_transport(jira_client._session)
         print("JIRA client initialized successfully with basic_auth (username/password).")
         return jira_client
     except JIRAError as e:
@@ -30,6 +88,150 @@ def initialize_jira_client():
     except Exception as e:
         raise JiraBotError(f"An unexpected error occurred during JIRA client initialization: {e}")
 
+def _truncate_to_bytes(text: str, max_bytes: int) -> str:
+    """Cuts text to at most max_bytes of UTF-8, noting how much was dropped."""
+    encoded = (text or "").encode("utf-8")
+    if len(encoded) <= max_bytes:
+        return text or ""
+    kept = encoded[:max_bytes].decode("utf-8", errors="ignore")
+    return f"{kept}\n[... truncated {len(encoded) - max_bytes} bytes]"
+
+def _comment_tail_request(tail_size: int) -> dict:
+    """Params for the first page of a comment tail: the newest comments, if the server honours orderBy."""
+    return {"startAt": 0, "maxResults": tail_size, "orderBy": "-created"}
+
+def _comment_tail_from_page(page: dict, tail_size: int, ordered: bool = True) -> Optional[List[dict]]:
+    """
+    Returns the newest tail_size comments of a page, oldest first with bodies cut to COMMENT_BODY_MAX_BYTES.
+    For a page requested with orderBy=-created, returns None when the server ignored the ordering
+    (older Jira versions do) and the page is not the whole list, so the caller must page to total - tail_size.
+    """
+    comments = page.get("comments") or []
+    total = page.get("total", len(comments))
+    newest_first = len(comments) > 1 and comments[0].get("created", "") > comments[-1].get("created", "")
+    if ordered and total > len(comments) and not newest_first:
+        return None
+    tail = sorted(comments, key=lambda comment: comment.get("created", ""))[-tail_size:]
+    return [dict(comment, body=_truncate_to_bytes(comment.get("body"), COMMENT_BODY_MAX_BYTES)) for comment in tail]
+
+def _attach_comment_tail(issue, comments: List[dict], total: int):
+    """Stores the comment tail on the issue the way Jira's 'comment' field would, so it is rendered and cached with it."""
+    comment_field = {"comments": comments, "total": total, "maxResults": len(comments), "startAt": max(0, total - len(comments))}
+    if isinstance(issue.raw, dict):
+        issue.raw.setdefault("fields", {})["comment"] = comment_field
+    issue.fields.comment = dict2resource(comment_field)
+    return issue
+
+def _fetch_comment_tail(client: JIRA, issue, tail_size: int = COMMENT_TAIL_SIZE):
+    """Fetches only the newest tail_size comments of an issue from the paged comment endpoint."""
+    path = f"issue/{issue.key}/comment"
+    page = client._get_json(path, params=_comment_tail_request(tail_size))
+    total = page.get("total", 0)
+    tail = _comment_tail_from_page(page, tail_size)
+    if tail is None:
+        page = client._get_json(path, params={"startAt": max(0, total - tail_size), "maxResults": tail_size})
+        tail = _comment_tail_from_page(page, tail_size, ordered=False)
+    return _attach_comment_tail(issue, tail, total)
+
+def _trim_embedded_comments(issue, tail_size: int = COMMENT_TAIL_SIZE) -> bool:
+    """
+    Keeps the newest tail_size of the comments a bulk search embedded in the issue.
+    Returns False when Jira embedded only some of them, so the tail must come from the comment endpoint.
+    """
+    comment_field = (issue.raw.get("fields") or {}).get("comment") if isinstance(issue.raw, dict) else None
+    if not isinstance(comment_field, dict):
+        return False
+    comments = comment_field.get("comments") or []
+    total = comment_field.get("total", len(comments))
+    if total > len(comments):
+        return False
+    _attach_comment_tail(issue, _comment_tail_from_page(comment_field, tail_size, ordered=False), total)
+    return True
+
+def _complete_bulk_issue(client: JIRA, issue, cache):
+    """Trims a bulk-fetched issue to its comment tail, paging for it only when needed, and caches it."""
+    try:
+        if not _trim_embedded_comments(issue):
+            issue = _fetch_comment_tail(client, issue)
+        if cache is not None:
+            if isinstance(issue.raw, dict):
+                cache.put(issue.key, TICKET_DETAIL_CACHE_FIELDS, issue.raw)
+            cache.record_miss()
+        return issue
+    except Exception as e:
+        return _jira_error(f"An unexpected error occurred while fetching ticket details: {e}", e)
+
+def _fetch_issue(client: JIRA, issue_key: str, fields: str, with_comment_tail: bool = False):
+    """
+    Fetches an issue through the ticket cache. A cached payload is reused as long as Jira reports the
+    same 'updated' timestamp, which costs a request for that single field instead of the whole issue.
+    With with_comment_tail, the newest comments are fetched and cached along with the fields.
+    """
+    cache_fields = f"{fields},comment" if with_comment_tail else fields
+    cache = get_ticket_cache()
+    if cache is not None:
+        entry = cache.lookup(issue_key, cache_fields)
+        if entry is not None:
+            revalidate = cache.needs_revalidation(entry)
+            if not revalidate or client.issue(issue_key, fields="updated").fields.updated == entry["updated"]:
+                cache.record_hit(issue_key, revalidated=revalidate)
+                return dict2resource(entry["raw"])
+        cache.record_miss()
+    issue = client.issue(issue_key, fields=fields)
+    if with_comment_tail:
+        issue = _fetch_comment_tail(client, issue)
+    if cache is not None and isinstance(issue.raw, dict):
+        cache.put(issue_key, cache_fields, issue.raw)
+    return issue
+
+def _cached_entries(issue_keys: List[str]) -> Tuple[Optional[TicketCache], dict, List[str]]:
+    """Returns the ticket cache, its rendered-ticket entries for the keys, and the keys whose entry must be revalidated."""
+    cache = get_ticket_cache()
+    if cache is None:
+        return None, {}, []
+    entries = {key: entry for key in issue_keys if (entry := cache.lookup(key, TICKET_DETAIL_CACHE_FIELDS)) is not None}
+    return cache, entries, [key for key, entry in entries.items() if cache.needs_revalidation(entry)]
+
+def _reuse_entries(cache: TicketCache, entries: dict, revalidated: List[str], current_updated: dict) -> dict:
+    """Returns the issues of the entries that are still current, given the 'updated' values Jira reported for the revalidated keys."""
+    reused = {}
+    for key, entry in entries.items():
+        revalidate = key in revalidated
+        if not revalidate or current_updated.get(key) == entry["updated"]:
+            cache.record_hit(key, revalidated=revalidate)
+            reused[key] = dict2resource(entry["raw"])
+    return reused
+
+def _reuse_cached_issues(issue_keys: List[str], client: JIRA) -> dict:
+    """
+    Returns the issues for the keys whose cached payload is still current.
+    Stale-looking entries are revalidated together with one 'key in (...)' search for just the 'updated' field.
+    """
+    cache, entries, to_revalidate = _cached_entries(issue_keys)
+    current_updated = {}
+    if to_revalidate:
+        try:
+            issues = client.search_issues(f"key in ({', '.join(to_revalidate)})", maxResults=len(to_revalidate), fields="updated", validate_query=False)
+            current_updated = {issue.key: issue.fields.updated for issue in issues}
+        except Exception as e:
+            print(f"WARNING: Could not revalidate cached tickets ({e}). Fetching them again.")
+    return _reuse_entries(cache, entries, to_revalidate, current_updated)
+
+_JIRA_CLIENT = None
+_JIRA_CLIENT_LOCK = threading.Lock()
+
+def get_jira_client() -> JIRA:
+    """
+    Returns the process-wide JIRA client, connecting on first use instead of at import time.
+    Thread-safe; if connecting fails, the JiraBotError is raised and the next call tries again.
+    """
+    global _JIRA_CLIENT
+    if _JIRA_CLIENT is None:
+        with _JIRA_CLIENT_LOCK:
+            if _JIRA_CLIENT is None:
+                _JIRA_CLIENT = initialize_jira_client()
+    return _JIRA_CLIENT
+
 def get_ticket_data_for_analysis(issue_key: str, client: JIRA) -> dict:
     """
     Fetches the key data from a single JIRA ticket for analysis.
@@ -37,8 +239,9 @@ def get_ticket_data_for_analysis(issue_key: str, client: JIRA) -> dict:
     """
     print(f"Fetching data for ticket {issue_key} for analysis...")
     try:
-        fields = "summary,description,project,customfield_13002"
-        issue = client.issue(issue_key, fields=fields)
+        issue = _get_mirrored_issue(issue_key)
+        if issue is None:
+            issue = _fetch_issue(client, issue_key, TICKET_ANALYSIS_FIELDS)
         
         data = {
             "key": issue.key,
@@ -54,94 +257,235 @@ def get_ticket_data_for_analysis(issue_key: str, client: JIRA) -> dict:
     except JIRAError as e:
         if e.status_code == 404:
             raise JiraBotError(f"Ticket '{issue_key}' not found.")
-        raise JiraBotError(f"Failed to get data for '{issue_key}': {e.text}")
+        raise _jira_error(f"Failed to get data for '{issue_key}': {e.text}", e)
     except Exception as e:
-        raise JiraBotError(f"An unexpected error occurred while fetching ticket data: {e}")
+        raise _jira_error(f"An unexpected error occurred while fetching ticket data: {e}", e)
+
 
+def _issue_url(issue_key: str) -> str:
+    """Builds the browse URL for an issue key without an extra API round trip."""
+    return f"{JIRA_SERVER_URL}/browse/{issue_key}"
+
+def _format_search_result(issue) -> dict:
+    """Flattens a Jira issue returned by a search into the dict rendered to the user."""
+    fields = issue.fields
+    assignee = getattr(fields, 'assignee', None)
+    status = getattr(fields, 'status', None)
+    priority = getattr(fields, 'priority', None)
+    created = getattr(fields, 'created', None)
+    updated = getattr(fields, 'updated', None)
+    return {
+        "key": issue.key,
+        "summary": getattr(fields, 'summary', None),
+        "status": status.name if status else "Unknown",
+        "assignee": assignee.displayName if assignee else "Unassigned",
+        "priority": priority.name if priority else "Undefined",
+        "url": _issue_url(issue.key),
+        "created": created[:10] if created else "Unknown",
+        "updated": updated[:10] if updated else "Unknown"
+    }
 
-def search_jira_issues(jql_query: str, client: JIRA, limit: int = 20) -> list[dict]:
+def iter_raw_issues(jql_query: str, client: JIRA, page_size: int = JIRA_SEARCH_PAGE_SIZE, max_results: Optional[int] = None, fields: str = SEARCH_RESULT_FIELDS):
+    """
+    Lazily pages through the results of a JQL query using startAt/maxResults windows, yielding jira Issue objects.
+    Stops after max_results issues if given, otherwise when Jira has no more results.
+    """
+    if page_size <= 0:
+        raise JiraBotError(f"Search page size must be a positive number, got {page_size}.")
+    start_at = 0
+    fetched = 0
+    while max_results is None or fetched < max_results:
+        window = page_size if max_results is None else min(page_size, max_results - fetched)
+        try:
+            page = client.search_issues(jql_query, startAt=start_at, maxResults=window, fields=fields)
+        except JIRAError as e:
+            raise _jira_error(f"JIRA search failed for JQL '{jql_query}': {e.text}. Status code: {e.status_code}. Please refine the query.", e)
+        except Exception as e:
+            raise _jira_error(f"An unexpected error occurred during JIRA search: {e}", e)
+        yield from page
+        fetched += len(page)
+        start_at += len(page)
+        total = getattr(page, 'total', None)
+        if len(page) < window or (total is not None and start_at >= total):
+            break
+
+def iter_jira_issues(jql_query: str, client: JIRA, page_size: int = JIRA_SEARCH_PAGE_SIZE, max_results: Optional[int] = None, fields: str = SEARCH_RESULT_FIELDS) -> Iterator[dict]:
+    """
+    Lazily pages through the results of a JQL query using startAt/maxResults windows.
+    Yields one formatted result at a time, so memory stays flat regardless of the result count.
+    """
+    for issue in iter_raw_issues(jql_query, client, page_size=page_size, max_results=max_results, fields=fields):
+        yield _format_search_result(issue)
+
+def search_jira_issues(jql_query: str, client: JIRA, limit: Optional[int] = 20, page_size: int = JIRA_SEARCH_PAGE_SIZE) -> SearchResults:
     """
     Searches JIRA issues using a JQL query and returns formatted results.
+    A limit of None returns every match, capped at JIRA_SEARCH_MAX_RESULTS; the result records the limit applied.
     """
+    if limit is None or limit > JIRA_SEARCH_MAX_RESULTS:
+        limit = JIRA_SEARCH_MAX_RESULTS
+    if (mirror := _get_mirror()) is not None and (mirrored_issues := mirror.search(jql_query, limit)) is not None:
+        print(f"\nServed JIRA search from the local mirror: {jql_query} | {len(mirrored_issues)} issues")
+        return SearchResults(mirrored_issues, limit)
     print(f"\nAttempting JIRA search with JQL: {jql_query} | Limit: {limit}")
-    try:
-        issues = client.search_issues(jql_query, maxResults=limit)
-        if not issues:
-            print("No issues found for the given JQL.")
-            return []
-        formatted_issues = []
-        for issue in issues:
-            assignee = issue.fields.assignee.displayName if hasattr(issue.fields, 'assignee') and issue.fields.assignee else "Unassigned"
-            status = issue.fields.status.name if hasattr(issue.fields, 'status') and issue.fields.status else "Unknown"
-            priority = issue.fields.priority.name if hasattr(issue.fields, 'priority') and issue.fields.priority else "Undefined"
-            formatted_issues.append({
-                "key": issue.key,
-                "summary": issue.fields.summary,
-                "status": status,
-                "assignee": assignee,
-                "priority": priority,
-                "url": getattr(issue, 'permalink', lambda: f"{JIRA_SERVER_URL}/browse/{issue.key}")(),
-                "created": issue.fields.created[:10] if hasattr(issue.fields, 'created') and issue.fields.created else "Unknown",
-                "updated": issue.fields.updated[:10] if hasattr(issue.fields, 'updated') and issue.fields.updated else "Unknown"
-            })
-        print(f"Successfully found {len(issues)} issues.")
+    formatted_issues = SearchResults(iter_jira_issues(jql_query, client, page_size=page_size, max_results=limit), limit)
+    if not formatted_issues:
+        print("No issues found for the given JQL.")
         return formatted_issues
+    print(f"Successfully found {len(formatted_issues)} issues.")
+    return formatted_issues
+
+def _format_ticket_details(issue) -> Tuple[str, str]:
+    """Renders an issue fetched with its comments into (details_as_text, ticket_url)."""
+    details = []
+
+    ticket_url = _issue_url(issue.key)
+
+    details.append(f"Project: {issue.fields.project.key}")
+
+    program_field_obj = getattr(issue.fields, 'customfield_13002', None) or getattr(issue.fields, 'Program', None)
+    details.append(f"Program: {program_field_obj if program_field_obj else 'Not Found'}")
+
+    details.append(f"Title: {issue.fields.summary}")
+    details.append(f"Status: {issue.fields.status.name if hasattr(issue.fields, 'status') and issue.fields.status else 'Unknown'}")
+
+    resolution = getattr(issue.fields, 'resolution', None)
+    details.append(f"Resolution: {resolution.name if resolution else 'Unresolved'}")
+
+    assignee = getattr(issue.fields, 'assignee', None)
+    details.append(f"Assignee: {assignee.displayName if assignee else 'Unassigned'}")
+
+    details.append(f"Created: {issue.fields.created[:10] if hasattr(issue.fields, 'created') and issue.fields.created else 'Unknown'}")
+    details.append(f"Updated: {issue.fields.updated[:10] if hasattr(issue.fields, 'updated') and issue.fields.updated else 'Unknown'}")
+
+    details.append("\n-- Description --")
+    details.append(issue.fields.description if issue.fields.description else "No description.")
+
+    comment_field = getattr(issue.fields, 'comment', None)
+    comments = list(getattr(comment_field, 'comments', None) or [])[-COMMENT_TAIL_SIZE:]
+    total = getattr(comment_field, 'total', None) or len(comments)
+    details.append(f"\n-- Comments ({len(comments)} most recent of {total}) --" if total > len(comments) else "\n-- Comments --")
+    if comments:
+        budget = COMMENTS_MAX_BYTES
+        for shown, comment in enumerate(reversed(comments)):
+            if budget <= 0:
+                details.append(f"[{len(comments) - shown} older comments omitted to stay within the size budget]")
+                break
+            body = _truncate_to_bytes(comment.body, min(budget, COMMENT_BODY_MAX_BYTES))
+            author_name = getattr(comment.author, 'displayName', 'Unknown author')
+            details.append(f"Comment by {author_name} on {comment.created[:10]}:")
+            details.append(body)
+            details.append("-" * 10)
+            budget -= len(body.encode("utf-8"))
+    else:
+        details.append("No comments.")
+
+    details_text = "\n".join(details)
+    return (details_text, ticket_url)
+
+def get_ticket_issue(issue_key: str, client: JIRA):
+    """
+    Fetches the issue that get_ticket_details renders (fields plus the newest comments),
+    from the local mirror or the ticket cache when possible.
+    """
+    print(f"Fetching details for ticket: {issue_key}")
+    try:
+        issue = _get_mirrored_issue(issue_key)
+        if issue is None:
+            issue = _fetch_issue(client, issue_key, TICKET_DETAIL_FIELDS, with_comment_tail=True)
+        return issue
     except JIRAError as e:
-        raise JiraBotError(f"JIRA search failed for JQL '{jql_query}': {e.text}. Status code: {e.status_code}. Please refine the query.")
+        if e.status_code == 404:
+            raise JiraBotError(f"Ticket '{issue_key}' not found.")
+        raise _jira_error(f"Failed to get details for '{issue_key}': {e.text}", e)
     except Exception as e:
-        raise JiraBotError(f"An unexpected error occurred during JIRA search: {e}")
+        raise _jira_error(f"An unexpected error occurred while fetching ticket details: {e}", e)
 
 def get_ticket_details(issue_key: str, client: JIRA) -> Tuple[str, str]:
     """
     Fetches detailed information for a single JIRA ticket for summarization.
     Returns a tuple containing (details_as_text, ticket_url).
     """
-    print(f"Fetching details for ticket: {issue_key}")
+    issue = get_ticket_issue(issue_key, client)
     try:
-        issue = client.issue(issue_key, expand="comments")
-        details = []
-        
-        ticket_url = getattr(issue, 'permalink', lambda: f"{JIRA_SERVER_URL}/browse/{issue.key}")()
-
-        details.append(f"Project: {issue.fields.project.key}")
-        
-        program_field_obj = getattr(issue.fields, 'Program', None)
-        details.append(f"Program: {program_field_obj if program_field_obj else 'Not Found'}")
-            
-        details.append(f"Title: {issue.fields.summary}")
-        details.append(f"Status: {issue.fields.status.name if hasattr(issue.fields, 'status') and issue.fields.status else 'Unknown'}")
-        
-        resolution = getattr(issue.fields, 'resolution', None)
-        details.append(f"Resolution: {resolution.name if resolution else 'Unresolved'}")
-        
-        assignee = getattr(issue.fields, 'assignee', None)
-        details.append(f"Assignee: {assignee.displayName if assignee else 'Unassigned'}")
-        
-        details.append(f"Created: {issue.fields.created[:10] if hasattr(issue.fields, 'created') and issue.fields.created else 'Unknown'}")
-        details.append(f"Updated: {issue.fields.updated[:10] if hasattr(issue.fields, 'updated') and issue.fields.updated else 'Unknown'}")
+        return _format_ticket_details(issue)
+    except Exception as e:
+        raise JiraBotError(f"An unexpected error occurred while fetching ticket details: {e}")
 
-        details.append("\n-- Description --")
-        details.append(issue.fields.description if issue.fields.description else "No description.")
-        
-        details.append("\n-- Comments --")
-        if hasattr(issue.fields.comment, 'comments') and issue.fields.comment.comments:
-            for comment in reversed(issue.fields.comment.comments[-5:]):
-                author_name = getattr(comment.author, 'displayName', 'Unknown author')
-                details.append(f"Comment by {author_name} on {comment.created[:10]}:")
-                details.append(comment.body)
-                details.append("-" * 10)
+def _start_bulk_results(issue_keys: List[str]) -> Tuple[dict, List[str]]:
+    """
+    Returns the results dict of a bulk fetch with malformed keys and mirrored tickets already filled in,
+    and the keys still to be fetched from Jira.
+    """
+    results = {key: None for key in issue_keys}
+    valid_keys = []
+    for key in results:
+        if not JIRA_KEY_PATTERN.match(key):
+            results[key] = JiraBotError(f"'{key}' is not a valid ticket key.")
+        elif (mirrored_issue := _get_mirrored_issue(key)) is not None:
+            results[key] = mirrored_issue
         else:
-            details.append("No comments.")
-            
-        details_text = "\n".join(details)
-        return (details_text, ticket_url)
+            valid_keys.append(key)
+    return results, valid_keys
 
-    except JIRAError as e:
-        if e.status_code == 404:
-            raise JiraBotError(f"Ticket '{issue_key}' not found.")
-        raise JiraBotError(f"Failed to get details for '{issue_key}': {e.text}")
-    except Exception as e:
-        raise JiraBotError(f"An unexpected error occurred while fetching ticket details: {e}")
+def get_multiple_ticket_issues(issue_keys: List[str], client: JIRA, chunk_size: int = JIRA_BULK_FETCH_CHUNK_SIZE) -> dict:
+    """
+    Fetches many tickets with chunked 'key in (...)' searches instead of one request per key.
+    Returns a dict in request order mapping each key to either the issue (as get_ticket_issue returns it)
+    or the JiraBotError explaining why that key could not be fetched. One bad key never fails the batch.
+    """
+    results, valid_keys = _start_bulk_results(issue_keys)
+    cached_issues = _reuse_cached_issues(valid_keys, client)
+    results.update(cached_issues)
+    valid_keys = [key for key in valid_keys if key not in cached_issues]
+    cache = get_ticket_cache()
+
+    for i in range(0, len(valid_keys), chunk_size):
+        chunk = valid_keys[i:i + chunk_size]
+        print(f"Fetching details for {len(chunk)} tickets in one request: {', '.join(chunk)}")
+        jql = f"key in ({', '.join(chunk)})"
+        try:
+            # validate_query=False makes Jira skip unknown or hidden keys instead of rejecting the whole query.
+            issues = client.search_issues(jql, maxResults=len(chunk), fields=TICKET_DETAIL_CACHE_FIELDS, validate_query=False)
+        except Exception as e:
+            if retry_count(e):
+                # Jira is already throttling or failing; one request per key would only add to the load.
+                error = _jira_error(f"Failed to fetch ticket details: {e}", e)
+                for key in chunk:
+                    results[key] = error
+                continue
+            print(f"WARNING: Bulk fetch failed ({e}). Falling back to fetching these tickets one by one.")
+            issues = []
+
+        for issue in issues:
+            if issue.key in results:
+                results[issue.key] = _complete_bulk_issue(client, issue, cache)
+
+        # Keys the search did not return are missing, forbidden or moved; a direct fetch gives the precise reason.
+        for key in chunk:
+            if results[key] is None:
+                try:
+                    results[key] = get_ticket_issue(key, client)
+                except JiraBotError as e:
+                    results[key] = e
+    return results
+
+def get_multiple_ticket_details(issue_keys: List[str], client: JIRA, chunk_size: int = JIRA_BULK_FETCH_CHUNK_SIZE) -> Dict[str, Union[Tuple[str, str], JiraBotError]]:
+    """
+    Fetches details for many tickets with chunked 'key in (...)' searches instead of one request per key.
+    Returns a dict in request order mapping each key to either a (details_as_text, ticket_url) tuple
+    or the JiraBotError explaining why that key could not be fetched. One bad key never fails the batch.
+    """
+    results: Dict[str, Union[Tuple[str, str], JiraBotError]] = {}
+    for key, issue in get_multiple_ticket_issues(issue_keys, client, chunk_size=chunk_size).items():
+        if isinstance(issue, JiraBotError):
+            results[key] = issue
+            continue
+        try:
+            results[key] = _format_ticket_details(issue)
+        except Exception as e:
+            results[key] = JiraBotError(f"An unexpected error occurred while fetching ticket details: {e}")
+    return results
 
 def create_jira_issue(client: JIRA, project: str, summary: str, description: str, program: str, system: str, silicon_revision: str, bios_version: str, triage_category: str, triage_assignment: str, severity: str, steps_to_reproduce: str, iod_silicon_die_revision: str, ccd_silicon_die_revision: str) -> JIRA.issue:
     """
@@ -1,18 +1,18 @@
 import json
 import os
 import re
-from typing import Dict, Any
-import openai
-from jira import JIRA
+from typing import Dict, Any, List, Optional
 
-from llm_config import get_azure_openai_client
+from llm_config import get_shared_azure_openai_client
+from params_cache import get_params_cache, fingerprint
 from jira_utils import JiraBotError
 
-RAW_AZURE_OPENAI_CLIENT = None
-try:
-    RAW_AZURE_OPENAI_CLIENT = get_azure_openai_client()
-except Exception as e:
-    print(f"CRITICAL ERROR: Could not initialize raw Azure OpenAI client at startup for JQL builder: {e}")
+def _get_raw_client(purpose: str):
+    """Returns the shared raw Azure OpenAI client, created on first use rather than at import time."""
+    try:
+        return get_shared_azure_openai_client()
+    except Exception as e:
+        raise JiraBotError(f"Raw Azure OpenAI client not initialized. Cannot {purpose}: {e}")
 
 program_map = {
     "STX": "Strix1 [PRG-000384]",
@@ -92,8 +92,7 @@ stale_statuses = {"Open", "To Do", "In Progress", "Reopened", "Blocked"}
 
 def extract_keywords_from_text(text_to_analyze: str) -> str:
     """Uses the LLM to extract key technical terms from a block of text."""
-    if RAW_AZURE_OPENAI_CLIENT is None:
-        raise JiraBotError("Raw Azure OpenAI client not initialized. Cannot extract keywords.")
+    raw_client = _get_raw_client("extract keywords")
     system_prompt = """
     You are an expert in analyzing Jira tickets to find core issues. From the following ticket text, extract the 3 most important and specific technical keywords that describe the core problem. Focus on nouns, verbs, and technical terms (like 'crash', 'UI button', 'memory leak', 'API', 'authentication'). 
     Combine the keywords into a single, space-separated string.
@@ -103,49 +102,74 @@ def extract_keywords_from_text(text_to_analyze: str) -> str:
         {"role": "user", "content": text_to_analyze}
     ]
     try:
-        resp = RAW_AZURE_OPENAI_CLIENT.chat.completions.create(model=os.getenv("LLM_CHAT_DEPLOYMENT_NAME"), messages=messages_to_send, max_tokens=50)
+        resp = raw_client.chat.completions.create(model=os.getenv("LLM_CHAT_DEPLOYMENT_NAME"), messages=messages_to_send, max_tokens=50, temperature=0.0)
         keywords = resp.choices[0].message.content.strip()
         return keywords
     except Exception as e:
         raise JiraBotError(f"Error during keyword extraction from text: {e}")
 
-def get_summary_similarity_score(summary_a: str, summary_b: str) -> int:
+# Number of candidate summaries scored per completion by get_summary_similarity_scores.
+SIMILARITY_BATCH_SIZE = int(os.getenv("SIMILARITY_BATCH_SIZE", "25"))
+
+def _parse_similarity_scores(content: str, expected_count: int) -> List[int]:
+    """Parses and validates the JSON array of 1-10 scores returned for a batch of candidates."""
+    if content.startswith("```"):
+        content = content.strip("`").removeprefix("json").strip()
+    scores = json.loads(content)
+    if not isinstance(scores, list) or len(scores) != expected_count:
+        raise ValueError(f"expected a JSON array of {expected_count} scores")
+    validated = []
+    for score in scores:
+        if isinstance(score, bool) or not isinstance(score, (int, float)) or not 1 <= score <= 10:
+            raise ValueError(f"score '{score}' is not a number from 1 to 10")
+        validated.append(int(round(score)))
+    return validated
+
+def get_summary_similarity_scores(source_summary: str, candidate_summaries: List[str], batch_size: int = SIMILARITY_BATCH_SIZE) -> List[int]:
     """
-    Uses an LLM to compare two ticket summaries for semantic similarity and returns a score from 1 (not similar) to 10 (very similar).
+    Uses an LLM to compare one ticket summary against many candidates for semantic similarity.
+    Candidates are scored in batches of batch_size, one completion per batch.
+    Returns one score per candidate, in order, from 1 (not similar) to 10 (very similar).
     """
-    if RAW_AZURE_OPENAI_CLIENT is None:
-        raise JiraBotError("Raw Azure OpenAI client not initialized. Cannot compare summaries.")
+    raw_client = _get_raw_client("compare summaries")
 
-    system_prompt = f"""
-    You are an expert in identifying duplicate JIRA tickets. Your task is to compare the following two ticket summaries and rate their similarity on a scale of 1 to 10, where 1 is "completely different" and 10 is "almost certainly a duplicate".
+    scores = []
+    for start in range(0, len(candidate_summaries), batch_size):
+        batch = candidate_summaries[start:start + batch_size]
+        numbered_candidates = "\n".join(f'{i + 1}. "{summary}"' for i, summary in enumerate(batch))
+        system_prompt = f"""
+    You are an expert in identifying duplicate JIRA tickets. Your task is to compare a source ticket summary against a numbered list of candidate summaries and rate the similarity of each candidate to the source on a scale of 1 to 10, where 1 is "completely different" and 10 is "almost certainly a duplicate".
 
     Consider synonyms, rephrasing, and different ways of describing the same core technical issue. Focus on the meaning, not just the exact words.
 
-    **Summary A:** "{summary_a}"
-    **Summary B:** "{summary_b}"
+    **Source Summary:** "{source_summary}"
+    **Candidate Summaries:**
+    {numbered_candidates}
 
-    Based on your analysis, provide a single integer score from 1 to 10. Your response must contain ONLY the number and nothing else.
+    Respond with ONLY a JSON array of {len(batch)} integers from 1 to 10, one per candidate in the order listed (e.g. [3, 9, 1]). Do not include anything else.
     """
-    
-    messages_to_send = [
-        {"role": "system", "content": system_prompt}
-    ]
 
-    try:
-        resp = RAW_AZURE_OPENAI_CLIENT.chat.completions.create(
-            model=os.getenv("LLM_CHAT_DEPLOYMENT_NAME"),
-            messages=messages_to_send,
-            max_tokens=5,
-            temperature=0.0
-        )
-        score_str = resp.choices[0].message.content.strip()
-        print(f"DEBUG: Similarity score between summaries is '{score_str}'.")
-        return int(score_str)
-    except (ValueError, TypeError) as e:
-        print(f"WARNING: Could not parse similarity score from LLM output '{score_str}'. Error: {e}. Defaulting to low score.")
-        return 1
-    except Exception as e:
-        raise JiraBotError(f"Error during summary similarity check: {e}")
+        messages_to_send = [
+            {"role": "system", "content": system_prompt}
+        ]
+
+        content = ""
+        try:
+            resp = raw_client.chat.completions.create(
+                model=os.getenv("LLM_CHAT_DEPLOYMENT_NAME"),
+                messages=messages_to_send,
+                max_tokens=10 + 4 * len(batch),
+                temperature=0.0
+            )
+            content = resp.choices[0].message.content.strip()
+            print(f"DEBUG: Similarity scores for {len(batch)} candidates are '{content}'.")
+            scores.extend(_parse_similarity_scores(content, len(batch)))
+        except (ValueError, TypeError) as e:
+            print(f"WARNING: Could not parse similarity scores from LLM output '{content}'. Error: {e}. Defaulting to low scores.")
+            scores.extend([1] * len(batch))
+        except Exception as e:
+            raise JiraBotError(f"Error during summary similarity check: {e}")
+    return scores
 
 def _is_valid_jira_key_format(key_str: str) -> bool:
     """
@@ -154,6 +178,89 @@ def _is_valid_jira_key_format(key_str: str) -> bool:
     pattern = r'^[A-Z][A-Z0-9]+-[1-9]\d*$'
     return re.match(pattern, key_str, re.IGNORECASE) is not None
 
+# Words that carry no search criteria. A query made only of these, known codes and the
+# phrases below is parsed locally; anything else is sent to the LLM. "me" and "i" are not
+# filler: "for me" or "i reported" narrow the search, so only the phrases below consume them.
+FAST_PATH_FILLER_WORDS = {
+    "a", "an", "the", "show", "find", "list", "get", "give", "display", "search", "for",
+    "tickets", "ticket", "issues", "issue", "bugs", "bug", "jiras", "jira", "in", "on", "from",
+    "of", "with", "that", "are", "is", "which", "what", "please", "program", "project", "priority",
+    "and", "any", "can", "you", "want", "see", "to", "all"
+}
+_DATE_UNITS = r'(days?|weeks?|months?|years?)'
+_FAST_PATH_PHRASES = [
+    ("assignee", re.compile(r'\bassigned to me\b')),
+    ("reporter", re.compile(r'\b(?:reported|created|opened|filed|raised) by me\b')),
+    ("stale", re.compile(rf'\bnot (?:been )?updated (?:in|for) (?:the )?(?:last |past )?(\d+) {_DATE_UNITS}\b')),
+    ("stale", re.compile(rf'\bstale(?: for (?:the )?(?:last |past )?(\d+) {_DATE_UNITS})?\b')),
+    ("after", re.compile(rf'\b(created|updated) (?:in|within|during|over) (?:the )?(?:last|past) (\d+) {_DATE_UNITS}\b')),
+    ("before", re.compile(rf'\b(created|updated) (?:more than|over) (\d+) {_DATE_UNITS} ago\b')),
+    ("limit", re.compile(r'\b(?:(?:top|first) (\d+)|(\d+) (?:tickets|issues|bugs))\b')),
+    ("request", re.compile(r'\b(?:(?:show|give|get|find|list) me|can i see|i (?:want|need) to see)\b')),
+]
+
+def _fast_extract_params(prompt_text: str) -> Optional[Dict[str, Any]]:
+    """
+    Rule-based parser for simple queries built from the known vocabulary: program, project and
+    priority codes, "stale", "assigned to me", relative dates and result counts.
+    Returns the same params dict the LLM would, or None when any part of the query is not understood.
+    """
+    text = re.sub(r'[,?!.;:]', ' ', prompt_text.lower())
+    params: Dict[str, Any] = {"intent": "list"}
+    date_filters = []
+
+    for kind, pattern in _FAST_PATH_PHRASES:
+        for match in pattern.finditer(text):
+            if kind == "assignee":
+                params["assignee"] = "currentUser()"
+            elif kind == "reporter":
+                params["reporter"] = "currentUser()"
+            elif kind == "stale":
+                if match.group(1):
+                    relative = _convert_to_relative_days(int(match.group(1)), match.group(2))
+                    params["stale_days"] = int(relative.strip("-d"))
+                else:
+                    params.setdefault("stale_days", 30)
+            elif kind in ("after", "before"):
+                date_filters.append({
+                    "date_field": match.group(1),
+                    "date_number": int(match.group(2)),
+                    "date_unit": match.group(3),
+                    "date_operator": kind
+                })
+            elif kind == "limit":
+                params["maxResults"] = int(match.group(1) or match.group(2))
+        text = pattern.sub(" ", text)
+
+    # build_jql applies a single date clause, and ignores it for stale queries; let the LLM sort those out.
+    if len(date_filters) > 1 or (date_filters and "stale_days" in params):
+        return None
+    if date_filters:
+        params.update(date_filters[0])
+
+    for word in text.split():
+        code = word.upper()
+        if code in program_map:
+            field = "program"
+        elif code in project_map:
+            field = "project"
+        elif code in priority_map:
+            field = "priority"
+        elif word in FAST_PATH_FILLER_WORDS:
+            if word == "all" and "maxResults" not in params:
+                params["maxResults"] = "all"
+            continue
+        else:
+            return None
+        if params.get(field, code) != code:
+            return None
+        params[field] = code
+
+    if not any(field in params for field in ("program", "project", "priority", "assignee", "reporter", "stale_days")):
+        return None
+    params.setdefault("maxResults", 20)
+    return params
+
 def extract_params(prompt_text: str) -> Dict[str, Any]:
     """Extracts structured parameters from natural language user queries."""
     
@@ -162,8 +269,9 @@ def extract_params(prompt_text: str) -> Dict[str, Any]:
         if '-' in cleaned_word and not _is_valid_jira_key_format(cleaned_word):
             raise JiraBotError(f"Potential JIRA key '{cleaned_word}' has an invalid format. Keys should be in the format 'PROJ-123' and cannot contain special characters like '*'.")
 
-    if RAW_AZURE_OPENAI_CLIENT is None:
-        raise JiraBotError("Raw Azure OpenAI client not initialized. Cannot extract parameters.")
+    if (fast_params := _fast_extract_params(prompt_text)) is not None:
+        print(f"Parsed parameters locally without the LLM: {fast_params}")
+        return fast_params
 
     system_prompt = """
     You are an expert in extracting JIRA query parameters from natural language prompts.
@@ -179,6 +287,7 @@ def extract_params(prompt_text: str) -> Dict[str, Any]:
     **Extraction Rules:**
     - CRITICAL RULE: For time-based queries, you MUST use the format "-[number][d/w]" for relative dates (e.g., "-7d", "-2w"). Do NOT use "y" for year, "M" for month, or the "now()" function. For absolute dates, use "YYYY-MM-DD".
     - STALE TICKETS: If the user asks for "stale" tickets or "tickets not updated in X days", extract the number of days into the `stale_days` field. If no number is given, default `stale_days` to 30.
+    - RESULT COUNT: If the user asks for "all" matching tickets, set "maxResults" to "all" instead of a number.
     - USERS: For "assigned to me", use "assignee": "currentUser()". For "assigned to Ian Heath", reformat to "assignee": "Heath, Ian".
     - PROGRAMS: If the query includes a code from `Available programs` (STX, STXH, etc.), it MUST be a `program`, not a `project`.
     
@@ -204,6 +313,15 @@ def extract_params(prompt_text: str) -> Dict[str, Any]:
         projects_list=", ".join(project_map.keys())
     )
 
+    params_cache = get_params_cache()
+    prompt_fingerprint = fingerprint(formatted_system_prompt, program_map, project_map, priority_map, os.getenv("LLM_CHAT_DEPLOYMENT_NAME"))
+    if params_cache is not None and (cached_params := params_cache.get(prompt_text, prompt_fingerprint)) is not None:
+        print(f"Using cached parameters for this query: {cached_params}")
+        return cached_params
+
+    raw_client = _get_raw_client("extract parameters")
+    import openai  # Already loaded by the client; imported here to keep module import cheap.
+
     messages_to_send = [
         {"role": "system", "content": formatted_system_prompt},
         {"role": "user", "content": prompt_text}
@@ -217,12 +335,14 @@ def extract_params(prompt_text: str) -> Dict[str, Any]:
     print("----------------------------------------------\n")
 
     try:
-        resp = RAW_AZURE_OPENAI_CLIENT.chat.completions.create(model=os.getenv("LLM_CHAT_DEPLOYMENT_NAME"), messages=messages_to_send, max_tokens=256)
+        resp = raw_client.chat.completions.create(model=os.getenv("LLM_CHAT_DEPLOYMENT_NAME"), messages=messages_to_send, max_tokens=256, temperature=0.0)
         content = resp.choices[0].message.content.strip()
         print(f"LLM extracted parameters: {content}")
         if content.startswith("```json"):
             content = content[7:-3].strip()
         params = json.loads(content)
+        if params_cache is not None:
+            params_cache.put(prompt_text, prompt_fingerprint, params)
         return params
     except json.JSONDecodeError as e:
         raise JiraBotError(f"LLM output was not valid JSON: {content}. Error: {e}")
@@ -0,0 +1,197 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from dotenv import load_dotenv
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+from langchain_core.load import dumps, loads
+from openai.types.chat import ChatCompletion
+
+from local_store import open_database
+
+load_dotenv()
+
+# "read_write" serves cached completions and records new ones, "replay" serves ONLY from the
+# cache (for offline regression runs and benchmarks), "off" disables caching entirely.
+LLM_CACHE_MODE = os.getenv("LLM_CACHE_MODE", "read_write").lower()
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+# Sampled completions (temperature > 0, or unset so the service default applies) are not
+# reproducible, so they are only cached when this is enabled.
+LLM_CACHE_NONDETERMINISTIC = os.getenv("LLM_CACHE_NONDETERMINISTIC", "false").lower() == "true"
+
+VALID_CACHE_MODES = {"off", "read_write", "replay"}
+
+
+class LLMCacheMissError(Exception):
+    """Raised in replay mode when a completion is not in the cache."""
+    pass
+
+
+def is_replay_mode() -> bool:
+    return LLM_CACHE_MODE == "replay"
+
+def should_cache(temperature: Optional[float]) -> bool:
+    """Decides whether a completion with the given sampling temperature may be served from the cache."""
+    if LLM_CACHE_MODE not in VALID_CACHE_MODES:
+        raise ValueError(f"Invalid LLM_CACHE_MODE '{LLM_CACHE_MODE}'. Must be one of {sorted(VALID_CACHE_MODES)}.")
+    if LLM_CACHE_MODE == "off":
+        return False
+    if LLM_CACHE_MODE == "replay" or LLM_CACHE_NONDETERMINISTIC:
+        return True
+    return temperature is not None and temperature <= 0
+
+
+class CompletionCache:
+    """
+    A size-bounded on-disk store of LLM completions keyed by a hash of the request.
+    When the stored bytes exceed max_bytes, the least recently used completions are evicted.
+    """
+
+    def __init__(self, filename: str = "llm_cache.sqlite3", max_bytes: int = LLM_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = open_database(filename)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS completions (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used_at REAL NOT NULL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_completions_last_used ON completions (last_used_at)")
+        self._db.commit()
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute("SELECT response FROM completions WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE completions SET last_used_at = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, response: str) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO completions (key, response, size, last_used_at) VALUES (?, ?, ?, ?)",
+                (key, response, len(response.encode("utf-8")), time.time())
+            )
+            # Keep the most recently used completions whose sizes add up to max_bytes.
+            self._db.execute("""
+                DELETE FROM completions WHERE key IN (
+                    SELECT key FROM (
+                        SELECT key, SUM(size) OVER (ORDER BY last_used_at DESC, key) AS running_size FROM completions
+                    ) WHERE running_size > ?
+                )
+            """, (self.max_bytes,))
+            self._db.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM completions")
+            self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM completions").fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": size, "mode": LLM_CACHE_MODE}
+
+
+class LangChainCompletionCache(BaseCache):
+    """Adapts CompletionCache to LangChain's cache interface so chat models look up completions before calling Azure."""
+
+    def __init__(self, store: CompletionCache):
+        self.store = store
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        cached = self.store.get(self.store.make_key("langchain", llm_string, prompt))
+        if cached is None:
+            if is_replay_mode():
+                raise LLMCacheMissError("Replay mode: no cached LangChain completion for this prompt.")
+            return None
+        return [loads(generation) for generation in json.loads(cached)]
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        if is_replay_mode():
+            return
+        self.store.put(self.store.make_key("langchain", llm_string, prompt), json.dumps([dumps(generation) for generation in return_val]))
+
+    def clear(self, **kwargs: Any) -> None:
+        self.store.clear()
+
+
+class _CachingCompletions:
+    """Stands in for client.chat.completions, serving create() from the completion cache."""
+
+    def __init__(self, completions, store: CompletionCache):
+        self._completions = completions
+        self._store = store
+
+    def create(self, **kwargs):
+        if kwargs.get("stream") or not should_cache(kwargs.get("temperature")):
+            if is_replay_mode():
+                raise LLMCacheMissError("Replay mode: streaming completions cannot be served from the cache.")
+            return self._completions.create(**kwargs)
+
+        key = self._store.make_key("openai", {name: value for name, value in kwargs.items() if name not in ("timeout", "extra_headers")})
+        if (cached := self._store.get(key)) is not None:
+            return ChatCompletion.model_validate_json(cached)
+        if is_replay_mode():
+            raise LLMCacheMissError(f"Replay mode: no cached completion for this request to '{kwargs.get('model')}'.")
+        response = self._completions.create(**kwargs)
+        self._store.put(key, response.model_dump_json())
+        return response
+
+    def __getattr__(self, name):
+        return getattr(self._completions, name)
+
+
+class _CachingChat:
+    def __init__(self, chat, store: CompletionCache):
+        self.completions = _CachingCompletions(chat.completions, store)
+        self._chat = chat
+
+    def __getattr__(self, name):
+        return getattr(self._chat, name)
+
+
+class CachingAzureOpenAIClient:
+    """
+    Wraps an openai.AzureOpenAI client so chat.completions.create() goes through the completion cache.
+    Everything else is passed through to the wrapped client.
+    """
+
+    def __init__(self, client, store: CompletionCache):
+        self._client = client
+        self.chat = _CachingChat(client.chat, store)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+_COMPLETION_CACHE = None
+_COMPLETION_CACHE_LOCK = threading.Lock()
+
+def get_completion_cache() -> Optional[CompletionCache]:
+    """Returns the process-wide completion cache, or None when LLM_CACHE_MODE is 'off'."""
+    global _COMPLETION_CACHE
+    if LLM_CACHE_MODE == "off":
+        return None
+    if _COMPLETION_CACHE is None:
+        with _COMPLETION_CACHE_LOCK:
+            if _COMPLETION_CACHE is None:
+                _COMPLETION_CACHE = CompletionCache()
+    return _COMPLETION_CACHE
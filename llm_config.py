@@ -1,8 +1,15 @@
 import os
+import threading
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
 from dotenv import load_dotenv
-from langchain_openai import AzureChatOpenAI
-from langchain_core.language_models.chat_models import BaseChatModel
-import openai
+
+if TYPE_CHECKING:
+    import httpx
+    import openai
+    from langchain_core.language_models.chat_models import BaseChatModel
+
+# langchain_openai, openai, httpx and the completion cache are imported inside the functions below:
+# they take seconds to import, and most entry points only need them once a client is built.
 
 load_dotenv()
 
@@ -12,35 +19,149 @@ LLM_RESOURCE_ENDPOINT = os.getenv("LLM_RESOURCE_ENDPOINT")
 LLM_CHAT_DEPLOYMENT_NAME = os.getenv("LLM_CHAT_DEPLOYMENT_NAME")
 AZURE_OPENAI_DEFAULT_HEADERS = {'Ocp-Apim-Subscription-Key': LLM_API_KEY}
 
-def get_llm() -> BaseChatModel:
-    """Configures and returns the AzureChatOpenAI instance for LangChain agents."""
-    if not all([LLM_API_KEY, LLM_API_VERSION, LLM_RESOURCE_ENDPOINT, LLM_CHAT_DEPLOYMENT_NAME]):
+# Connection pool shared by every LLM client in the process.
+LLM_HTTP_POOL_SIZE = int(os.getenv("LLM_HTTP_POOL_SIZE", "20"))
+LLM_HTTP_KEEPALIVE_SECONDS = float(os.getenv("LLM_HTTP_KEEPALIVE_SECONDS", "60"))
+LLM_HTTP_CONNECT_TIMEOUT = float(os.getenv("LLM_HTTP_CONNECT_TIMEOUT", "10"))
+LLM_HTTP_READ_TIMEOUT = float(os.getenv("LLM_HTTP_READ_TIMEOUT", "120"))
+
+_HTTP_CLIENT = None
+_ASYNC_HTTP_CLIENT = None
+_LLM_REGISTRY: Dict[Tuple[str, Optional[float]], "BaseChatModel"] = {}
+_RAW_CLIENT = None
+_CLIENTS_LOCK = threading.RLock()
+
+def _llm_settings_complete() -> bool:
+    """Checks the Azure settings. In cache replay mode nothing is sent, so the API key may be left unset."""
+    from llm_cache import is_replay_mode
+    if is_replay_mode():
+        return all([LLM_API_VERSION, LLM_RESOURCE_ENDPOINT, LLM_CHAT_DEPLOYMENT_NAME])
+    return all([LLM_API_KEY, LLM_API_VERSION, LLM_RESOURCE_ENDPOINT, LLM_CHAT_DEPLOYMENT_NAME])
+
+def get_shared_http_client() -> "httpx.Client":
+    """
+    Returns the keep-alive HTTP connection pool shared by the LangChain and raw Azure OpenAI clients,
+    so TLS sessions to the endpoint are set up once per process rather than once per client.
+    """
+    global _HTTP_CLIENT
+    with _CLIENTS_LOCK:
+        if _HTTP_CLIENT is None:
+            import httpx
+            from llm_rate_limiter import rate_limited_transport
+            _HTTP_CLIENT = httpx.Client(
+                transport=rate_limited_transport(httpx.HTTPTransport(limits=_http_limits())),
+                timeout=httpx.Timeout(LLM_HTTP_READ_TIMEOUT, connect=LLM_HTTP_CONNECT_TIMEOUT)
+            )
+        return _HTTP_CLIENT
+
+def get_shared_async_http_client() -> "httpx.AsyncClient":
+    """
+    Returns the async connection pool used when a LangChain model is called asynchronously (e.g. --stream).
+    It goes through the same rate limiter as the synchronous pool.
+    """
+    global _ASYNC_HTTP_CLIENT
+    with _CLIENTS_LOCK:
+        if _ASYNC_HTTP_CLIENT is None:
+            import httpx
+            from llm_rate_limiter import async_rate_limited_transport
+            _ASYNC_HTTP_CLIENT = httpx.AsyncClient(
+                transport=async_rate_limited_transport(httpx.AsyncHTTPTransport(limits=_http_limits())),
+                timeout=httpx.Timeout(LLM_HTTP_READ_TIMEOUT, connect=LLM_HTTP_CONNECT_TIMEOUT)
+            )
+        return _ASYNC_HTTP_CLIENT
+
+def _http_limits() -> "httpx.Limits":
+    import httpx
+    return httpx.Limits(
+        max_connections=LLM_HTTP_POOL_SIZE,
+        max_keepalive_connections=LLM_HTTP_POOL_SIZE,
+        keepalive_expiry=LLM_HTTP_KEEPALIVE_SECONDS
+    )
+
+def _build_llm(deployment: str, temperature: Optional[float] = None) -> "BaseChatModel":
+    """Configures a new AzureChatOpenAI instance for the deployment on the shared connection pool."""
+    from langchain_openai import AzureChatOpenAI
+    from llm_cache import get_completion_cache, should_cache, LangChainCompletionCache
+
+    completion_cache = get_completion_cache()
+    # Without a temperature the service default applies, so the model is only cached when
+    # LLM_CACHE_NONDETERMINISTIC is set (or in replay mode); temperature 0 models always are.
+    llm_cache = LangChainCompletionCache(completion_cache) if completion_cache and should_cache(temperature) else None
+    llm = AzureChatOpenAI(
+        api_key=LLM_API_KEY or "replay-mode",
+        api_version=LLM_API_VERSION,
+        azure_endpoint=LLM_RESOURCE_ENDPOINT,
+        azure_deployment=deployment,
+        default_headers=AZURE_OPENAI_DEFAULT_HEADERS,
+        http_client=get_shared_http_client(),
+        http_async_client=get_shared_async_http_client(),
+        temperature=temperature,
+        cache=llm_cache
+    )
+    print(f"LangChain Azure LLM configured: Model={deployment}, Temperature={temperature if temperature is not None else 'default'}, Endpoint={LLM_RESOURCE_ENDPOINT}")
+    return llm
+
+def get_llm(deployment: Optional[str] = None, temperature: Optional[float] = None) -> "BaseChatModel":
+    """
+    Returns the AzureChatOpenAI instance for LangChain agents.
+    One instance per deployment (LLM_CHAT_DEPLOYMENT_NAME by default) and temperature is built on first use and reused afterwards.
+    Summaries and extractions ask for temperature 0, so their output depends only on the prompt and repeats are served by the completion cache.
+    """
+    if not _llm_settings_complete():
         raise ValueError("Azure LLM environment variables are not fully set. Please check .env file.")
+    deployment = deployment or LLM_CHAT_DEPLOYMENT_NAME
     try:
-        llm = AzureChatOpenAI(
-            api_key=LLM_API_KEY,
-            api_version=LLM_API_VERSION,
-            azure_endpoint=LLM_RESOURCE_ENDPOINT,
-            azure_deployment=LLM_CHAT_DEPLOYMENT_NAME,
-            default_headers=AZURE_OPENAI_DEFAULT_HEADERS
-        )
-        print(f"LangChain Azure LLM configured: Model={LLM_CHAT_DEPLOYMENT_NAME}, Endpoint={LLM_RESOURCE_ENDPOINT}")
-        return llm
+        with _CLIENTS_LOCK:
+            if (deployment, temperature) not in _LLM_REGISTRY:
+                _LLM_REGISTRY[(deployment, temperature)] = _build_llm(deployment, temperature)
+            return _LLM_REGISTRY[(deployment, temperature)]
     except Exception as e:
         raise Exception(f"Failed to configure LangChain Azure LLM: {e}")
 
-def get_azure_openai_client() -> openai.AzureOpenAI:
-    """Configures and returns a raw openai.AzureOpenAI client for parameter extraction."""
-    if not all([LLM_API_KEY, LLM_API_VERSION, LLM_RESOURCE_ENDPOINT, LLM_CHAT_DEPLOYMENT_NAME]):
+def get_azure_openai_client() -> "openai.AzureOpenAI":
+    """
+    Configures and returns a raw openai.AzureOpenAI client for parameter extraction, on the shared connection pool.
+    Unless LLM_CACHE_MODE is 'off', the client is wrapped so completions go through the completion cache.
+    """
+    if not _llm_settings_complete():
         raise ValueError("Azure LLM environment variables are not fully set for raw client. Please check .env file.")
     try:
+        import openai
+        from llm_cache import get_completion_cache, CachingAzureOpenAIClient
+
         client = openai.AzureOpenAI(
-            api_key=LLM_API_KEY,
+            api_key=LLM_API_KEY or "replay-mode",
             api_version=LLM_API_VERSION,
             base_url=f"{LLM_RESOURCE_ENDPOINT}/openai/deployments/{LLM_CHAT_DEPLOYMENT_NAME}",
-            default_headers=AZURE_OPENAI_DEFAULT_HEADERS
+            default_headers=AZURE_OPENAI_DEFAULT_HEADERS,
+            http_client=get_shared_http_client()
         )
+        if completion_cache := get_completion_cache():
+            client = CachingAzureOpenAIClient(client, completion_cache)
         print("Raw Azure OpenAI client configured.")
         return client
     except Exception as e:
         raise Exception(f"Failed to configure raw Azure OpenAI client: {e}")
+
+def get_shared_azure_openai_client() -> "openai.AzureOpenAI":
+    """
+    Returns the process-wide raw client, building it on first use.
+    Thread-safe; if building fails, the next call tries again.
+    """
+    global _RAW_CLIENT
+    with _CLIENTS_LOCK:
+        if _RAW_CLIENT is None:
+            _RAW_CLIENT = get_azure_openai_client()
+        return _RAW_CLIENT
+
+def close_llm_clients() -> None:
+    """Drops the shared LLM clients and closes their connection pool, e.g. on shutdown."""
+    global _HTTP_CLIENT, _ASYNC_HTTP_CLIENT, _RAW_CLIENT
+    with _CLIENTS_LOCK:
+        _LLM_REGISTRY.clear()
+        _RAW_CLIENT = None
+        if _HTTP_CLIENT is not None:
+            _HTTP_CLIENT.close()
+            _HTTP_CLIENT = None
+        # The async pool may belong to an event loop that is already closed, so it is only dropped.
+        _ASYNC_HTTP_CLIENT = None
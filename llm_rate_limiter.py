@@ -0,0 +1,269 @@
+import contextvars
+import functools
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Mapping, Optional
+
+from dotenv import load_dotenv
+
+if TYPE_CHECKING:
+    import httpx
+
+load_dotenv()
+
+# Quota of the Azure OpenAI deployment, shared by every LLM call in the process.
+LLM_RATE_LIMIT_ENABLED = os.getenv("LLM_RATE_LIMIT_ENABLED", "true").lower() == "true"
+LLM_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "120000"))
+LLM_REQUESTS_PER_MINUTE = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "720"))
+# Completion size assumed for a request that does not set max_tokens.
+LLM_DEFAULT_COMPLETION_TOKENS = int(os.getenv("LLM_DEFAULT_COMPLETION_TOKENS", "500"))
+# Pause after a 429 without a Retry-After header; doubled on each consecutive 429.
+LLM_RATE_LIMIT_BACKOFF = float(os.getenv("LLM_RATE_LIMIT_BACKOFF", "1"))
+LLM_RATE_LIMIT_BACKOFF_MAX = float(os.getenv("LLM_RATE_LIMIT_BACKOFF_MAX", "60"))
+
+# Lower values are sent first. Interactive calls (the REPL user is waiting) go before background
+# ones (batch runs, warm-ups) whenever both are queued.
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+_PRIORITY: contextvars.ContextVar[int] = contextvars.ContextVar("llm_priority", default=PRIORITY_INTERACTIVE)
+
+
+@contextmanager
+def llm_priority(priority: int) -> Iterator[None]:
+    """Runs the LLM calls made inside the block (in this thread or task) at the given priority."""
+    token = _PRIORITY.set(priority)
+    try:
+        yield
+    finally:
+        _PRIORITY.reset(token)
+
+def current_priority() -> int:
+    return _PRIORITY.get()
+
+
+class TokenBucket:
+    """A bucket holding up to capacity units that refills evenly over one minute."""
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self.available = float(self.capacity)
+        self._refilled_at = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.available = min(self.capacity, self.available + (now - self._refilled_at) * self.capacity / 60.0)
+        self._refilled_at = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until amount units are available. A request larger than the bucket waits for a full bucket."""
+        self._refill(now)
+        missing = min(amount, self.capacity) - self.available
+        return max(0.0, missing * 60.0 / self.capacity)
+
+    def take(self, amount: float) -> None:
+        self.available -= min(amount, self.capacity)
+
+    def limit_to(self, remaining: float) -> None:
+        """Lowers the bucket to what the service reports as remaining; it never raises it."""
+        self.available = min(self.available, remaining)
+
+
+def estimate_request_tokens(body: bytes) -> int:
+    """
+    Estimates the tokens a chat completion request will use: about four characters per token for the
+    messages, plus max_tokens (or LLM_DEFAULT_COMPLETION_TOKENS) for the answer.
+    """
+    try:
+        payload = json.loads(body or b"{}")
+    except ValueError:
+        return LLM_DEFAULT_COMPLETION_TOKENS
+    prompt_chars = 0
+    for message in payload.get("messages") or []:
+        content = message.get("content") or ""
+        if isinstance(content, list):
+            content = " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+        prompt_chars += len(str(content)) + 16
+    if "tools" in payload:
+        prompt_chars += len(json.dumps(payload["tools"]))
+    completion_tokens = payload.get("max_tokens") or payload.get("max_completion_tokens") or LLM_DEFAULT_COMPLETION_TOKENS
+    return (prompt_chars + 3) // 4 + int(completion_tokens)
+
+def _retry_after_seconds(headers: Mapping[str, str]) -> Optional[float]:
+    for name, scale in (("retry-after-ms", 1000.0), ("retry-after", 1.0)):
+        value = headers.get(name)
+        if value:
+            try:
+                return float(value) / scale
+            except ValueError:
+                continue
+    return None
+
+def _header_number(headers: Mapping[str, str], name: str) -> Optional[float]:
+    try:
+        return float(headers[name]) if name in headers else None
+    except ValueError:
+        return None
+
+
+class LLMRateLimiter:
+    """
+    Schedules LLM requests against tokens-per-minute and requests-per-minute buckets.
+    Waiting requests are admitted strictly in (priority, arrival) order. Responses feed back into the
+    buckets: the service's x-ratelimit-remaining-* headers lower them, and a 429 pauses every caller
+    for Retry-After (or an exponential backoff when the header is missing).
+    """
+
+    def __init__(self, tokens_per_minute: int = LLM_TOKENS_PER_MINUTE, requests_per_minute: int = LLM_REQUESTS_PER_MINUTE):
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.requests = TokenBucket(requests_per_minute)
+        self._condition = threading.Condition()
+        self._queue = []
+        self._arrivals = itertools.count()
+        self._paused_until = 0.0
+        self._backoff = LLM_RATE_LIMIT_BACKOFF
+        self.admitted = 0
+        self.throttled = 0
+        self.waited_seconds = 0.0
+
+    def acquire(self, estimated_tokens: int, priority: Optional[int] = None) -> float:
+        """Blocks until the request may be sent and reserves its budget. Returns the seconds spent waiting."""
+        ticket = (current_priority() if priority is None else priority, next(self._arrivals))
+        started = time.monotonic()
+        with self._condition:
+            heapq.heappush(self._queue, ticket)
+            try:
+                while True:
+                    wait = None
+                    if self._queue[0] == ticket:
+                        now = time.monotonic()
+                        wait = max(self._paused_until - now, self.tokens.wait_time(estimated_tokens, now), self.requests.wait_time(1, now))
+                        if wait <= 0:
+                            heapq.heappop(self._queue)
+                            self.tokens.take(estimated_tokens)
+                            self.requests.take(1)
+                            break
+                    # Requests behind the head sleep until it is admitted; the head sleeps until its budget refills.
+                    self._condition.wait(timeout=wait)
+            except BaseException:
+                self._queue.remove(ticket)
+                heapq.heapify(self._queue)
+                raise
+            finally:
+                self._condition.notify_all()
+            waited = time.monotonic() - started
+            self.admitted += 1
+            self.waited_seconds += waited
+        return waited
+
+    def record_response(self, status_code: int, headers: Mapping[str, str]) -> None:
+        """Adapts the buckets to a response's rate-limit headers and backs off on 429."""
+        with self._condition:
+            remaining_tokens = _header_number(headers, "x-ratelimit-remaining-tokens")
+            if remaining_tokens is not None:
+                self.tokens.limit_to(remaining_tokens)
+            remaining_requests = _header_number(headers, "x-ratelimit-remaining-requests")
+            if remaining_requests is not None:
+                self.requests.limit_to(remaining_requests)
+            if status_code == 429:
+                self.throttled += 1
+                delay = _retry_after_seconds(headers)
+                if delay is None:
+                    delay = self._backoff
+                    self._backoff = min(self._backoff * 2, LLM_RATE_LIMIT_BACKOFF_MAX)
+                self._paused_until = max(self._paused_until, time.monotonic() + min(delay, LLM_RATE_LIMIT_BACKOFF_MAX))
+                self.tokens.limit_to(0)
+                print(f"--- Azure OpenAI rate limit hit. Pausing LLM requests for {delay:.1f}s. ---")
+            elif status_code < 400:
+                self._backoff = LLM_RATE_LIMIT_BACKOFF
+            self._condition.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                "admitted": self.admitted,
+                "throttled": self.throttled,
+                "queued": len(self._queue),
+                "waited_seconds": round(self.waited_seconds, 3),
+                "tokens_available": int(self.tokens.available),
+                "requests_available": int(self.requests.available),
+            }
+
+
+def _request_body(request: "httpx.Request") -> bytes:
+    try:
+        return request.content
+    except Exception:
+        # Streaming request bodies cannot be read up front; they are charged the default completion size.
+        return b""
+
+@functools.lru_cache(maxsize=None)
+def _make_transports():
+    import httpx
+
+    class RateLimitedTransport(httpx.BaseTransport):
+        """Wraps a transport so every request passes through the limiter before it is sent."""
+
+        def __init__(self, transport: httpx.BaseTransport, limiter: LLMRateLimiter):
+            self._transport = transport
+            self._limiter = limiter
+
+        def handle_request(self, request: httpx.Request) -> httpx.Response:
+            self._limiter.acquire(estimate_request_tokens(_request_body(request)))
+            response = self._transport.handle_request(request)
+            self._limiter.record_response(response.status_code, response.headers)
+            return response
+
+        def close(self) -> None:
+            self._transport.close()
+
+    class AsyncRateLimitedTransport(httpx.AsyncBaseTransport):
+        """Async counterpart of RateLimitedTransport; the wait runs in a worker thread so the event loop keeps going."""
+
+        def __init__(self, transport: httpx.AsyncBaseTransport, limiter: LLMRateLimiter):
+            self._transport = transport
+            self._limiter = limiter
+
+        async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+            import asyncio
+            estimated_tokens = estimate_request_tokens(_request_body(request))
+            await asyncio.to_thread(self._limiter.acquire, estimated_tokens, current_priority())
+            response = await self._transport.handle_async_request(request)
+            self._limiter.record_response(response.status_code, response.headers)
+            return response
+
+        async def aclose(self) -> None:
+            await self._transport.aclose()
+
+    return RateLimitedTransport, AsyncRateLimitedTransport
+
+def rate_limited_transport(transport: "httpx.BaseTransport", limiter: Optional[LLMRateLimiter] = None) -> "httpx.BaseTransport":
+    """Wraps an httpx transport with the shared limiter, or returns it unchanged when LLM_RATE_LIMIT_ENABLED is false."""
+    limiter = limiter or get_rate_limiter()
+    if limiter is None:
+        return transport
+    return _make_transports()[0](transport, limiter)
+
+def async_rate_limited_transport(transport: "httpx.AsyncBaseTransport", limiter: Optional[LLMRateLimiter] = None) -> "httpx.AsyncBaseTransport":
+    limiter = limiter or get_rate_limiter()
+    if limiter is None:
+        return transport
+    return _make_transports()[1](transport, limiter)
+
+
+_RATE_LIMITER = None
+_RATE_LIMITER_LOCK = threading.Lock()
+
+def get_rate_limiter() -> Optional[LLMRateLimiter]:
+    """Returns the process-wide limiter, or None when LLM_RATE_LIMIT_ENABLED is false."""
+    global _RATE_LIMITER
+    if not LLM_RATE_LIMIT_ENABLED:
+        return None
+    with _RATE_LIMITER_LOCK:
+        if _RATE_LIMITER is None:
+            _RATE_LIMITER = LLMRateLimiter()
+        return _RATE_LIMITER
@@ -0,0 +1,25 @@
+import os
+import sqlite3
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Directory holding the bot's on-disk caches. Every file in it can be deleted safely.
+JIRA_BOT_CACHE_DIR = os.getenv("JIRA_BOT_CACHE_DIR", ".jira_bot_cache")
+
+def open_database(filename: str) -> sqlite3.Connection:
+    """
+    Opens (creating if needed) a SQLite database in JIRA_BOT_CACHE_DIR.
+    Pass ':memory:' for a throwaway in-process database, e.g. in tests.
+    The connection may be shared between threads; callers serialize access with their own lock.
+    """
+    if filename == ":memory:":
+        path = filename
+    else:
+        os.makedirs(JIRA_BOT_CACHE_DIR, exist_ok=True)
+        path = os.path.join(JIRA_BOT_CACHE_DIR, filename)
+    connection = sqlite3.connect(path, check_same_thread=False, timeout=30)
+    if path != ":memory:":
+        connection.execute("PRAGMA journal_mode=WAL")
+    return connection
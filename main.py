@@ -1,24 +1,211 @@
+import argparse
+import asyncio
 import sys
+import threading
 import traceback
-from jira_agent import get_jira_agent
-from jira_utils import JiraBotError
-from langchain_core.messages import HumanMessage, AIMessage
+from jira_utils import JiraBotError, get_jira_client
+from intent_router import INTENT_ROUTER_ENABLED, route_query, route_result, route_tool, run_route
+from chat_history import ChatHistoryManager
+
+class AgentLoader:
+    """
+    Builds the agent once: in a background thread with --warm, otherwise on the first query.
+    The heavy LangChain imports and the Jira/Azure handshakes happen here instead of at startup.
+    """
+
+    def __init__(self):
+        self._agent = None
+        self._error = None
+        self._lock = threading.Lock()
+
+    def start_in_background(self):
+        threading.Thread(target=self._load, name="agent-warmup", daemon=True).start()
+
+    def _load(self):
+        with self._lock:
+            if self._agent is not None or self._error is not None:
+                return
+            try:
+                from jira_agent import get_jira_agent
+                from llm_config import get_shared_azure_openai_client
+                self._agent = get_jira_agent()
+            except Exception as e:
+                self._error = e
+                return
+            # Connect the shared clients now so the first tool call does not pay for it.
+            # A failure here is reported again by the tool that needs the client.
+            for warm_up in (get_jira_client, get_shared_azure_openai_client):
+                try:
+                    warm_up()
+                except Exception as e:
+                    print(f"WARNING: Could not warm up a client: {e}", file=sys.stderr)
+
+    def get(self):
+        self._load()
+        if self._error is not None:
+            raise self._error
+        return self._agent
+
+class _ToolTokenPrinter:
+    """
+    Prints the tokens of LLM calls made inside tools. Tools such as summarize_multiple_tickets_tool
+    run several calls at once, so one call is printed live and the others are buffered and printed
+    in full when it finishes, instead of interleaving their tokens.
+    """
+
+    def __init__(self):
+        self.live_run = None
+        self.buffered = {}
+        self.finished = set()
+        self.streamed = False
+
+    def token(self, run_id: str, text: str):
+        self.streamed = True
+        if self.live_run is None:
+            self.live_run = run_id
+            print(self.buffered.pop(run_id, ""), end="")
+        if run_id == self.live_run:
+            print(text, end="", flush=True)
+        else:
+            self.buffered[run_id] = self.buffered.get(run_id, "") + text
+
+    def end(self, run_id: str):
+        if run_id == self.live_run:
+            self.live_run = None
+            print(flush=True)
+        elif run_id in self.buffered:
+            self.finished.add(run_id)
+        if self.live_run is not None:
+            return
+        for buffered_run in [run for run in self.buffered if run in self.finished]:
+            print(self.buffered.pop(buffered_run), flush=True)
+            self.finished.discard(buffered_run)
+        if self.buffered:
+            # The oldest call still running takes over the live output.
+            next_run = next(iter(self.buffered))
+            self.live_run = next_run
+            print(self.buffered.pop(next_run), end="", flush=True)
+
+# Routed tools whose answer is the text of their single LLM call. When that call streamed, the answer is not printed again.
+STREAMED_ANSWER_TOOLS = {"summarize_ticket_tool"}
+
+async def _print_events(events) -> tuple:
+    """
+    Prints tool progress and LLM tokens from an astream_events stream as they arrive.
+    LLM calls inside tools (e.g. ticket summaries) stream too, because they inherit the streaming callbacks.
+    Returns the root run's output, whether the agent's own answer was printed, and the tool token printer.
+    """
+    result = {}
+    tool_depth = 0
+    search_tool_used = False
+    answer_started = False
+    tool_tokens = _ToolTokenPrinter()
+    async for event in events:
+        kind = event["event"]
+        if kind == "on_tool_start":
+            tool_depth += 1
+            search_tool_used = search_tool_used or event["name"] == "jira_search_tool"
+            print(f"\n[{event['name']}] working...", flush=True)
+        elif kind == "on_tool_end":
+            tool_depth -= 1
+            print(f"\n[{event['name']}] done.", flush=True)
+        elif kind == "on_chat_model_stream":
+            text = event["data"]["chunk"].content
+            if not isinstance(text, str) or not text:
+                continue
+            if tool_depth > 0:
+                tool_tokens.token(event["run_id"], text)
+                continue
+            # jira_search_tool results are shown as a list below instead of the agent's wording.
+            if search_tool_used:
+                continue
+            if not answer_started:
+                print("\nJIRA Bot: ", end="")
+                answer_started = True
+            print(text, end="", flush=True)
+        elif kind == "on_chat_model_end" and tool_depth > 0:
+            tool_tokens.end(event["run_id"])
+        if kind in ("on_chain_end", "on_tool_end") and not event.get("parent_ids"):
+            result = event["data"]["output"]
+    if answer_started:
+        print()
+    return result, answer_started, tool_tokens
+
+async def _stream_agent(agent, inputs: dict) -> tuple:
+    """
+    Runs the agent with astream_events, printing tool progress and LLM tokens as they arrive.
+    Returns the same result dict as agent.invoke, plus whether the final answer was already printed.
+    """
+    result, answer_started, _ = await _print_events(agent.astream_events(inputs, version="v2"))
+    return result, answer_started
+
+async def _stream_route(route) -> tuple:
+    """
+    Runs a routed tool with astream_events, so a summary prints as it is generated instead of when it is done.
+    Returns the same result dict as run_route, plus whether the answer was already printed.
+    """
+    tool_name, tool_input = route
+    output, _, tool_tokens = await _print_events(route_tool(route).astream_events(tool_input, version="v2"))
+    return route_result(route, output), tool_tokens.streamed and tool_name in STREAMED_ANSWER_TOOLS
+
+def _print_result(result: dict, answer_shown: bool = False):
+    """Prints the issue list when jira_search_tool ran, otherwise the agent's answer unless it was already streamed."""
+    search_tool_used = False
+    issues_found = None
+
+    if result.get('intermediate_steps'):
+        for action, tool_output in result['intermediate_steps']:
+            if action.tool == 'jira_search_tool':
+                search_tool_used = True
+                if isinstance(tool_output, list):
+                    issues_found = tool_output
+                break 
+
+    if search_tool_used:
+        if issues_found:
+            print(f"\n--- Found {len(issues_found)} JIRA Issues ---")
+            for i, issue in enumerate(issues_found):
+                print(f"{i+1}. Key: {issue['key']}")
+                print(f"   Summary: {issue['summary']}")
+                print(f"   Status: {issue['status']}")
+                print(f"   Assignee: {issue['assignee']}")
+                print(f"   Priority: {issue['priority']}")
+                print(f"   Created: {issue['created']}")
+                print(f"   Updated: {issue['updated']}")
+                print(f"   URL: {issue['url']}")
+                print("-" * 20)
+            # The note only applies when the search stopped at its limit (the requested count or the result cap).
+            limit = getattr(issues_found, "limit", None)
+            if limit is not None and len(issues_found) >= limit:
+                print(f"Note: Displaying the maximum of {limit} results. Refine your query for more specific results.")
+        else:
+            print("\nJIRA Bot: I searched, but couldn't find any issues matching your query.")
+    
+    elif not answer_shown:
+        final_output = result.get('output')
+        if final_output and "Is this information correct? (yes/no):" not in final_output:
+            print(f"\nJIRA Bot: {final_output}")
 
 def main():
+    parser = argparse.ArgumentParser(description="Interactive JIRA triage assistant.")
+    parser.add_argument("--warm", action="store_true", help="Initialize the agent and clients in the background while the prompt is shown")
+    parser.add_argument("--stream", action="store_true", help="Print tool progress and answer tokens as they arrive")
+    args = parser.parse_args()
+
     print("Welcome to the JiraTriageLLMAgent!")
     print("Type your request in natural language. Type 'exit' to quit.")
     print("Examples: 'Show me all stale tickets in PLATFORM project'")
     print("          'Find duplicate tickets related to login errors'")
     print("          'Bugs assigned to me in PLATFORM with high priority'")
 
-    agent = None
-    try:
-        agent = get_jira_agent()
-    except Exception as e:
-        print(f"FATAL ERROR: Could not initialize agent. Exiting. Details: {e}", file=sys.stderr)
-        sys.exit(1)
+    agent_loader = AgentLoader()
+    if args.warm:
+        agent_loader.start_in_background()
 
-    chat_history = []
+    # Older turns are folded into a rolling summary so the prompt size stays roughly constant over a session.
+    chat_history = ChatHistoryManager()
+    # One loop for the whole session: the async LLM clients keep connections bound to the loop that opened them.
+    stream_loop = asyncio.new_event_loop() if args.stream else None
 
     while True:
         user_input = input("\nYour JIRA Query Request: ")
@@ -31,44 +218,28 @@ def main():
             continue
 
         try:
-            result = agent.invoke({"input": user_input, "chat_history": chat_history})
-
-            chat_history.append(HumanMessage(content=user_input))
-            chat_history.append(AIMessage(content=result["output"]))
-
-            search_tool_used = False
-            issues_found = None
-
-            if result.get('intermediate_steps'):
-                for action, tool_output in result['intermediate_steps']:
-                    if action.tool == 'jira_search_tool':
-                        search_tool_used = True
-                        if isinstance(tool_output, list):
-                            issues_found = tool_output
-                        break 
+            # Unambiguous requests ("summarize PLAT-1234") call their tool directly, skipping the agent's LLM round trips.
+            route = route_query(user_input) if INTENT_ROUTER_ENABLED else None
+            answer_shown = False
+            if route is not None and args.stream:
+                result, answer_shown = stream_loop.run_until_complete(_stream_route(route))
+            elif route is not None:
+                result = run_route(route)
+            else:
+                try:
+                    agent = agent_loader.get()
+                except Exception as e:
+                    print(f"FATAL ERROR: Could not initialize agent. Exiting. Details: {e}", file=sys.stderr)
+                    sys.exit(1)
 
-            if search_tool_used:
-                if issues_found:
-                    print(f"\n--- Found {len(issues_found)} JIRA Issues ---")
-                    for i, issue in enumerate(issues_found):
-                        print(f"{i+1}. Key: {issue['key']}")
-                        print(f"   Summary: {issue['summary']}")
-                        print(f"   Status: {issue['status']}")
-                        print(f"   Assignee: {issue['assignee']}")
-                        print(f"   Priority: {issue['priority']}")
-                        print(f"   Created: {issue['created']}")
-                        print(f"   Updated: {issue['updated']}")
-                        print(f"   URL: {issue['url']}")
-                        print("-" * 20)
-                    if len(issues_found) >= 20: 
-                        print("Note: Displaying the maximum of 20 results. Refine your query for more specific results.")
+                inputs = {"input": user_input, "chat_history": chat_history.messages()}
+                if args.stream:
+                    result, answer_shown = stream_loop.run_until_complete(_stream_agent(agent, inputs))
                 else:
-                    print("\nJIRA Bot: I searched, but couldn't find any issues matching your query.")
-            
-            else:
-                final_output = result.get('output')
-                if final_output and "Is this information correct? (yes/no):" not in final_output:
-                    print(f"\nJIRA Bot: {final_output}")
+                    result = agent.invoke(inputs)
+
+            _print_result(result, answer_shown)
+            chat_history.add_turn(user_input, result)
 
         except JiraBotError as e:
             print(f"\nJIRA Bot Error: {e}", file=sys.stderr)
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from local_store import open_database
+
+PARAMS_CACHE_ENABLED = os.getenv("PARAMS_CACHE_ENABLED", "true").lower() == "true"
+PARAMS_CACHE_MAX_ENTRIES = int(os.getenv("PARAMS_CACHE_MAX_ENTRIES", "2000"))
+# Cached params only contain relative dates ("-7d"), so entries stay correct for a long time.
+PARAMS_CACHE_TTL_SECONDS = int(os.getenv("PARAMS_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+
+
+def normalize_query(query: str) -> str:
+    """Reduces a query to the form used as cache key: lowercase, no trailing punctuation, single spaces."""
+    text = re.sub(r'[?!.,;:"\']+', ' ', query.lower())
+    return " ".join(text.split())
+
+def fingerprint(*parts: Any) -> str:
+    """Hashes everything that shapes the LLM's answer (prompt, maps, model) so editing any of it invalidates old entries."""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class ParamsCache:
+    """
+    A persistent query -> extracted params cache stored in SQLite.
+    Entries expire after ttl_seconds and the least recently used are evicted beyond max_entries.
+    """
+
+    def __init__(self, filename: str = "params_cache.sqlite3", max_entries: int = PARAMS_CACHE_MAX_ENTRIES, ttl_seconds: int = PARAMS_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._db = open_database(filename)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS params_cache (
+                fingerprint TEXT NOT NULL,
+                query TEXT NOT NULL,
+                params TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used_at REAL NOT NULL,
+                hit_count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (fingerprint, query)
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_params_cache_last_used ON params_cache (last_used_at)")
+        self._db.commit()
+
+    def get(self, query: str, prompt_fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Returns the cached params for the query, or None on a miss or an expired entry."""
+        key = normalize_query(query)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT params, created_at FROM params_cache WHERE fingerprint = ? AND query = ?",
+                (prompt_fingerprint, key)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    self._db.execute("DELETE FROM params_cache WHERE fingerprint = ? AND query = ?", (prompt_fingerprint, key))
+                    self._db.commit()
+                    self.evictions += 1
+                self.misses += 1
+                return None
+            self._db.execute(
+                "UPDATE params_cache SET last_used_at = ?, hit_count = hit_count + 1 WHERE fingerprint = ? AND query = ?",
+                (now, prompt_fingerprint, key)
+            )
+            self._db.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, query: str, prompt_fingerprint: str, params: Dict[str, Any]) -> None:
+        """Stores params for the query, then trims expired and least recently used entries."""
+        key = normalize_query(query)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO params_cache (fingerprint, query, params, created_at, last_used_at) VALUES (?, ?, ?, ?, ?)",
+                (prompt_fingerprint, key, json.dumps(params), now, now)
+            )
+            expired = self._db.execute("DELETE FROM params_cache WHERE created_at < ?", (now - self.ttl_seconds,)).rowcount
+            overflow = self._db.execute(
+                "DELETE FROM params_cache WHERE rowid IN (SELECT rowid FROM params_cache ORDER BY last_used_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            ).rowcount
+            self._db.commit()
+            self.evictions += expired + overflow
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM params_cache")
+            self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit/miss counters for this process plus the current entry count."""
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM params_cache").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+        }
+
+
+_PARAMS_CACHE = None
+_PARAMS_CACHE_LOCK = threading.Lock()
+
+def get_params_cache() -> Optional[ParamsCache]:
+    """Returns the process-wide params cache, or None when PARAMS_CACHE_ENABLED is false or the store cannot be opened."""
+    global _PARAMS_CACHE
+    if not PARAMS_CACHE_ENABLED:
+        return None
+    if _PARAMS_CACHE is None:
+        with _PARAMS_CACHE_LOCK:
+            if _PARAMS_CACHE is None:
+                try:
+                    _PARAMS_CACHE = ParamsCache()
+                except Exception as e:
+                    print(f"WARNING: Could not open the params cache, continuing without it: {e}")
+                    return None
+    return _PARAMS_CACHE
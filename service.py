@@ -0,0 +1,406 @@
+import argparse
+import asyncio
+import contextvars
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from dotenv import load_dotenv
+from pydantic import ValidationError
+
+from chat_history import ChatHistoryManager
+from intent_router import INTENT_ROUTER_ENABLED, route_query, run_route
+from jira_utils import JiraBotError, get_jira_client
+
+load_dotenv()
+
+# Tool and agent calls block, so they run on this many worker threads...
+SERVICE_WORKERS = int(os.getenv("SERVICE_WORKERS", "8"))
+# ...behind a queue of this size. Requests arriving when it is full get 503.
+SERVICE_MAX_QUEUE = int(os.getenv("SERVICE_MAX_QUEUE", "32"))
+SERVICE_SHUTDOWN_TIMEOUT = float(os.getenv("SERVICE_SHUTDOWN_TIMEOUT", "30"))
+SERVICE_SESSION_TTL_SECONDS = float(os.getenv("SERVICE_SESSION_TTL_SECONDS", "3600"))
+SERVICE_DRAFT_TTL_SECONDS = float(os.getenv("SERVICE_DRAFT_TTL_SECONDS", "3600"))
+SERVICE_MAX_BODY_BYTES = int(os.getenv("SERVICE_MAX_BODY_BYTES", "1048576"))
+# create_ticket_tool confirms on stdin; the service offers /tickets/drafts instead.
+SERVICE_EXCLUDED_TOOLS = {"create_ticket_tool"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+class WorkQueue:
+    """
+    A bounded queue in front of a thread pool. submit() fails fast with HTTP 503 when the queue is full,
+    so a burst of requests is shed instead of piling up unbounded latency.
+    """
+
+    def __init__(self, workers: int = SERVICE_WORKERS, max_queue: int = SERVICE_MAX_QUEUE):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self._queue = None
+        self._tasks = []
+        self._executor = None
+
+    def start(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="service-worker")
+        self._tasks = [asyncio.get_running_loop().create_task(self._worker()) for _ in range(self.workers)]
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def submit(self, function: Callable[..., Any], *args: Any) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((future, function, args))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise HTTPError(503, "The service is busy. Please retry shortly.", {"retry-after": "5"})
+        return await future
+
+    async def _worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            future, function, args = await self._queue.get()
+            self.in_flight += 1
+            try:
+                if not future.cancelled():
+                    # The request's context (e.g. its LLM priority) follows it onto the worker thread.
+                    context = contextvars.copy_context()
+                    result = await loop.run_in_executor(self._executor, lambda: context.run(function, *args))
+                    if not future.cancelled():
+                        future.set_result(result)
+            except Exception as e:
+                if not future.cancelled():
+                    future.set_exception(e)
+            finally:
+                self.in_flight -= 1
+                self.completed += 1
+                self._queue.task_done()
+
+    async def drain(self, timeout: float = SERVICE_SHUTDOWN_TIMEOUT) -> None:
+        """Waits up to timeout for queued and running work to finish, then stops the workers."""
+        if self._queue is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            print(f"WARNING: {self.depth + self.in_flight} requests were still pending after {timeout}s; stopping anyway.")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class Session:
+    def __init__(self):
+        self.history = ChatHistoryManager()
+        # Turns of one session run one at a time so its history stays in order. The lock is taken on the
+        # event loop, before the turn is queued, so one session never holds more than one worker thread.
+        self.lock = asyncio.Lock()
+        self.last_used = time.monotonic()
+
+
+class JiraService:
+    """
+    The assistant as a raw ASGI application. One process serves every user, so the Jira client,
+    the LLM connection pool, the rate limiter and the ticket, summary and completion caches are
+    shared, while chat history is kept per session.
+    """
+
+    def __init__(self, workers: int = SERVICE_WORKERS, max_queue: int = SERVICE_MAX_QUEUE):
+        self.work = WorkQueue(workers, max_queue)
+        self.sessions: Dict[str, Session] = {}
+        self.drafts: Dict[str, Dict[str, Any]] = {}
+        self.draining = False
+        self.started_at = time.time()
+        self.requests = 0
+        self._agent = None
+        self._agent_lock = threading.Lock()
+        self._routes = [
+            ("GET", r"/health", self.health),
+            ("GET", r"/stats", self.stats),
+            ("GET", r"/tools", self.list_tools),
+            ("POST", r"/tools/(?P<name>[\w-]+)", self.call_tool),
+            ("POST", r"/sessions", self.create_session),
+            ("DELETE", r"/sessions/(?P<session_id>[\w-]+)", self.delete_session),
+            ("POST", r"/sessions/(?P<session_id>[\w-]+)/query", self.query),
+            ("POST", r"/tickets/drafts", self.create_draft),
+            ("POST", r"/tickets/drafts/(?P<draft_id>[\w-]+)/submit", self.submit_draft),
+        ]
+
+    # --- ASGI plumbing ---
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._handle_http(scope, receive, send)
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await self.startup()
+                except Exception as e:
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def startup(self) -> None:
+        self.work.start()
+        # Connect the shared clients in the background; a request that needs one before then connects it itself.
+        asyncio.get_running_loop().run_in_executor(None, self._warm_up)
+
+    async def shutdown(self) -> None:
+        """Stops accepting work, lets queued and running requests finish, then closes the shared clients."""
+        from llm_config import close_llm_clients
+        self.draining = True
+        print("--- Shutting down: draining queued requests... ---")
+        await self.work.drain()
+        close_llm_clients()
+
+    def _warm_up(self) -> None:
+        from llm_config import get_llm, get_shared_azure_openai_client
+        for warm_up in (get_jira_client, get_shared_azure_openai_client, get_llm):
+            try:
+                warm_up()
+            except Exception as e:
+                print(f"WARNING: Could not warm up a client: {e}")
+
+    async def _handle_http(self, scope, receive, send) -> None:
+        self.requests += 1
+        try:
+            handler, params = self._match(scope["method"], scope["path"])
+            if self.draining and scope["path"] != "/health":
+                raise HTTPError(503, "The service is shutting down.")
+            body = await self._read_json(receive) if scope["method"] in ("POST", "PUT") else {}
+            status, payload = await handler(body, **params)
+            headers = {}
+        except HTTPError as e:
+            status, payload, headers = e.status, {"error": str(e)}, e.headers
+        except JiraBotError as e:
+            status, payload, headers = 400, {"error": str(e)}, {}
+        except Exception as e:
+            print(f"ERROR: Unhandled error for {scope['method']} {scope['path']}: {e}")
+            status, payload, headers = 500, {"error": "Internal error."}, {}
+        await self._send_json(send, status, payload, headers)
+
+    def _match(self, method: str, path: str) -> Tuple[Callable, Dict[str, str]]:
+        path_found = False
+        for route_method, pattern, handler in self._routes:
+            match = re.fullmatch(pattern, path.rstrip("/") or "/")
+            if match:
+                path_found = True
+                if route_method == method:
+                    return handler, match.groupdict()
+        raise HTTPError(405 if path_found else 404, "Method not allowed." if path_found else "Not found.")
+
+    @staticmethod
+    async def _read_json(receive) -> Dict[str, Any]:
+        chunks, size = [], 0
+        while True:
+            message = await receive()
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > SERVICE_MAX_BODY_BYTES:
+                raise HTTPError(413, "Request body is too large.")
+            chunks.append(chunk)
+            if not message.get("more_body"):
+                break
+        if not size:
+            return {}
+        try:
+            body = json.loads(b"".join(chunks))
+        except ValueError:
+            raise HTTPError(400, "Request body must be JSON.")
+        if not isinstance(body, dict):
+            raise HTTPError(400, "Request body must be a JSON object.")
+        return body
+
+    @staticmethod
+    async def _send_json(send, status: int, payload: Any, headers: Dict[str, str]) -> None:
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        raw_headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+        raw_headers.extend((name.encode(), value.encode()) for name, value in headers.items())
+        await send({"type": "http.response.start", "status": status, "headers": raw_headers})
+        await send({"type": "http.response.body", "body": body})
+
+    # --- Shared state ---
+
+    def _tools(self) -> Dict[str, Any]:
+        from jira_tools import ALL_JIRA_TOOLS
+        return {tool.name: tool for tool in ALL_JIRA_TOOLS if tool.name not in SERVICE_EXCLUDED_TOOLS}
+
+    def _get_agent(self):
+        with self._agent_lock:
+            if self._agent is None:
+                from jira_agent import get_jira_agent
+                self._agent = get_jira_agent(tools=list(self._tools().values()))
+            return self._agent
+
+    def _prune(self, entries: Dict[str, Any], ttl: float, last_used: Callable[[Any], float]) -> None:
+        now = time.monotonic()
+        for key in [key for key, entry in entries.items() if now - last_used(entry) > ttl]:
+            del entries[key]
+
+    def _session(self, session_id: str) -> Session:
+        self._prune(self.sessions, SERVICE_SESSION_TTL_SECONDS, lambda session: session.last_used)
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise HTTPError(404, f"Session '{session_id}' not found or expired.")
+        session.last_used = time.monotonic()
+        return session
+
+    # --- Endpoints ---
+
+    async def health(self, body):
+        return 200, {"status": "draining" if self.draining else "ok"}
+
+    async def stats(self, body):
+        from llm_cache import get_completion_cache
+        from llm_rate_limiter import get_rate_limiter
+        from summary_store import get_summary_store
+        from ticket_cache import get_ticket_cache
+
+        stats = {
+            "uptime_seconds": round(time.time() - self.started_at),
+            "requests": self.requests,
+            "sessions": len(self.sessions),
+            "drafts": len(self.drafts),
+            "queue": {"depth": self.work.depth, "max": self.work.max_queue, "in_flight": self.work.in_flight, "completed": self.work.completed, "rejected": self.work.rejected},
+        }
+        for name, component in (("ticket_cache", get_ticket_cache()), ("summary_store", get_summary_store()), ("completion_cache", get_completion_cache()), ("rate_limiter", get_rate_limiter())):
+            stats[name] = component.stats() if component is not None else None
+        return 200, stats
+
+    async def list_tools(self, body):
+        tools = [{"name": name, "description": " ".join(tool.description.split()), "args": tool.args} for name, tool in self._tools().items()]
+        return 200, {"tools": tools}
+
+    async def call_tool(self, body, name: str):
+        if name in SERVICE_EXCLUDED_TOOLS:
+            raise HTTPError(400, f"'{name}' is interactive; use POST /tickets/drafts and /tickets/drafts/<id>/submit instead.")
+        tool = self._tools().get(name)
+        if tool is None:
+            raise HTTPError(404, f"Unknown tool '{name}'.")
+        try:
+            output = await self.work.submit(tool.invoke, body)
+        except (ValidationError, TypeError) as e:
+            # Missing, unknown or mistyped arguments are the caller's error, not the service's.
+            raise HTTPError(400, f"Invalid arguments for '{name}': {e}")
+        return 200, {"tool": name, "output": output}
+
+    async def create_session(self, body):
+        session_id = uuid.uuid4().hex
+        self.sessions[session_id] = Session()
+        return 201, {"session_id": session_id}
+
+    async def delete_session(self, body, session_id: str):
+        if self.sessions.pop(session_id, None) is None:
+            raise HTTPError(404, f"Session '{session_id}' not found or expired.")
+        return 200, {"deleted": session_id}
+
+    async def query(self, body, session_id: str):
+        query = (body.get("query") or "").strip()
+        if not query:
+            raise HTTPError(400, "Provide the request text as 'query'.")
+        session = self._session(session_id)
+        if session.lock.locked():
+            raise HTTPError(409, f"Session '{session_id}' is still answering its previous query. Retry once it has finished.")
+        async with session.lock:
+            route, result = await self.work.submit(self._run_query, session, query)
+        response = {"session_id": session_id, "route": route, "output": result.get("output")}
+        issues = [output for action, output in result.get("intermediate_steps", []) if action.tool == "jira_search_tool" and isinstance(output, list)]
+        if issues:
+            response["issues"] = issues[0]
+        return 200, response
+
+    def _run_query(self, session: Session, query: str) -> Tuple[str, Dict[str, Any]]:
+        route = route_query(query) if INTENT_ROUTER_ENABLED else None
+        if route is not None:
+            result = run_route(route)
+        else:
+            result = self._get_agent().invoke({"input": query, "chat_history": session.history.messages()})
+        session.history.add_turn(query, result)
+        return (route[0] if route is not None else "agent"), result
+
+    async def create_draft(self, body):
+        """
+        First half of ticket creation: validates the fields and runs the duplicate check, then returns
+        the description template to fill in. Replaces the prompts and the ticket_description.txt round trip.
+        """
+        from jira_tools import validate_ticket_fields, find_creation_duplicates, build_description_template
+        try:
+            fields = validate_ticket_fields(**body)
+        except TypeError as e:
+            raise HTTPError(400, f"Invalid ticket fields: {e}")
+        duplicates = await self.work.submit(find_creation_duplicates, fields["summary"], body["program"], fields["project"])
+        self._prune(self.drafts, SERVICE_DRAFT_TTL_SECONDS, lambda draft: draft["created"])
+        draft_id = uuid.uuid4().hex
+        self.drafts[draft_id] = {"fields": fields, "duplicates": [issue["key"] for issue in duplicates], "created": time.monotonic()}
+        return 201, {
+            "draft_id": draft_id,
+            "fields": fields,
+            "duplicates": duplicates,
+            "description_template": build_description_template(fields["summary"], fields["system"], fields["bios_version"]),
+        }
+
+    async def submit_draft(self, body, draft_id: str):
+        """
+        Second half of ticket creation: takes the filled-in template and creates the ticket.
+        Needs "confirm": true, and "confirm_duplicates": true when the draft found likely duplicates.
+        """
+        from jira_tools import parse_description_text, submit_ticket
+        draft = self.drafts.get(draft_id)
+        if draft is None:
+            raise HTTPError(404, f"Draft '{draft_id}' not found or expired.")
+        if not body.get("confirm"):
+            raise HTTPError(400, "Set 'confirm' to true to create the ticket.")
+        if draft["duplicates"] and not body.get("confirm_duplicates"):
+            raise HTTPError(409, f"Likely duplicates exist: {', '.join(draft['duplicates'])}. Set 'confirm_duplicates' to true to create the ticket anyway.")
+        description, steps = parse_description_text(body.get("description_text") or "")
+        # The draft is claimed before the call, so a repeated submit cannot create a second ticket.
+        del self.drafts[draft_id]
+        try:
+            issue_key, permalink = await self.work.submit(submit_ticket, draft["fields"], description, steps)
+        except Exception:
+            self.drafts[draft_id] = draft
+            raise
+        return 201, {"key": issue_key, "url": permalink, "message": f"Successfully created ticket {issue_key}. You can view it here: {permalink}"}
+
+
+app = JiraService()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serves the JIRA assistant over HTTP for several users.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("The service needs an ASGI server. Install uvicorn, or run 'service:app' with any ASGI server.")
+    uvicorn.run(app, host=args.host, port=args.port, lifespan="on", timeout_graceful_shutdown=int(SERVICE_SHUTDOWN_TIMEOUT) + 5)
+
+if __name__ == "__main__":
+    main()
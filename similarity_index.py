@@ -0,0 +1,73 @@
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+
+# Character n-grams make the index tolerant of typos, plurals and joined words
+# ("S3 resume hang" vs "hangs on S3-resume"), which matter more than grammar in ticket summaries.
+NGRAM_SIZE = 3
+
+
+def _tokenize(text: str) -> List[str]:
+    """Lowercases the text and splits it into alphanumeric words."""
+    return re.findall(r'[a-z0-9]+', (text or "").lower())
+
+def _extract_features(text: str) -> Counter:
+    """Returns the term counts for a summary: whole words plus padded character n-grams of each word."""
+    features = Counter()
+    for word in _tokenize(text):
+        features[f"w:{word}"] += 1
+        padded = f" {word} "
+        for i in range(max(1, len(padded) - NGRAM_SIZE + 1)):
+            features[padded[i:i + NGRAM_SIZE]] += 1
+    return features
+
+
+class SummaryIndex:
+    """
+    A local TF-IDF index over ticket summaries for duplicate detection.
+    Needs no network access: all candidates are scored against a query in one pass over sparse vectors.
+    """
+
+    def __init__(self, summaries: List[str]):
+        self.summaries = list(summaries)
+        term_counts = [_extract_features(summary) for summary in self.summaries]
+
+        document_frequency = Counter()
+        for counts in term_counts:
+            document_frequency.update(counts.keys())
+        self._document_count = len(self.summaries)
+        self._idf = {term: self._smoothed_idf(df) for term, df in document_frequency.items()}
+
+        self._vectors = [self._vectorize(counts) for counts in term_counts]
+
+        # Inverted index so a query only touches the documents sharing at least one term with it.
+        self._postings: Dict[str, List[Tuple[int, float]]] = {}
+        for doc_id, vector in enumerate(self._vectors):
+            for term, weight in vector.items():
+                self._postings.setdefault(term, []).append((doc_id, weight))
+
+    def _smoothed_idf(self, document_frequency: int) -> float:
+        return math.log((1 + self._document_count) / (1 + document_frequency)) + 1.0
+
+    def _vectorize(self, counts: Counter) -> Dict[str, float]:
+        """Builds an L2-normalized TF-IDF vector. Terms unseen in the index still count toward the norm."""
+        unseen_idf = self._smoothed_idf(0)
+        vector = {term: count * self._idf.get(term, unseen_idf) for term, count in counts.items()}
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        if norm == 0:
+            return {}
+        return {term: weight / norm for term, weight in vector.items()}
+
+    def score(self, query: str) -> List[float]:
+        """Returns the cosine similarity (0.0 to 1.0) between the query and every indexed summary, in index order."""
+        scores = [0.0] * self._document_count
+        for term, query_weight in self._vectorize(_extract_features(query)).items():
+            for doc_id, doc_weight in self._postings.get(term, ()):
+                scores[doc_id] += query_weight * doc_weight
+        return scores
+
+    def top_k(self, query: str, k: int, min_score: float = 0.0) -> List[Tuple[int, float]]:
+        """Returns up to k (index, score) pairs with a score of at least min_score, best match first."""
+        ranked = sorted(enumerate(self.score(query)), key=lambda pair: pair[1], reverse=True)
+        return [(doc_id, score) for doc_id, score in ranked[:k] if score >= min_score and score > 0.0]
@@ -0,0 +1,211 @@
+import os
+import re
+import threading
+from typing import Callable, List, Optional
+
+from dotenv import load_dotenv
+
+from llm_config import get_llm
+
+load_dotenv()
+
+# Token budget for the ticket text placed in a summary prompt. Override it for one tool with
+# <TOOL_NAME>_TOKEN_BUDGET, e.g. SUMMARIZE_MULTIPLE_TICKETS_TOOL_TOKEN_BUDGET=3000.
+SUMMARY_TOKEN_BUDGET = int(os.getenv("SUMMARY_TOKEN_BUDGET", "6000"))
+SUMMARY_CHUNK_TOKENS = int(os.getenv("SUMMARY_CHUNK_TOKENS", "3000"))
+SUMMARY_CHUNK_WORKERS = int(os.getenv("SUMMARY_CHUNK_WORKERS", "4"))
+# Upper bound on map-reduce rounds, in case chunk notes do not shrink below the budget.
+SUMMARY_MAX_REDUCE_ROUNDS = 3
+TOKEN_ENCODING = os.getenv("TOKEN_ENCODING", "cl100k_base")
+# Token bound for one reduce prompt when aggregating many ticket summaries.
+AGGREGATE_BATCH_TOKENS = int(os.getenv("AGGREGATE_BATCH_TOKENS", "6000"))
+AGGREGATE_MAX_WORKERS = int(os.getenv("AGGREGATE_MAX_WORKERS", "4"))
+
+_ENCODER = None
+_ENCODER_LOADED = False
+_ENCODER_LOCK = threading.Lock()
+
+
+def _get_encoder():
+    """Loads the tiktoken encoding once. Returns None if tiktoken or its encoding file is unavailable (e.g. offline)."""
+    global _ENCODER, _ENCODER_LOADED
+    if not _ENCODER_LOADED:
+        with _ENCODER_LOCK:
+            if not _ENCODER_LOADED:
+                try:
+                    import tiktoken
+                    _ENCODER = tiktoken.get_encoding(TOKEN_ENCODING)
+                except Exception as e:
+                    print(f"WARNING: Could not load the '{TOKEN_ENCODING}' tokenizer, estimating tokens from length instead: {e}")
+                _ENCODER_LOADED = True
+    return _ENCODER
+
+def count_tokens(text: str) -> int:
+    """Counts the tokens in text, or estimates them at four characters per token without tiktoken."""
+    encoder = _get_encoder()
+    if encoder is None:
+        return (len(text) + 3) // 4
+    return len(encoder.encode(text, disallowed_special=()))
+
+def get_token_budget(tool_name: str) -> int:
+    """Returns the ticket text budget for a tool: <TOOL_NAME>_TOKEN_BUDGET if set, else SUMMARY_TOKEN_BUDGET."""
+    return int(os.getenv(f"{tool_name.upper()}_TOKEN_BUDGET", str(SUMMARY_TOKEN_BUDGET)))
+
+
+_WIKI_MARKUP = [
+    (re.compile(r'\{(?:code|noformat|quote|panel|color)(?::[^}]*)?\}'), ''),
+    (re.compile(r'^h[1-6]\.\s*', re.MULTILINE), ''),
+    (re.compile(r'\[([^|\]\n]+)\|[^\]\n]+\]'), r'\1'),
+    (re.compile(r'![^!\s][^!\n]*!'), ''),
+    (re.compile(r'\{\{([^}]*)\}\}'), r'\1'),
+    (re.compile(r'^\s*-{4,}\s*$', re.MULTILINE), ''),
+    (re.compile(r'\|\|'), '|'),
+]
+
+def _log_signature(line: str) -> str:
+    """Normalizes a line so log lines differing only in timestamps, counters or addresses compare equal."""
+    return re.sub(r'0x[0-9a-fA-F]+|\d+', '#', line.strip())
+
+def clean_ticket_text(text: str) -> str:
+    """Strips Jira wiki markup, collapses runs of repeated log lines and squeezes blank lines."""
+    for pattern, replacement in _WIKI_MARKUP:
+        text = pattern.sub(replacement, text)
+    lines = []
+    previous_signature, repeats = None, 0
+    for line in text.splitlines():
+        signature = _log_signature(line)
+        if signature and signature == previous_signature:
+            repeats += 1
+            continue
+        if repeats:
+            lines.append(f"[... previous line repeated {repeats} more times]")
+        lines.append(line.rstrip())
+        previous_signature, repeats = signature, 0
+    if repeats:
+        lines.append(f"[... previous line repeated {repeats} more times]")
+    return re.sub(r'\n{3,}', '\n\n', "\n".join(lines)).strip()
+
+def split_into_chunks(text: str, max_tokens: int) -> List[str]:
+    """Splits text into pieces of at most about max_tokens, preferring line boundaries."""
+    chunks, current, current_tokens = [], [], 0
+    for line in text.splitlines():
+        line_tokens = count_tokens(line) + 1
+        if line_tokens > max_tokens:
+            # A single huge line (a pasted dump) is cut by characters, roughly at the token limit.
+            step = max(1, len(line) * max_tokens // line_tokens)
+            pieces = [line[i:i + step] for i in range(0, len(line), step)]
+        else:
+            pieces = [line]
+        for piece in pieces:
+            piece_tokens = count_tokens(piece) + 1
+            if current and current_tokens + piece_tokens > max_tokens:
+                chunks.append("\n".join(current))
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += piece_tokens
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def _summarize_chunk(chunk: str, position: int, total: int, question: str) -> str:
+    prompt = f"""
+    You are reading part {position} of {total} of a long engineering JIRA ticket.
+    Extract the facts from this part that matter for answering: "{question}".
+    Keep symptoms, error signatures, analysis and debug findings, root cause statements, blockers, owners and dates.
+    Quote error messages and register values verbatim. Drop anything else. Answer with concise bullet points.
+
+    **Ticket Part {position}/{total}:**
+    ---
+    {chunk}
+    ---
+    """
+    return get_llm(temperature=0.0).invoke(prompt).content
+
+def compact_ticket_text(details_text: str, token_budget: int, question: str = "Provide a full 4-point summary.", summarize_chunk: Optional[Callable[[str, int, int, str], str]] = None) -> str:
+    """
+    Fits the text rendered by get_ticket_details into token_budget for a summary prompt.
+    Markup and repeated log lines are always stripped. If the text is still over budget, the part after
+    the metadata header is split into chunks, each chunk is reduced to notes concurrently (map), and the
+    notes replace the original text (reduce), repeating until they fit.
+    """
+    summarize_chunk = summarize_chunk or _summarize_chunk
+    text = clean_ticket_text(details_text)
+    if count_tokens(text) <= token_budget:
+        return text
+    # Imported here: langchain_core is slow to import and this path only runs for oversized tickets.
+    from langchain_core.runnables.config import ContextThreadPoolExecutor
+
+    # Project, Program, Title, Status, ... stay verbatim; only the description and comments are condensed.
+    header, separator, body = text.partition("\n-- Description --")
+    body = separator.lstrip("\n") + body if separator else header
+    header = header if separator else ""
+    for round_number in range(1, SUMMARY_MAX_REDUCE_ROUNDS + 1):
+        chunks = split_into_chunks(body, SUMMARY_CHUNK_TOKENS)
+        print(f"--- Ticket text is over its {token_budget} token budget. Condensing {len(chunks)} chunks (round {round_number})... ---")
+        # Workers run in copies of this context, so LangChain callbacks (e.g. --stream) and the LLM priority carry over.
+        with ContextThreadPoolExecutor(max_workers=max(1, min(SUMMARY_CHUNK_WORKERS, len(chunks)))) as executor:
+            notes = list(executor.map(lambda item: summarize_chunk(item[1], item[0], len(chunks), question), list(enumerate(chunks, start=1))))
+        body = "\n\n".join(f"-- Notes from part {position} of {len(notes)} --\n{note.strip()}" for position, note in enumerate(notes, start=1))
+        compacted = f"{header}\n\n{body}".strip()
+        if count_tokens(compacted) <= token_budget or len(chunks) == 1:
+            return compacted
+    return compacted
+
+
+def batch_by_tokens(texts: List[str], max_tokens: int) -> List[List[str]]:
+    """
+    Groups texts in order into batches of at most max_tokens. Every batch holds at least two texts
+    (when available) so each reduce round at least halves the number of texts.
+    """
+    batches, current, current_tokens = [], [], 0
+    for text in texts:
+        tokens = count_tokens(text)
+        if len(current) >= 2 and current_tokens + tokens > max_tokens:
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(text)
+        current_tokens += tokens
+    if current:
+        if len(current) == 1 and batches:
+            batches[-1].append(current[0])
+        else:
+            batches.append(current)
+    return batches
+
+def _reduce_batch(texts: List[str], level: int) -> str:
+    joined = "\n\n---\n\n".join(texts)
+    source = "JIRA ticket summaries" if level == 1 else "partial analyses, each covering a group of JIRA tickets"
+    prompt = f"""
+    You are an expert engineering program manager. Condense the following {len(texts)} {source} into one partial analysis.
+    Keep the ticket keys when you mention a ticket, and keep counts of how many tickets share each point.
+
+    Structure your response with these headings:
+    - **Common Themes:**
+    - **Potential Shared Root Causes:**
+    - **Blockers or Dependencies:**
+
+    ---
+    {joined}
+    ---
+    """
+    return get_llm(temperature=0.0).invoke(prompt).content
+
+def reduce_summaries(summaries: List[str], token_budget: int = AGGREGATE_BATCH_TOKENS, reduce_batch: Optional[Callable[[List[str], int], str]] = None) -> List[str]:
+    """
+    Shrinks summaries until together they fit token_budget, so a final aggregate prompt stays bounded.
+    Summaries are grouped into token-bounded batches, each batch is reduced to themes, root causes and
+    blockers (batches run concurrently), and the batch results are reduced again level by level.
+    Returns the summaries unchanged when they already fit.
+    """
+    reduce_batch = reduce_batch or _reduce_batch
+    texts = list(summaries)
+    level = 1
+    while len(texts) > 1 and sum(count_tokens(text) for text in texts) > token_budget:
+        batches = batch_by_tokens(texts, token_budget)
+        print(f"--- Reducing {len(texts)} summaries in {len(batches)} batches (level {level})... ---")
+        from langchain_core.runnables.config import ContextThreadPoolExecutor
+        with ContextThreadPoolExecutor(max_workers=max(1, min(AGGREGATE_MAX_WORKERS, len(batches)))) as executor:
+            texts = list(executor.map(lambda batch: reduce_batch(batch, level), batches))
+        level += 1
+    return texts
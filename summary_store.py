@@ -0,0 +1,136 @@
+import hashlib
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from local_store import open_database
+from params_cache import normalize_query
+
+load_dotenv()
+
+SUMMARY_STORE_ENABLED = os.getenv("SUMMARY_STORE_ENABLED", "true").lower() == "true"
+SUMMARY_STORE_MAX_ENTRIES = int(os.getenv("SUMMARY_STORE_MAX_ENTRIES", "5000"))
+
+
+def ticket_state(issue, details_text: str) -> Dict[str, Any]:
+    """
+    Describes what a summary was generated from: the issue's 'updated' timestamp, a hash of every
+    rendered field except the comments (and the 'Updated' date), and the comment count and newest comment.
+    """
+    fields_text = details_text.split("\n-- Comments", 1)[0]
+    fields_text = "\n".join(line for line in fields_text.splitlines() if not line.startswith("Updated: "))
+    comment_field = getattr(issue.fields, 'comment', None)
+    comments = list(getattr(comment_field, 'comments', None) or [])
+    return {
+        "updated": getattr(issue.fields, 'updated', None) or "",
+        "content_hash": hashlib.sha256(fields_text.encode("utf-8")).hexdigest(),
+        "comment_total": getattr(comment_field, 'total', None) or len(comments),
+        "last_comment_created": max((comment.created for comment in comments), default=""),
+    }
+
+def plan_refresh(stored: Optional[Dict[str, Any]], state: Dict[str, Any], comments: List[Any]) -> Tuple[str, List[Any]]:
+    """
+    Decides how to bring a stored summary up to date:
+    ("reuse", []) when the ticket is unchanged, ("incremental", new_comments) when the only change is
+    new comments that were all fetched, and ("full", []) for anything else.
+    """
+    if stored is None:
+        return ("full", [])
+    if not state["updated"]:
+        # Without 'updated' an unchanged timestamp proves nothing, so the content and comments are compared instead.
+        unchanged = all(stored[field] == state[field] for field in ("content_hash", "comment_total", "last_comment_created"))
+        return ("reuse", []) if unchanged else ("full", [])
+    if stored["updated"] == state["updated"]:
+        return ("reuse", [])
+    if stored["content_hash"] != state["content_hash"]:
+        return ("full", [])
+    new_comment_count = state["comment_total"] - stored["comment_total"]
+    new_comments = [comment for comment in comments if comment.created > stored["last_comment_created"]]
+    if new_comment_count <= 0 or len(new_comments) != new_comment_count:
+        # Comments were edited or deleted, or more arrived than the fetched tail holds.
+        return ("full", [])
+    return ("incremental", new_comments)
+
+
+class SummaryStore:
+    """
+    A persistent (issue key, question) -> summary store in SQLite, remembering the ticket state
+    each summary was generated from so it can be reused or updated instead of regenerated.
+    """
+
+    def __init__(self, filename: str = "summary_store.sqlite3", max_entries: int = SUMMARY_STORE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.reused = 0
+        self.incremental = 0
+        self.full = 0
+        self._lock = threading.Lock()
+        self._db = open_database(filename)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS summaries (
+                issue_key TEXT NOT NULL,
+                question TEXT NOT NULL,
+                updated TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                comment_total INTEGER NOT NULL,
+                last_comment_created TEXT NOT NULL,
+                summary TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                PRIMARY KEY (issue_key, question)
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_summaries_stored_at ON summaries (stored_at)")
+        self._db.commit()
+
+    def get(self, issue_key: str, question: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT updated, content_hash, comment_total, last_comment_created, summary FROM summaries WHERE issue_key = ? AND question = ?",
+                (issue_key, normalize_query(question))
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("updated", "content_hash", "comment_total", "last_comment_created", "summary"), row))
+
+    def put(self, issue_key: str, question: str, state: Dict[str, Any], summary: str) -> None:
+        """Stores the summary with the ticket state it reflects, then drops the oldest entries beyond max_entries."""
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (issue_key, normalize_query(question), state["updated"], state["content_hash"], state["comment_total"], state["last_comment_created"], summary, time.time())
+            )
+            self._db.execute(
+                "DELETE FROM summaries WHERE rowid IN (SELECT rowid FROM summaries ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self._db.commit()
+
+    def record(self, action: str) -> None:
+        with self._lock:
+            setattr(self, action, getattr(self, action) + 1)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+        return {"reused": self.reused, "incremental": self.incremental, "full": self.full, "entries": entries}
+
+
+_SUMMARY_STORE = None
+_SUMMARY_STORE_LOCK = threading.Lock()
+
+def get_summary_store() -> Optional[SummaryStore]:
+    """Returns the process-wide summary store, or None when SUMMARY_STORE_ENABLED is false or the store cannot be opened."""
+    global _SUMMARY_STORE
+    if not SUMMARY_STORE_ENABLED:
+        return None
+    if _SUMMARY_STORE is None:
+        with _SUMMARY_STORE_LOCK:
+            if _SUMMARY_STORE is None:
+                try:
+                    _SUMMARY_STORE = SummaryStore()
+                except Exception as e:
+                    print(f"WARNING: Could not open the summary store, continuing without it: {e}")
+                    return None
+    return _SUMMARY_STORE
@@ -2,13 +2,14 @@ import unittest
 import re
 from unittest.mock import patch, mock_open
 
-from jira_tools import create_ticket_tool, JIRA_CLIENT_INSTANCE
+from jira_tools import create_ticket_tool
+from jira_utils import get_jira_client
 
 class TestLiveTicketCreation(unittest.TestCase):
 
     @patch('builtins.open', new_callable=mock_open, read_data="---DESCRIPTION---\nThis is a live integration test.\n\n---STEPS-TO-REPRODUCE---\n1. Run test\n2. Observe ticket creation\n3. Observe ticket deletion")
     @patch('builtins.input', side_effect=['', 'yes'])
-    @patch('jira_tools.get_summary_similarity_score', return_value=2)
+    @patch('jira_tools.get_summary_similarity_scores', side_effect=lambda source, candidates: [2] * len(candidates))
     @patch('jira_tools.search_jira_issues', return_value=[])
     def test_live_ticket_creation_and_deletion(self, mock_search, mock_similarity, mock_input, mock_file):
         """
@@ -44,10 +45,10 @@ class TestLiveTicketCreation(unittest.TestCase):
             print(f"--- [Integration Test] Successfully created ticket {new_ticket_key}. ---")
 
         finally:
-            if new_ticket_key and JIRA_CLIENT_INSTANCE:
+            if new_ticket_key:
                 print(f"--- [Integration Test] Cleaning up: Deleting ticket {new_ticket_key}... ---")
                 try:
-                    issue_to_delete = JIRA_CLIENT_INSTANCE.issue(new_ticket_key)
+                    issue_to_delete = get_jira_client().issue(new_ticket_key)
                     issue_to_delete.delete()
                     print(f"--- [Integration Test] Successfully deleted ticket {new_ticket_key}. ---")
                 except Exception as e:
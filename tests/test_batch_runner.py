@@ -0,0 +1,82 @@
+import csv
+import io
+import json
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from batch_runner import BatchRunner, RecordWriter, print_latency_summary, read_jobs
+
+
+class TestBatchRunner(unittest.TestCase):
+
+    def test_jobs_are_read_from_jsonl(self):
+        jobs = read_jobs([
+            '{"id": "stale", "query": "stale tickets in STX"}\n',
+            '\n',
+            '{"tool": "summarize_ticket_tool", "input": {"issue_key": "PLAT-1"}}\n',
+            'not json\n',
+        ])
+
+        self.assertEqual([job["id"] for job in jobs], ["stale", "3", "4"])
+        self.assertIn("not a valid job", jobs[2]["error"])
+
+    @patch('builtins.print')
+    def test_create_ticket_is_rejected(self, mock_print):
+        record = BatchRunner().run_job({"id": "1", "tool": "create_ticket_tool", "input": {}})
+
+        self.assertFalse(record["ok"])
+        self.assertIn("interactive confirmation", record["error"])
+
+    @patch('batch_runner.run_route')
+    def test_jobs_run_concurrently_and_stream_as_they_finish(self, mock_run_route):
+        def slow_route(route):
+            time.sleep(0.2)
+            return {"output": f"Summary of {route[1]['issue_key']}", "intermediate_steps": []}
+        mock_run_route.side_effect = slow_route
+        jobs = read_jobs(json.dumps({"query": f"summarize PLAT-{i}"}) for i in range(1, 5))
+        written = []
+
+        started = time.perf_counter()
+        records = BatchRunner().run(jobs, written.append, max_workers=4)
+
+        self.assertLess(time.perf_counter() - started, 0.6)
+        self.assertEqual(len(written), 4)
+        self.assertTrue(all(record["ok"] and record["route"] == "summarize_ticket_tool" for record in records))
+        self.assertEqual(sorted(record["output"] for record in records), [f"Summary of PLAT-{i}" for i in range(1, 5)])
+
+    @patch('builtins.print')
+    def test_agent_handles_queries_the_router_does_not(self, mock_print):
+        runner = BatchRunner()
+        agent = MagicMock()
+        agent.invoke.return_value = {"output": "PLAT-1 is blocked on firmware.", "intermediate_steps": []}
+        runner._agent = agent
+
+        record = runner.run_job({"id": "1", "query": "why is PLAT-1 blocked?"})
+
+        self.assertEqual(record["route"], "agent")
+        self.assertEqual(record["output"], "PLAT-1 is blocked on firmware.")
+        agent.invoke.assert_called_once_with({"input": "why is PLAT-1 blocked?", "chat_history": []})
+
+    def test_csv_output_and_latency_summary(self):
+        records = [
+            {"id": "1", "query": "q", "tool": None, "route": "agent", "ok": True, "latency_seconds": 1.5, "output": [{"key": "PLAT-1"}], "error": None},
+            {"id": "2", "query": "q2", "tool": None, "route": "agent", "ok": False, "latency_seconds": 0.5, "output": None, "error": "boom"},
+        ]
+        stream = io.StringIO()
+        writer = RecordWriter(stream, "csv")
+        for record in records:
+            writer(record)
+
+        rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+        self.assertEqual(json.loads(rows[0]["output"]), [{"key": "PLAT-1"}])
+        self.assertEqual(rows[1]["error"], "boom")
+
+        summary = io.StringIO()
+        print_latency_summary(records, 1.6, summary)
+        self.assertIn("Jobs: 2 (1 failed)", summary.getvalue())
+        self.assertIn("max: 1.50s", summary.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
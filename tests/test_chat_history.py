@@ -0,0 +1,76 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from langchain_core.agents import AgentAction
+
+from chat_history import ChatHistoryManager, compact_answer
+
+
+def _search_result(count):
+    issues = [{"key": f"PLAT-{i}", "summary": f"Resume hang number {i}", "status": "Open", "url": f"https://jira/browse/PLAT-{i}"} for i in range(1, count + 1)]
+    action = AgentAction(tool="jira_search_tool", tool_input={"original_query": "hangs"}, log="")
+    return {"output": f"I found {count} issues.", "intermediate_steps": [(action, issues)]}
+
+
+class TestChatHistory(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch('summarization._get_encoder', return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_short_answers_are_kept_verbatim(self):
+        self.assertEqual(compact_answer({"output": "PLAT-1 is owned by the SMU team."}), "PLAT-1 is owned by the SMU team.")
+
+    def test_tool_lists_and_long_answers_become_references(self):
+        search = compact_answer(_search_result(20))
+        self.assertIn("PLAT-1: Resume hang number 1", search)
+        self.assertIn("(and 5 more)", search)
+        self.assertNotIn("https://", search)
+
+        long_answer = "\n\n".join(f"Summary for PLAT-{i}: https://jira/browse/PLAT-{i}\n\nThe board hangs on S3 resume after firmware update {i}. " + "Detail. " * 100 for i in range(1, 4))
+        reference = compact_answer({"output": long_answer, "intermediate_steps": []})
+        self.assertIn("- PLAT-2: The board hangs on S3 resume after firmware update 2.", reference)
+        self.assertLess(len(reference), len(long_answer) // 5)
+
+    def test_old_turns_fold_into_a_summary_and_the_prompt_stays_bounded(self):
+        summarize = MagicMock(side_effect=lambda summary, turns: (summary + " " + " ".join(user for user, _ in turns)).strip())
+        history = ChatHistoryManager(token_budget=600, recent_turns=3, summarize=summarize)
+
+        sizes = []
+        for turn in range(12):
+            history.add_turn(f"summarize PLAT-{turn}", {"output": f"PLAT-{turn} hangs on resume. " * 20})
+            sizes.append(history.prompt_tokens())
+
+        self.assertLessEqual(len(history.turns), 3)
+        self.assertEqual(history.turns[-1][0], "summarize PLAT-11")
+        self.assertIn("summarize PLAT-0", history.summary)
+        self.assertLessEqual(max(sizes), 600)
+        messages = history.messages()
+        self.assertTrue(messages[0].content.startswith("Summary of the earlier conversation"))
+        self.assertEqual(len(messages), 1 + 2 * len(history.turns))
+
+    def test_turns_are_folded_in_batches(self):
+        summarize = MagicMock(side_effect=lambda summary, turns: (summary + " " + " ".join(user for user, _ in turns)).strip())
+        history = ChatHistoryManager(token_budget=10000, recent_turns=4, summarize=summarize)
+
+        for turn in range(10):
+            history.add_turn(f"what blocks PLAT-{turn}?", {"output": "Firmware."})
+
+        self.assertEqual(summarize.call_count, 2)
+        self.assertEqual([len(call.args[1]) for call in summarize.call_args_list], [3, 3])
+        self.assertEqual(len(history.turns), 4)
+        self.assertIn("what blocks PLAT-5?", history.summary)
+
+    @patch('builtins.print')
+    def test_failed_summary_falls_back_to_a_digest(self, mock_print):
+        history = ChatHistoryManager(recent_turns=1, summarize=MagicMock(side_effect=RuntimeError("throttled")))
+
+        history.add_turn("find duplicates of PLAT-9", {"output": "PLAT-12 looks like a duplicate of PLAT-9."})
+        history.add_turn("thanks", {"output": "You're welcome."})
+
+        self.assertIn("find duplicates of PLAT-9", history.summary)
+
+
+if __name__ == '__main__':
+    unittest.main()
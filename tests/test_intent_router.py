@@ -0,0 +1,51 @@
+import unittest
+from unittest.mock import patch
+
+from intent_router import route_query, run_route
+
+
+class TestIntentRouter(unittest.TestCase):
+
+    def test_unambiguous_requests_are_routed_to_their_tool(self):
+        cases = {
+            "summarize PLAT-1234": ("summarize_ticket_tool", {"issue_key": "PLAT-1234"}),
+            "Can you give me a summary of plat-7?": ("summarize_ticket_tool", {"issue_key": "PLAT-7"}),
+            "Summarize PLAT-1, PLAT-2 and PLAT-3": ("summarize_multiple_tickets_tool", {"issue_keys": ["PLAT-1", "PLAT-2", "PLAT-3"]}),
+            "find duplicates of PLAT-99": ("find_duplicate_tickets_tool", {"issue_key": "PLAT-99"}),
+            "find tickets similar to PLAT-5": ("find_similar_tickets_tool", {"issue_key": "PLAT-5"}),
+            "what are the options for severity": ("get_field_options_tool", {"field_name": "severity"}),
+            "show me the system options for program STX": ("get_field_options_tool", {"field_name": "system", "depends_on": "STX"}),
+            "P1 bugs in PLAT": ("jira_search_tool", {"original_query": "P1 bugs in PLAT"}),
+        }
+        for query, route in cases.items():
+            with self.subTest(query=query):
+                self.assertEqual(route_query(query), route)
+
+    def test_ambiguous_requests_fall_through_to_the_agent(self):
+        for query in (
+            "summarize PLAT-1 and find duplicates",
+            "why is PLAT-1 blocked?",
+            "summarize it",
+            "find duplicates of PLAT-1 and PLAT-2",
+            "system options",
+            "create a ticket for STX",
+            "tickets about resume hangs",
+            "STXH bugs for me",
+        ):
+            with self.subTest(query=query):
+                self.assertIsNone(route_query(query))
+
+    @patch('builtins.print')
+    @patch('jira_tools._get_single_ticket_summary', return_value="Summary for PLAT-1: https://jira/PLAT-1")
+    def test_routed_result_looks_like_an_agent_result(self, mock_summary, mock_print):
+        result = run_route(("summarize_ticket_tool", {"issue_key": "PLAT-1"}))
+
+        self.assertEqual(result["output"], "Summary for PLAT-1: https://jira/PLAT-1")
+        action, output = result["intermediate_steps"][0]
+        self.assertEqual(action.tool, "summarize_ticket_tool")
+        self.assertEqual(output, result["output"])
+        mock_summary.assert_called_once_with("PLAT-1", "Provide a full 4-point summary.")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import json
+import unittest
+from unittest.mock import patch
+
+from langchain.agents.output_parsers.tools import ToolAgentAction
+from langchain_core.messages import AIMessage
+
+from jira_agent import encode_tool_observation, format_compact_tool_messages
+from summarization import count_tokens
+
+
+def _search_results(count):
+    return [{
+        "key": f"PLAT-{i}", "summary": f"System hangs on S3 resume with BIOS {i}", "status": "Open",
+        "assignee": "Unassigned", "priority": "P2", "url": f"https://jira.example.com/browse/PLAT-{i}",
+        "created": "2024-01-01", "updated": "2024-02-01"
+    } for i in range(1, count + 1)]
+
+
+@patch('jira_utils.JIRA_SERVER_URL', "https://jira.example.com")
+class TestCompactScratchpad(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch('summarization._get_encoder', return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_ticket_lists_become_a_table_without_derivable_urls(self):
+        encoded = encode_tool_observation(_search_results(2))
+
+        lines = encoded.splitlines()
+        self.assertEqual(lines[0], "Tickets: 2. URL of each: https://jira.example.com/browse/<key>")
+        self.assertEqual(lines[1], "key|summary|status|assignee|priority|created|updated")
+        self.assertEqual(lines[2], "PLAT-1|System hangs on S3 resume with BIOS 1|Open|Unassigned|P2|2024-01-01|2024-02-01")
+
+    def test_search_turn_scratchpad_is_much_smaller(self):
+        results = _search_results(20)
+
+        self.assertLess(count_tokens(encode_tool_observation(results)), count_tokens(json.dumps(results)) / 2)
+
+    def test_messages_and_other_results_are_passed_through(self):
+        self.assertEqual(encode_tool_observation(["No similar issues found for PLAT-1."]), "No similar issues found for PLAT-1.")
+        self.assertEqual(encode_tool_observation("Summary for PLAT-1"), "Summary for PLAT-1")
+        self.assertEqual(encode_tool_observation({"a": 1}), '{"a": 1}')
+
+    def test_formatter_pairs_each_tool_call_with_its_compact_result(self):
+        call_message = AIMessage(content="", tool_calls=[{"name": "jira_search_tool", "args": {"original_query": "hangs"}, "id": "call-1"}])
+        action = ToolAgentAction(tool="jira_search_tool", tool_input={"original_query": "hangs"}, log="", message_log=[call_message], tool_call_id="call-1")
+
+        messages = format_compact_tool_messages([(action, _search_results(3))])
+
+        self.assertEqual(messages[0], call_message)
+        self.assertEqual(messages[1].tool_call_id, "call-1")
+        self.assertTrue(messages[1].content.startswith("Tickets: 3."))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+import asyncio
+import json
+import unittest
+from unittest.mock import patch
+
+import httpx
+
+import jira_async
+from jira_async import AsyncJiraClient, async_search_jira_issues, async_get_ticket_details, async_get_multiple_ticket_issues, run_async
+from jira_utils import JiraBotError
+
+
+def _raw_issue(key):
+    return {
+        "key": key,
+        "fields": {
+            "summary": f"Summary of {key}",
+            "status": {"name": "Open"},
+            "assignee": {"displayName": "Heath, Ian"},
+            "priority": {"name": "P2 (Must Solve)"},
+            "created": "2024-01-02T10:00:00.000+0000",
+            "updated": "2024-01-03T10:00:00.000+0000",
+        }
+    }
+
+
+def _search_handler(total, requests_seen):
+    """Serves /search pages over `total` issues and records every startAt requested."""
+    def handler(request):
+        start_at = int(request.url.params["startAt"])
+        max_results = int(request.url.params["maxResults"])
+        requests_seen.append(start_at)
+        issues = [_raw_issue(f"PLAT-{i}") for i in range(start_at + 1, min(total, start_at + max_results) + 1)]
+        return httpx.Response(200, json={"startAt": start_at, "total": total, "issues": issues})
+    return handler
+
+
+async def _with_client(handler, work):
+    client = AsyncJiraClient(server="https://jira.example.com", auth=("user", "secret"), max_concurrency=2, transport=httpx.MockTransport(handler))
+    try:
+        return await work(client)
+    finally:
+        await client.aclose()
+
+
+class TestAsyncJira(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch.multiple(jira_async, JIRA_HTTP_BACKOFF_FACTOR=0, JIRA_HTTP_BACKOFF_JITTER=0, get_ticket_cache=lambda: None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_search_fetches_all_pages_in_order(self):
+        seen = []
+        results = run_async(_with_client(
+            _search_handler(7, seen),
+            lambda client: async_search_jira_issues("project = PLAT", client, limit=None, page_size=3)
+        ))
+
+        self.assertEqual([issue["key"] for issue in results], [f"PLAT-{i}" for i in range(1, 8)])
+        self.assertEqual(sorted(seen), [0, 3, 6])
+        self.assertEqual(results[0]["assignee"], "Heath, Ian")
+
+    def test_search_stops_at_limit(self):
+        seen = []
+        results = run_async(_with_client(
+            _search_handler(100, seen),
+            lambda client: async_search_jira_issues("project = PLAT", client, limit=5, page_size=3)
+        ))
+
+        self.assertEqual(len(results), 5)
+        self.assertEqual(sorted(seen), [0, 3])
+
+    def test_ticket_details_retry_then_format(self):
+        calls = []
+        def handler(request):
+            calls.append(request.url.path)
+            if request.url.path.endswith("/comment"):
+                comment = {"author": {"displayName": "Dev"}, "created": "2024-01-04T00:00:00.000+0000", "body": "Looking."}
+                return httpx.Response(200, json={"startAt": 0, "total": 1, "comments": [comment]})
+            if calls.count(request.url.path) == 1:
+                return httpx.Response(503, headers={"Retry-After": "0"})
+            raw = _raw_issue("PLAT-9")
+            raw["fields"].update({"project": {"key": "PLAT"}, "resolution": None, "description": "It hangs."})
+            return httpx.Response(200, content=json.dumps(raw))
+
+        details_text, url = run_async(_with_client(handler, lambda client: async_get_ticket_details("PLAT-9", client)))
+
+        self.assertEqual(calls.count("/rest/api/2/issue/PLAT-9"), 2)
+        self.assertEqual(calls.count("/rest/api/2/issue/PLAT-9/comment"), 1)
+        self.assertTrue(url.endswith("/browse/PLAT-9"))
+        self.assertIn("Comment by Dev on 2024-01-04", details_text)
+
+    def test_missing_ticket_raises_not_found(self):
+        handler = lambda request: httpx.Response(404, json={"errorMessages": ["Issue does not exist"]})
+        with self.assertRaises(JiraBotError) as context:
+            run_async(_with_client(handler, lambda client: async_get_ticket_details("PLAT-404", client)))
+        self.assertIn("not found", str(context.exception))
+
+    def test_bulk_fetch_runs_its_requests_concurrently(self):
+        paths, in_flight, most_in_flight = [], [0], [0]
+
+        def detailed(key, total_comments):
+            raw = _raw_issue(key)
+            comments = [{"author": {"displayName": "Dev"}, "created": f"2024-01-{n:02d}T00:00:00.000+0000", "body": f"Note {n}."} for n in range(1, min(total_comments, 20) + 1)]
+            raw["fields"].update({"project": {"key": "PLAT"}, "resolution": None, "description": "It hangs.", "comment": {"total": total_comments, "comments": comments}})
+            return raw
+
+        async def handler(request):
+            paths.append(request.url.path)
+            in_flight[0] += 1
+            most_in_flight[0] = max(most_in_flight[0], in_flight[0])
+            await asyncio.sleep(0.02)
+            in_flight[0] -= 1
+            if request.url.path.endswith("/search"):
+                keys = request.url.params["jql"][len("key in ("):-1].split(", ")
+                self.assertEqual(request.url.params["validateQuery"], "false")
+                return httpx.Response(200, json={"total": 2, "issues": [detailed(key, 300 if key == "PLAT-2" else 3) for key in keys if key != "PLAT-4"]})
+            if request.url.path.endswith("/comment"):
+                comments = [{"author": {"displayName": "Dev"}, "created": f"2024-02-0{day}T00:00:00.000+0000", "body": f"Day {day}."} for day in (2, 1)]
+                return httpx.Response(200, json={"total": 300, "comments": comments})
+            return httpx.Response(404, json={"errorMessages": ["Issue does not exist"]})
+
+        results = run_async(_with_client(handler, lambda client: async_get_multiple_ticket_issues(["PLAT-1", "PLAT-2", "PLAT-3", "PLAT-4"], client, chunk_size=2)))
+
+        self.assertEqual(paths.count("/rest/api/2/search"), 2)
+        self.assertEqual(paths.count("/rest/api/2/issue/PLAT-2/comment"), 1)
+        # PLAT-4 was not returned by its search, so it is fetched directly, comments included.
+        self.assertEqual(len(paths), 5)
+        self.assertEqual(most_in_flight[0], 2)
+        self.assertEqual(len(results["PLAT-1"].fields.comment.comments), 3)
+        self.assertEqual(results["PLAT-2"].fields.comment.comments[-1].body, "Day 2.")
+        self.assertIn("not found", str(results["PLAT-4"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+from unittest.mock import patch, MagicMock
+
+from jira_mirror import JiraMirror, translate_jql
+
+
+def _raw_issue(key, summary, status="Open", updated="2024-01-03T10:00:00.000+0000", comments=()):
+    return {
+        "key": key,
+        "fields": {
+            "summary": summary,
+            "description": f"Description of {key}",
+            "project": {"key": "PLAT"},
+            "customfield_13002": ["Strix Halo [PRG-000391]"],
+            "status": {"name": status},
+            "priority": {"name": "P2 (Must Solve)"},
+            "assignee": {"name": "iheath", "displayName": "Heath, Ian"},
+            "reporter": None,
+            "resolution": None,
+            "created": "2024-01-01T10:00:00.000+0000",
+            "updated": updated,
+            "comment": {"comments": [
+                {"id": str(i), "author": {"displayName": "Dev"}, "created": f"2024-01-0{i + 1}T10:00:00.000+0000", "body": body}
+                for i, body in enumerate(comments)
+            ]},
+        },
+    }
+
+
+def _client_returning(raw_issues):
+    client = MagicMock()
+    issues = [MagicMock(raw=raw) for raw in raw_issues]
+    client.search_issues.return_value = issues
+    return client
+
+
+class TestTranslateJql(unittest.TestCase):
+
+    def test_build_jql_output_is_translated(self):
+        where_sql, params, order_sql, projects = translate_jql(
+            "project = 'PLAT' AND program = 'Strix Halo [PRG-000391]' AND status in (\"Open\", \"Blocked\") AND updated < '-30d' ORDER BY updated ASC"
+        )
+
+        self.assertEqual(projects, ["PLAT"])
+        self.assertEqual(order_sql, "updated_utc ASC")
+        self.assertIn("status IN (?, ?)", where_sql)
+        self.assertEqual(params[:4], ["PLAT", "Strix Halo [PRG-000391]", "Open", "Blocked"])
+
+    def test_unsupported_or_unscoped_jql_goes_live(self):
+        self.assertIsNone(translate_jql("project = 'PLAT' AND labels = 'bringup'"))
+        self.assertIsNone(translate_jql("program = 'Strix Halo [PRG-000391]' ORDER BY created DESC"))
+
+
+class TestJiraMirror(unittest.TestCase):
+
+    def setUp(self):
+        self.mirror = JiraMirror(":memory:", max_age_seconds=60)
+        client = _client_returning([
+            _raw_issue("PLAT-1", "USB4 dock hang on S3 resume", comments=["first", "second"]),
+            _raw_issue("PLAT-2", "Display flicker", status="Closed", updated="2024-01-05T10:00:00.000+0000"),
+        ])
+        self.mirror.sync_project(client, "PLAT")
+
+    def test_search_and_details_are_served_locally(self):
+        results = self.mirror.search('project = "PLAT" AND "Program" = "Strix Halo [PRG-000391]" AND key != "PLAT-2"', limit=25)
+
+        self.assertEqual([issue["key"] for issue in results], ["PLAT-1"])
+        self.assertEqual(results[0]["assignee"], "Heath, Ian")
+        issue = self.mirror.get_issue("plat-1")
+        self.assertEqual([comment.body for comment in issue.fields.comment.comments], ["first", "second"])
+
+    def test_incremental_sync_uses_watermark(self):
+        client = _client_returning([])
+        self.mirror.sync_project(client, "PLAT")
+
+        jql = client.search_issues.call_args.args[0]
+        self.assertIn('updated >= "2024/01/04 10:00"', jql) # Watermark minus the one-day overlap
+        self.assertEqual(self.mirror.stats()["projects"]["PLAT"]["watermark"], "2024-01-05T10:00:00")
+
+    def test_stale_mirror_is_not_used(self):
+        with patch('jira_mirror.time.time', return_value=10 ** 12):
+            self.assertIsNone(self.mirror.search("project = 'PLAT' ORDER BY created DESC", limit=5))
+            self.assertIsNone(self.mirror.get_issue("PLAT-1"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,18 +1,18 @@
 import unittest
-from unittest.mock import patch, MagicMock, mock_open
+from unittest.mock import patch, AsyncMock, MagicMock, mock_open
 
 # It's important that we can import from the parent directory
 # Make sure you run this test from the root of your project, e.g., using 'python -m unittest discover'
-from jira_tools import create_ticket_tool, JiraBotError
+from jira_tools import create_ticket_tool, summarize_multiple_tickets_tool, JiraBotError
 
 class TestCreateTicketTool(unittest.TestCase):
 
     @patch('jira_tools.create_jira_issue')
     @patch('builtins.open', new_callable=mock_open, read_data="---DESCRIPTION---\nTest Description\n\n---STEPS-TO-REPRODUCE---\nTest Steps")
     @patch('builtins.input', side_effect=['', 'yes']) # First input for "Press Enter", second for "confirm creation"
-    @patch('jira_tools.get_summary_similarity_score', return_value=2) # Ensure no duplicates are found
+    @patch('jira_tools.get_summary_similarity_scores', side_effect=lambda source, candidates: [2] * len(candidates)) # Ensure no duplicates are found
     @patch('jira_tools.search_jira_issues', return_value=[]) # Ensure no candidates are found
-    @patch('jira_tools.JIRA_CLIENT_INSTANCE', new_callable=MagicMock)
+    @patch('jira_tools.get_jira_client')
     def test_create_ticket_happy_path(self, mock_jira_client, mock_search, mock_similarity, mock_input, mock_file, mock_create_issue):
         """
         Tests the successful creation of a ticket when all inputs are valid and no duplicates are found.
@@ -58,9 +58,9 @@ class TestCreateTicketTool(unittest.TestCase):
         self.assertIn("Successfully created ticket PLAT-99999", result)
 
     @patch('builtins.input', return_value='no') # User immediately says "no" to creating the ticket
-    @patch('jira_tools.get_summary_similarity_score', return_value=9) # High score means it's a duplicate
+    @patch('jira_tools.get_summary_similarity_scores', side_effect=lambda source, candidates: [9] * len(candidates)) # High score means it's a duplicate
     @patch('jira_tools.search_jira_issues', return_value=[{'key': 'PLAT-12345', 'status': 'Open', 'summary': 'A very similar summary', 'url': 'http://...'}])
-    @patch('jira_tools.JIRA_CLIENT_INSTANCE', new_callable=MagicMock)
+    @patch('jira_tools.get_jira_client')
     def test_create_ticket_duplicate_found_and_cancelled(self, mock_jira_client, mock_search, mock_similarity, mock_input):
         """
         Tests the workflow where a duplicate is found and the user chooses to cancel the creation.
@@ -84,5 +84,48 @@ class TestCreateTicketTool(unittest.TestCase):
         self.assertEqual(result, "Ticket creation cancelled by user after duplicate check.")
 
 
+class TestSummarizeMultipleTicketsTool(unittest.TestCase):
+
+    @patch('jira_tools.get_llm')
+    @patch('jira_tools._get_single_ticket_summary')
+    @patch('jira_tools.async_get_multiple_ticket_issues', new_callable=AsyncMock)
+    def test_concurrent_summaries_keep_order_and_isolate_failures(self, mock_bulk_fetch, mock_single_summary, mock_get_llm):
+        """
+        A failing ticket must not affect the others, and summaries must come back in request order.
+        """
+        mock_bulk_fetch.return_value = {
+            "PLAT-1": MagicMock(),
+            "PLAT-2": MagicMock(),
+            "PLAT-3": JiraBotError("Ticket 'PLAT-3' not found."),
+            "PLAT-4": MagicMock(),
+        }
+
+        def fake_summary(key, question, issue=None, token_budget=None):
+            if key == "PLAT-2":
+                raise RuntimeError("LLM timeout")
+            return f"Summary for {key}"
+        mock_single_summary.side_effect = fake_summary
+        mock_get_llm.return_value.invoke.return_value.content = "Aggregate analysis"
+
+        result = summarize_multiple_tickets_tool.invoke({"issue_keys": ["plat-1", "PLAT_2", "PLAT-3", "PLAT-4"]})
+
+        self.assertLess(result.index("Summary for PLAT-1"), result.index("Could not generate summary for PLAT-2"))
+        self.assertLess(result.index("Could not generate summary for PLAT-3"), result.index("Summary for PLAT-4"))
+        self.assertIn("Aggregate Summary of 2 Tickets", result)
+
+    @patch('jira_tools.get_llm')
+    @patch('jira_tools._get_single_ticket_summary')
+    @patch('jira_tools.async_get_multiple_ticket_issues', new_callable=AsyncMock)
+    def test_failed_bulk_fetch_is_reported_for_each_key(self, mock_bulk_fetch, mock_single_summary, mock_get_llm):
+        mock_bulk_fetch.side_effect = JiraBotError("Failed to connect to Jira.")
+
+        result = summarize_multiple_tickets_tool.invoke({"issue_keys": ["PLAT-1", "PLAT-2"]})
+
+        self.assertIn("Could not generate summary for PLAT-1: Failed to connect to Jira.", result)
+        self.assertIn("Could not generate summary for PLAT-2: Failed to connect to Jira.", result)
+        mock_single_summary.assert_not_called()
+        mock_get_llm.assert_not_called()
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,75 @@
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest.mock import patch
+
+import requests
+
+import jira_transport
+from jira_transport import JiraTransportAdapter, mount_jira_transport, retry_count
+
+
+class _FlakyHandler(BaseHTTPRequestHandler):
+    """Answers 429 with Retry-After for the first `failures` requests, then 200."""
+    failures = 0
+    calls = 0
+
+    def do_GET(self):
+        type(self).calls += 1
+        if type(self).calls <= type(self).failures:
+            self.send_response(429)
+            self.send_header("Retry-After", "0")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class TestJiraTransport(unittest.TestCase):
+
+    def setUp(self):
+        _FlakyHandler.calls = 0
+        self.server = HTTPServer(("127.0.0.1", 0), _FlakyHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/rest/api/2/search"
+        self.session = requests.Session()
+        self.backoff = patch.multiple(jira_transport, JIRA_HTTP_BACKOFF_FACTOR=0, JIRA_HTTP_BACKOFF_JITTER=0)
+        self.backoff.start()
+
+    def tearDown(self):
+        self.backoff.stop()
+        self.session.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_retries_throttled_requests_until_success(self):
+        _FlakyHandler.failures = 2
+        mount_jira_transport(self.session, max_retries=3)
+
+        response = self.session.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(_FlakyHandler.calls, 3)
+
+    def test_returns_last_response_with_retry_history_when_exhausted(self):
+        _FlakyHandler.failures = 10
+        mount_jira_transport(self.session, max_retries=2)
+
+        response = self.session.get(self.url)
+        error = requests.HTTPError(response=response)
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(_FlakyHandler.calls, 3)
+        self.assertEqual(retry_count(error), 2)
+
+    def test_search_gets_longer_read_timeout(self):
+        self.assertEqual(JiraTransportAdapter.timeout_for(self.url)[1], jira_transport.JIRA_SEARCH_READ_TIMEOUT)
+        self.assertEqual(JiraTransportAdapter.timeout_for("https://jira/rest/api/2/issue/ABC-1")[1], jira_transport.JIRA_ISSUE_READ_TIMEOUT)
+        self.assertEqual(retry_count(RuntimeError("boom")), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+import unittest
+from unittest.mock import MagicMock
+
+from jira_utils import iter_jira_issues, search_jira_issues, get_multiple_ticket_details, get_multiple_ticket_issues, _fetch_comment_tail, _format_ticket_details, JiraBotError
+
+
+def _make_issue(key):
+    """Builds a minimal stand-in for a Jira issue returned by search_issues."""
+    issue = MagicMock()
+    issue.key = key
+    issue.fields.summary = f"Summary of {key}"
+    issue.fields.status.name = "Open"
+    issue.fields.assignee.displayName = "Heath, Ian"
+    issue.fields.priority.name = "P2 (Must Solve)"
+    issue.fields.created = "2024-01-02T10:00:00.000+0000"
+    issue.fields.updated = "2024-01-03T10:00:00.000+0000"
+    return issue
+
+
+class _FakePage(list):
+    """A list carrying the 'total' attribute of jira's ResultList."""
+    def __init__(self, items, total):
+        super().__init__(items)
+        self.total = total
+
+
+class TestIterJiraIssues(unittest.TestCase):
+
+    def _client_with(self, total):
+        issues = [_make_issue(f"PLAT-{i}") for i in range(1, total + 1)]
+        client = MagicMock()
+        client.search_issues.side_effect = lambda jql, startAt, maxResults, fields: _FakePage(issues[startAt:startAt + maxResults], total)
+        return client
+
+    def test_pages_through_all_results(self):
+        client = self._client_with(total=7)
+
+        keys = [issue['key'] for issue in iter_jira_issues("project = PLAT", client, page_size=3)]
+
+        self.assertEqual(keys, [f"PLAT-{i}" for i in range(1, 8)])
+        # 3 + 3 + 1, and no extra request once the total is reached
+        self.assertEqual(client.search_issues.call_count, 3)
+        start_ats = [c.kwargs['startAt'] for c in client.search_issues.call_args_list]
+        self.assertEqual(start_ats, [0, 3, 6])
+
+    def test_respects_max_results_and_projects_fields(self):
+        client = self._client_with(total=100)
+
+        results = list(iter_jira_issues("project = PLAT", client, page_size=4, max_results=6))
+
+        self.assertEqual(len(results), 6)
+        last_call = client.search_issues.call_args_list[-1]
+        self.assertEqual(last_call.kwargs['maxResults'], 2) # Only the remainder is requested
+        self.assertNotIn('description', last_call.kwargs['fields'])
+        self.assertEqual(results[0]['url'].rsplit('/', 1)[-1], "PLAT-1")
+        self.assertEqual(results[0]['created'], "2024-01-02")
+
+    def test_search_wraps_errors(self):
+        client = MagicMock()
+        client.search_issues.side_effect = RuntimeError("boom")
+
+        with self.assertRaises(JiraBotError):
+            search_jira_issues("project = PLAT", client)
+
+
+class TestGetMultipleTicketDetails(unittest.TestCase):
+
+    def test_bulk_fetch_reports_missing_keys_individually(self):
+        client = MagicMock()
+        found = _make_issue("PLAT-1")
+        found.fields.description = "Board hangs on S3 resume."
+        found.raw = {"key": "PLAT-1", "fields": {"comment": {"total": 0, "comments": []}}}
+        client.search_issues.return_value = [found]
+        # The direct fetch used for keys the search skipped fails, as it would for a 404
+        client.issue.side_effect = RuntimeError("not found")
+
+        results = get_multiple_ticket_details(["PLAT-1", "PLAT-2", "BAD*KEY"], client, chunk_size=10)
+
+        self.assertEqual(list(results), ["PLAT-1", "PLAT-2", "BAD*KEY"])
+        details_text, url = results["PLAT-1"]
+        self.assertIn("Title: Summary of PLAT-1", details_text)
+        self.assertTrue(url.endswith("/browse/PLAT-1"))
+        self.assertIsInstance(results["PLAT-2"], JiraBotError)
+        self.assertIsInstance(results["BAD*KEY"], JiraBotError)
+        # One search for the valid keys; the malformed key never reaches the JQL
+        client.search_issues.assert_called_once()
+        self.assertEqual(client.search_issues.call_args.args[0], "key in (PLAT-1, PLAT-2)")
+        client._get_json.assert_not_called()
+
+    def test_embedded_comments_are_trimmed_locally_and_paged_only_when_partial(self):
+        client = MagicMock()
+        complete, partial = _make_issue("PLAT-1"), _make_issue("PLAT-2")
+        complete.raw = {"key": "PLAT-1", "fields": {"comment": {"total": 8, "comments": [_comment(n) for n in range(1, 9)]}}}
+        partial.raw = {"key": "PLAT-2", "fields": {"comment": {"total": 300, "comments": [_comment(n) for n in range(1, 21)]}}}
+        client.search_issues.return_value = [complete, partial]
+        client._get_json.return_value = {"total": 300, "comments": [_comment(n) for n in (28, 27, 26, 25, 24)]}
+
+        results = get_multiple_ticket_issues(["PLAT-1", "PLAT-2"], client)
+
+        self.assertEqual([c.id for c in results["PLAT-1"].fields.comment.comments], ["4", "5", "6", "7", "8"])
+        self.assertEqual([c.id for c in results["PLAT-2"].fields.comment.comments], ["24", "25", "26", "27", "28"])
+        self.assertIn("comment", client.search_issues.call_args.kwargs["fields"].split(","))
+        client._get_json.assert_called_once_with("issue/PLAT-2/comment", params={"startAt": 0, "maxResults": 5, "orderBy": "-created"})
+
+
+def _comment(n, body="Looking."):
+    return {"id": str(n), "author": {"displayName": f"Dev {n}"}, "created": f"2024-01-{n:02d}T00:00:00.000+0000", "body": body}
+
+
+class TestCommentTail(unittest.TestCase):
+
+    def test_uses_newest_first_page_when_server_orders(self):
+        client = MagicMock()
+        client._get_json.return_value = {"total": 200, "comments": [_comment(n) for n in (20, 19, 18)]}
+        issue = _make_issue("PLAT-1")
+        issue.raw = {"key": "PLAT-1", "fields": {}}
+
+        _fetch_comment_tail(client, issue, tail_size=3)
+
+        client._get_json.assert_called_once_with("issue/PLAT-1/comment", params={"startAt": 0, "maxResults": 3, "orderBy": "-created"})
+        self.assertEqual([c["id"] for c in issue.raw["fields"]["comment"]["comments"]], ["18", "19", "20"])
+        self.assertEqual(issue.fields.comment.total, 200)
+
+    def test_pages_to_the_end_when_server_ignores_ordering(self):
+        client = MagicMock()
+        client._get_json.side_effect = [
+            {"total": 20, "comments": [_comment(n) for n in (1, 2, 3)]},
+            {"total": 20, "comments": [_comment(n) for n in (18, 19, 20)]},
+        ]
+        issue = _make_issue("PLAT-1")
+
+        _fetch_comment_tail(client, issue, tail_size=3)
+
+        self.assertEqual(client._get_json.call_args.kwargs["params"], {"startAt": 17, "maxResults": 3})
+        self.assertEqual([c.id for c in issue.fields.comment.comments], ["18", "19", "20"])
+
+    def test_rendered_comments_stay_within_byte_budget(self):
+        client = MagicMock()
+        client._get_json.return_value = {"total": 2, "comments": [_comment(1, "x" * 100000), _comment(2, "short")]}
+        issue = _make_issue("PLAT-1")
+        issue.fields.description = "Hangs."
+
+        details_text, _ = _format_ticket_details(_fetch_comment_tail(client, issue))
+
+        self.assertIn("Comment by Dev 2", details_text)
+        self.assertIn("[... truncated", details_text)
+        self.assertLess(len(details_text), 10000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+from unittest.mock import patch, MagicMock
+
+from params_cache import ParamsCache
+from jql_builder import get_summary_similarity_scores, extract_params, _fast_extract_params
+
+
+def _completion(content):
+    """Builds a stand-in for an OpenAI chat completion response with the given message content."""
+    response = MagicMock()
+    response.choices[0].message.content = content
+    return response
+
+
+class TestGetSummarySimilarityScores(unittest.TestCase):
+
+    @patch('jql_builder.get_shared_azure_openai_client')
+    def test_scores_are_batched_in_chunks(self, mock_client):
+        mock_client.return_value.chat.completions.create.side_effect = [_completion("[9, 2]"), _completion("```json\n[5]\n```")]
+
+        scores = get_summary_similarity_scores("S3 resume hang", ["S3 hang", "Display flicker", "Resume issue"], batch_size=2)
+
+        self.assertEqual(scores, [9, 2, 5])
+        self.assertEqual(mock_client.return_value.chat.completions.create.call_count, 2)
+        prompt = mock_client.return_value.chat.completions.create.call_args_list[0].kwargs['messages'][0]['content']
+        self.assertIn('1. "S3 hang"', prompt)
+        self.assertIn('2. "Display flicker"', prompt)
+
+    @patch('jql_builder.get_shared_azure_openai_client')
+    def test_invalid_output_defaults_to_low_scores(self, mock_client):
+        # Wrong length and an out-of-range score are both rejected
+        mock_client.return_value.chat.completions.create.side_effect = [_completion("[9]"), _completion("[11, 3]")]
+
+        self.assertEqual(get_summary_similarity_scores("a", ["b", "c"]), [1, 1])
+        self.assertEqual(get_summary_similarity_scores("a", ["b", "c"]), [1, 1])
+
+
+class TestFastExtractParams(unittest.TestCase):
+
+    @patch('jql_builder.get_shared_azure_openai_client')
+    def test_simple_queries_skip_the_llm(self, mock_client):
+        self.assertEqual(
+            extract_params("Stale STXH tickets?"),
+            {"intent": "list", "stale_days": 30, "program": "STXH", "maxResults": 20}
+        )
+        self.assertEqual(
+            extract_params("PLAT tickets assigned to me"),
+            {"intent": "list", "assignee": "currentUser()", "project": "PLAT", "maxResults": 20}
+        )
+        mock_client.return_value.chat.completions.create.assert_not_called()
+
+    def test_relative_dates_and_limits(self):
+        params = _fast_extract_params("top 5 STX tickets created in the last 2 weeks")
+
+        self.assertEqual(params["maxResults"], 5)
+        self.assertEqual(params["program"], "STX")
+        self.assertEqual((params["date_field"], params["date_number"], params["date_unit"], params["date_operator"]), ("created", 2, "weeks", "after"))
+        self.assertEqual(_fast_extract_params("SWDEV tickets not updated in 2 months")["stale_days"], 60)
+
+    def test_unclassified_words_fall_back_to_llm(self):
+        self.assertIsNone(_fast_extract_params("find login crash tickets in PLAT"))
+        self.assertIsNone(_fast_extract_params("STX and STXH tickets"))
+        self.assertIsNone(_fast_extract_params("show me tickets"))
+
+    def test_personal_queries_are_not_widened_to_every_ticket(self):
+        for query in ("PLAT tickets for me", "STXH bugs for me", "what is in PLAT for me", "PLAT tickets i reported"):
+            with self.subTest(query=query):
+                self.assertIsNone(_fast_extract_params(query))
+        self.assertEqual(_fast_extract_params("show me PLAT tickets")["project"], "PLAT")
+        self.assertEqual(_fast_extract_params("can I see stale STXH bugs")["program"], "STXH")
+
+
+class TestExtractParamsCache(unittest.TestCase):
+
+    @patch('jql_builder.get_params_cache')
+    @patch('jql_builder.get_shared_azure_openai_client')
+    def test_repeated_query_is_served_from_cache(self, mock_client, mock_get_cache):
+        mock_get_cache.return_value = ParamsCache(":memory:")
+        mock_client.return_value.chat.completions.create.return_value = _completion('{"intent": "list", "keywords": "usb4 hang", "maxResults": 20}')
+
+        first = extract_params("find usb4 hang tickets")
+        second = extract_params("Find USB4 hang tickets?")
+
+        self.assertEqual(first, second)
+        mock_client.return_value.chat.completions.create.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import json
+import unittest
+from unittest.mock import patch, MagicMock
+
+import httpx
+from jira.resources import dict2resource
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration
+from openai.types.chat import ChatCompletion
+
+import llm_config
+from jira_tools import _get_single_ticket_summary
+from llm_cache import CompletionCache, CachingAzureOpenAIClient, LangChainCompletionCache, LLMCacheMissError
+
+
+def _chat_completion(content):
+    return ChatCompletion.model_validate({
+        "id": "cmpl-1", "object": "chat.completion", "created": 0, "model": "gpt",
+        "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+    })
+
+
+class TestCachingAzureOpenAIClient(unittest.TestCase):
+
+    def setUp(self):
+        self.store = CompletionCache(":memory:")
+        self.raw_client = MagicMock()
+        self.raw_client.chat.completions.create.return_value = _chat_completion("[9, 2]")
+        self.client = CachingAzureOpenAIClient(self.raw_client, self.store)
+        self.request = {"model": "gpt", "messages": [{"role": "system", "content": "score these"}], "max_tokens": 18}
+
+    def test_deterministic_completions_are_served_from_cache(self):
+        first = self.client.chat.completions.create(temperature=0.0, **self.request)
+        second = self.client.chat.completions.create(temperature=0.0, **self.request)
+
+        self.assertEqual(second.choices[0].message.content, "[9, 2]")
+        self.assertEqual(first.choices[0].message.content, second.choices[0].message.content)
+        self.raw_client.chat.completions.create.assert_called_once()
+        self.assertEqual(self.store.stats()["hits"], 1)
+
+    def test_sampled_completions_are_not_cached(self):
+        self.client.chat.completions.create(**self.request)
+        self.client.chat.completions.create(temperature=0.7, **self.request)
+
+        self.assertEqual(self.raw_client.chat.completions.create.call_count, 2)
+        self.assertEqual(self.store.stats()["entries"], 0)
+
+    @patch('llm_cache.LLM_CACHE_MODE', "replay")
+    def test_replay_mode_never_calls_the_service(self):
+        with self.assertRaises(LLMCacheMissError):
+            self.client.chat.completions.create(**self.request)
+        self.raw_client.chat.completions.create.assert_not_called()
+
+
+class TestCompletionCache(unittest.TestCase):
+
+    def test_least_recently_used_completions_are_evicted_by_size(self):
+        store = CompletionCache(":memory:", max_bytes=10)
+        store.put("a", "12345")
+        store.put("b", "12345")
+        store.get("a")
+        store.put("c", "12345")
+
+        self.assertIsNone(store.get("b"))
+        self.assertEqual(store.get("a"), "12345")
+        self.assertLessEqual(store.stats()["bytes"], 10)
+
+    def test_langchain_generations_round_trip(self):
+        cache = LangChainCompletionCache(CompletionCache(":memory:"))
+        cache.update("prompt", "llm", [ChatGeneration(message=AIMessage(content="Summary for PLAT-1"))])
+
+        cached = cache.lookup("prompt", "llm")
+
+        self.assertEqual(cached[0].message.content, "Summary for PLAT-1")
+        self.assertIsNone(cache.lookup("other prompt", "llm"))
+
+
+@patch.multiple('llm_config', AZURE_OPENAI_DEFAULT_HEADERS={'Ocp-Apim-Subscription-Key': "key"}, LLM_API_KEY="key", LLM_API_VERSION="2024-06-01", LLM_RESOURCE_ENDPOINT="https://llm.example.com", LLM_CHAT_DEPLOYMENT_NAME="gpt-4o")
+class TestDeterministicCallsAreCached(unittest.TestCase):
+
+    def tearDown(self):
+        llm_config.close_llm_clients()
+
+    def test_a_repeated_summary_is_served_from_the_cache(self):
+        request_bodies = []
+        def handler(request):
+            request_bodies.append(json.loads(request.content))
+            return httpx.Response(200, json=_chat_completion("Problem statement: S3 hang.").model_dump())
+        issue = dict2resource({"key": "PLAT-1", "fields": {
+            "project": {"key": "PLAT"}, "summary": "S3 hang", "status": {"name": "Open"}, "resolution": None, "assignee": None,
+            "created": "2024-01-01T00:00:00.000+0000", "updated": "2024-01-02T00:00:00.000+0000", "description": "Board hangs on S3 resume.",
+            "comment": {"total": 0, "comments": []}
+        }})
+
+        with patch('llm_cache.LLM_CACHE_MODE', "read_write"), patch('llm_cache.get_completion_cache', return_value=CompletionCache(":memory:")), \
+                patch('llm_config.get_shared_http_client', return_value=httpx.Client(transport=httpx.MockTransport(handler))), \
+                patch('jira_tools.get_summary_store', return_value=None), patch('summarization._get_encoder', return_value=None), patch('builtins.print'):
+            first = _get_single_ticket_summary("PLAT-1", "Provide a full 4-point summary.", issue=issue)
+            second = _get_single_ticket_summary("PLAT-1", "Provide a full 4-point summary.", issue=issue)
+
+        self.assertEqual(first, second)
+        self.assertIn("Problem statement: S3 hang.", second)
+        self.assertEqual(len(request_bodies), 1)
+        self.assertEqual(request_bodies[0]["temperature"], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
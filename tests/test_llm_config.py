@@ -0,0 +1,32 @@
+import unittest
+from unittest.mock import patch
+
+import llm_config
+
+
+@patch('llm_cache.LLM_CACHE_MODE', "off")
+@patch.multiple('llm_config', AZURE_OPENAI_DEFAULT_HEADERS={'Ocp-Apim-Subscription-Key': "key"}, LLM_API_KEY="key", LLM_API_VERSION="2024-06-01", LLM_RESOURCE_ENDPOINT="https://llm.example.com", LLM_CHAT_DEPLOYMENT_NAME="gpt-4o")
+class TestLlmClientRegistry(unittest.TestCase):
+
+    def tearDown(self):
+        llm_config.close_llm_clients()
+
+    def test_llm_is_reused_per_deployment(self):
+        first = llm_config.get_llm()
+
+        self.assertIs(llm_config.get_llm(), first)
+        self.assertIs(llm_config.get_llm("gpt-4o"), first)
+        self.assertIsNot(llm_config.get_llm("gpt-4o-mini"), first)
+
+    def test_langchain_and_raw_clients_share_one_connection_pool(self):
+        llm = llm_config.get_llm()
+        raw_client = llm_config.get_shared_azure_openai_client()
+
+        pool = llm_config.get_shared_http_client()
+        self.assertIs(llm.http_client, pool)
+        self.assertIs(raw_client._client, pool)
+        self.assertIs(llm_config.get_shared_azure_openai_client(), raw_client)
+
+
+if __name__ == '__main__':
+    unittest.main()
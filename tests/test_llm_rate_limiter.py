@@ -0,0 +1,82 @@
+import json
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import httpx
+
+from llm_rate_limiter import (
+    LLMRateLimiter, PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, estimate_request_tokens, llm_priority, rate_limited_transport
+)
+
+
+class TestLLMRateLimiter(unittest.TestCase):
+
+    def test_estimate_counts_messages_and_the_completion(self):
+        body = json.dumps({"messages": [{"role": "user", "content": "x" * 400}], "max_tokens": 50}).encode()
+
+        self.assertEqual(estimate_request_tokens(body), 104 + 50)
+
+    def test_requests_wait_for_the_token_bucket_to_refill(self):
+        limiter = LLMRateLimiter(tokens_per_minute=6000, requests_per_minute=1000)
+
+        self.assertLess(limiter.acquire(6000), 0.05)
+        waited = limiter.acquire(20)
+
+        # 20 tokens at 100 tokens/second is about 0.2 seconds.
+        self.assertGreater(waited, 0.1)
+
+    def test_interactive_requests_are_admitted_before_queued_background_ones(self):
+        limiter = LLMRateLimiter(tokens_per_minute=100000, requests_per_minute=600)
+        limiter.requests.available = 0
+        order = []
+
+        def call(priority, name):
+            with llm_priority(priority):
+                limiter.acquire(10)
+            order.append(name)
+
+        background = [threading.Thread(target=call, args=(PRIORITY_BACKGROUND, f"background-{i}")) for i in range(2)]
+        for thread in background:
+            thread.start()
+        time.sleep(0.02)
+        interactive = threading.Thread(target=call, args=(PRIORITY_INTERACTIVE, "interactive"))
+        interactive.start()
+        for thread in background + [interactive]:
+            thread.join(timeout=5)
+
+        self.assertEqual(order[0], "interactive")
+        self.assertEqual(limiter.stats()["admitted"], 3)
+
+    def test_429_pauses_every_caller_for_retry_after(self):
+        limiter = LLMRateLimiter(tokens_per_minute=100000, requests_per_minute=1000)
+
+        limiter.record_response(429, {"retry-after-ms": "300"})
+        waited = limiter.acquire(10)
+
+        self.assertGreaterEqual(waited, 0.25)
+        self.assertEqual(limiter.stats()["throttled"], 1)
+
+    def test_rate_limit_headers_lower_the_buckets(self):
+        limiter = LLMRateLimiter(tokens_per_minute=100000, requests_per_minute=1000)
+
+        limiter.record_response(200, {"x-ratelimit-remaining-tokens": "1200", "x-ratelimit-remaining-requests": "3"})
+
+        self.assertLessEqual(limiter.tokens.available, 1200)
+        self.assertLessEqual(limiter.requests.available, 3)
+
+    def test_transport_charges_each_request_and_reads_the_response(self):
+        limiter = LLMRateLimiter(tokens_per_minute=100000, requests_per_minute=1000)
+        inner = httpx.MockTransport(lambda request: httpx.Response(429, headers={"retry-after": "0"}, json={}))
+        client = httpx.Client(transport=rate_limited_transport(inner, limiter))
+
+        with patch('builtins.print'):
+            client.post("https://llm.example.com/chat/completions", json={"messages": [{"role": "user", "content": "hi"}]})
+
+        self.assertEqual(limiter.stats()["admitted"], 1)
+        self.assertEqual(limiter.stats()["throttled"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
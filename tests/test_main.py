@@ -0,0 +1,191 @@
+import asyncio
+import io
+import json
+import re
+import time
+import unittest
+from contextlib import redirect_stdout
+from typing import Any, List
+from unittest.mock import AsyncMock, patch
+
+from jira.resources import dict2resource
+from langchain.agents import AgentExecutor, create_tool_calling_agent
+from langchain.tools import tool
+from langchain_core.agents import AgentAction
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+
+from jira_tools import summarize_multiple_tickets_tool
+from jira_utils import SearchResults
+from main import _stream_agent, _stream_route, _print_result
+
+
+class _ScriptedChatModel(BaseChatModel):
+    """Replays scripted replies; streams text word by word and tool calls as a single chunk."""
+    replies: List[Any]
+    position: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _next_reply(self) -> AIMessage:
+        reply = self.replies[self.position]
+        self.position += 1
+        return reply
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        return ChatResult(generations=[ChatGeneration(message=self._next_reply())])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        reply = self._next_reply()
+        if reply.tool_calls:
+            tool_call_chunks = [{"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": 0} for call in reply.tool_calls]
+            yield ChatGenerationChunk(message=AIMessageChunk(content="", tool_call_chunks=tool_call_chunks))
+            return
+        for word in reply.content.split(" "):
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=f"{word} "))
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+
+class _TicketEchoChatModel(BaseChatModel):
+    """Answers with the ticket key found in the prompt, one slow token at a time, so concurrent calls overlap."""
+
+    @property
+    def _llm_type(self) -> str:
+        return "ticket-echo"
+
+    def _reply(self, messages) -> str:
+        # PLAT-123 is the example key in the summary prompt.
+        keys = sorted(set(re.findall(r"PLAT-\d+", messages[-1].content)) - {"PLAT-123"})
+        if len(keys) != 1:
+            return "All tickets are S3 hangs"
+        return " ".join(f"{keys[0]}-part{part}" for part in range(1, 6))
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self._reply(messages)))])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        for word in self._reply(messages).split(" "):
+            time.sleep(0.01)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=f"{word} "))
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+
+def _issue(key):
+    return dict2resource({"key": key, "fields": {
+        "project": {"key": "PLAT"}, "summary": f"{key} S3 hang", "status": {"name": "Open"}, "resolution": None, "assignee": None,
+        "created": "2024-01-01T00:00:00.000+0000", "updated": "2024-01-02T00:00:00.000+0000", "description": "Board hangs on S3 resume.",
+        "comment": {"total": 0, "comments": []}
+    }})
+
+
+def _make_agent(tool_function, final_answer, tool_args=None):
+    agent_llm = _ScriptedChatModel(replies=[
+        AIMessage(content="", tool_calls=[{"name": tool_function.name, "args": tool_args or {"issue_key": "PLAT-1"}, "id": "call-1"}]),
+        AIMessage(content=final_answer),
+    ])
+    prompt = ChatPromptTemplate.from_messages([("system", "You help with Jira."), ("human", "{input}"), MessagesPlaceholder("agent_scratchpad")])
+    agent = create_tool_calling_agent(agent_llm, [tool_function], prompt)
+    return AgentExecutor(agent=agent, tools=[tool_function], return_intermediate_steps=True)
+
+
+def _summary_tool(summary_llm):
+    @tool
+    def summarize_ticket_tool(issue_key: str) -> str:
+        """Summarizes a ticket."""
+        return summary_llm.invoke(f"Summarize {issue_key}").content
+    return summarize_ticket_tool
+
+@tool
+def jira_search_tool(issue_key: str) -> list:
+    """Searches for tickets."""
+    return [{"key": "PLAT-1", "summary": "S3 hang", "status": "Open", "assignee": "Dev", "priority": "P2", "created": "2024-01-01", "updated": "2024-01-02", "url": "https://jira/browse/PLAT-1"}]
+
+
+class TestStreamingRepl(unittest.TestCase):
+
+    def _run(self, agent):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            result, answer_shown = asyncio.run(_stream_agent(agent, {"input": "question"}))
+            _print_result(result, answer_shown)
+        return result, output.getvalue()
+
+    def test_tokens_from_tools_and_the_final_answer_are_streamed_once(self):
+        summary_llm = _ScriptedChatModel(replies=[AIMessage(content="Problem statement: S3 hang")])
+
+        result, printed = self._run(_make_agent(_summary_tool(summary_llm), "Here is the summary"))
+
+        self.assertEqual(result["output"], "Here is the summary ")
+        self.assertIn("[summarize_ticket_tool] working...", printed)
+        self.assertLess(printed.index("statement: "), printed.index("[summarize_ticket_tool] done."))
+        self.assertEqual(printed.count("JIRA Bot: Here is the summary"), 1)
+
+    def test_search_results_keep_the_issue_list_display(self):
+        result, printed = self._run(_make_agent(jira_search_tool, "I found one ticket"))
+
+        self.assertIn("--- Found 1 JIRA Issues ---", printed)
+        self.assertNotIn("I found one ticket", printed)
+
+    def test_limit_note_names_the_limit_the_search_stopped_at(self):
+        issue = jira_search_tool.invoke({"issue_key": "PLAT-1"})[0]
+        action = AgentAction(tool="jira_search_tool", tool_input={}, log="")
+        for issues, note in ((SearchResults([issue] * 5, 5), "maximum of 5 results"), (SearchResults([issue] * 20, 50), None), (SearchResults([issue] * 500, 500), "maximum of 500 results")):
+            output = io.StringIO()
+            with redirect_stdout(output):
+                _print_result({"output": "", "intermediate_steps": [(action, issues)]})
+            with self.subTest(count=len(issues), limit=issues.limit):
+                if note:
+                    self.assertIn(note, output.getvalue())
+                else:
+                    self.assertNotIn("Note:", output.getvalue())
+
+    @patch('summarization._get_encoder', return_value=None)
+    @patch('jira_tools.get_summary_store', return_value=None)
+    @patch('jira_tools.async_get_multiple_ticket_issues', new_callable=AsyncMock)
+    def test_concurrent_summaries_from_a_thread_pooled_tool_stream_without_interleaving(self, mock_get_issues, mock_store, mock_encoder):
+        keys = ["PLAT-1", "PLAT-2", "PLAT-3"]
+        mock_get_issues.return_value = {key: _issue(key) for key in keys}
+        agent = _make_agent(summarize_multiple_tickets_tool, "Three summaries above", tool_args={"issue_keys": keys})
+
+        with patch('jira_tools.get_llm', return_value=_TicketEchoChatModel()):
+            result, printed = self._run(agent)
+
+        done = printed.index("[summarize_multiple_tickets_tool] done.")
+        for key in keys:
+            summary = " ".join(f"{key}-part{part}" for part in range(1, 6))
+            self.assertIn(summary, printed[:done])
+        self.assertIn("All tickets are S3 hangs", printed[:done])
+        self.assertIn("PLAT-3-part5", result["intermediate_steps"][0][1])
+
+    @patch('summarization._get_encoder', return_value=None)
+    @patch('jira_tools.get_jira_client')
+    @patch('jira_tools.get_summary_store', return_value=None)
+    @patch('jira_tools.get_ticket_issue', return_value=_issue("PLAT-1"))
+    def test_routed_summaries_stream_too(self, mock_get_issue, mock_store, mock_client, mock_encoder):
+        output = io.StringIO()
+        with patch('jira_tools.get_llm', return_value=_TicketEchoChatModel()), redirect_stdout(output):
+            result, answer_shown = asyncio.run(_stream_route(("summarize_ticket_tool", {"issue_key": "PLAT-1"})))
+            _print_result(result, answer_shown)
+        printed = output.getvalue()
+
+        summary = " ".join(f"PLAT-1-part{part}" for part in range(1, 6))
+        self.assertTrue(answer_shown)
+        self.assertIn(summary, result["output"])
+        self.assertEqual(result["intermediate_steps"][0][0].tool, "summarize_ticket_tool")
+        self.assertLess(printed.index(summary), printed.index("[summarize_ticket_tool] done."))
+        self.assertEqual(printed.count("PLAT-1-part1"), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
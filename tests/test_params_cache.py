@@ -0,0 +1,44 @@
+import unittest
+from unittest.mock import patch
+
+from params_cache import ParamsCache, normalize_query, fingerprint
+
+
+class TestParamsCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = ParamsCache(":memory:", max_entries=2, ttl_seconds=60)
+        self.params = {"intent": "list", "keywords": "usb4 hang", "maxResults": 20}
+
+    def test_near_identical_queries_share_an_entry(self):
+        self.assertEqual(normalize_query("  Show me USB4 hang tickets?? "), "show me usb4 hang tickets")
+
+        self.cache.put("show me USB4 hang tickets", "fp1", self.params)
+
+        self.assertEqual(self.cache.get("Show me usb4 hang tickets?", "fp1"), self.params)
+        self.assertIsNone(self.cache.get("show me usb4 hang tickets", "fp2")) # Edited prompt or maps
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+    def test_fingerprint_changes_with_maps(self):
+        self.assertNotEqual(fingerprint("prompt", {"STX": "Strix1"}), fingerprint("prompt", {"STX": "Strix1", "KRK": "Krackan1"}))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        self.cache.put("query one", "fp", self.params)
+        self.cache.put("query two", "fp", self.params)
+        self.cache.get("query one", "fp")
+        self.cache.put("query three", "fp", self.params)
+
+        self.assertIsNone(self.cache.get("query two", "fp"))
+        self.assertIsNotNone(self.cache.get("query one", "fp"))
+        self.assertEqual(self.cache.stats()["entries"], 2)
+
+    def test_expired_entries_are_misses(self):
+        with patch('params_cache.time.time', return_value=1000.0):
+            self.cache.put("query one", "fp", self.params)
+        with patch('params_cache.time.time', return_value=1061.0):
+            self.assertIsNone(self.cache.get("query one", "fp"))
+
+
+if __name__ == '__main__':
+    unittest.main()
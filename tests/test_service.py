@@ -0,0 +1,135 @@
+import asyncio
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+import httpx
+
+from service import HTTPError, JiraService, WorkQueue
+
+TICKET_FIELDS = {
+    "summary": "USB4 dock drops on resume", "program": "STXH", "system": "System-Strix Halo Reference Board",
+    "silicon_revision": "A0", "bios_version": "1.2.3", "triage_category": "CPU", "triage_assignment": "Debug",
+    "severity": "High", "project": "PLAT"
+}
+
+
+class TestJiraService(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.service = JiraService(workers=2, max_queue=4)
+        self.service.work.start()
+        self.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=self.service), base_url="http://service")
+        patcher = patch('builtins.print')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+        await self.service.work.drain(timeout=1)
+
+    async def test_tools_are_listed_and_called_without_the_agent(self):
+        tools = (await self.client.get("/tools")).json()["tools"]
+        self.assertIn("summarize_ticket_tool", [tool["name"] for tool in tools])
+        self.assertNotIn("create_ticket_tool", [tool["name"] for tool in tools])
+
+        response = await self.client.post("/tools/get_field_options_tool", json={"field_name": "severity"})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Severity", response.json()["output"])
+
+        self.assertEqual((await self.client.post("/tools/create_ticket_tool", json={})).status_code, 400)
+        for bad_arguments in ({}, {"field_name": ["severity"]}):
+            response = await self.client.post("/tools/get_field_options_tool", json=bad_arguments)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("field_name", response.json()["error"])
+        self.assertEqual((await self.client.get("/nowhere")).status_code, 404)
+
+    @patch('service.route_query', return_value=None)
+    async def test_sessions_keep_their_own_history(self, mock_route):
+        agent = MagicMock()
+        agent.invoke.side_effect = lambda inputs: {"output": f"answer to {inputs['input']}", "intermediate_steps": []}
+        self.service._agent = agent
+        first = (await self.client.post("/sessions")).json()["session_id"]
+        second = (await self.client.post("/sessions")).json()["session_id"]
+
+        await self.client.post(f"/sessions/{first}/query", json={"query": "what blocks PLAT-1?"})
+        response = await self.client.post(f"/sessions/{first}/query", json={"query": "and who owns it?"})
+        await self.client.post(f"/sessions/{second}/query", json={"query": "hello"})
+
+        self.assertEqual(response.json()["output"], "answer to and who owns it?")
+        self.assertEqual(response.json()["route"], "agent")
+        self.assertEqual(len(agent.invoke.call_args_list[1].args[0]["chat_history"]), 2)
+        self.assertEqual(agent.invoke.call_args_list[2].args[0]["chat_history"], [])
+        self.assertEqual((await self.client.post("/sessions/unknown/query", json={"query": "hi"})).status_code, 404)
+
+    @patch('service.route_query', return_value=None)
+    async def test_a_session_runs_one_query_at_a_time(self, mock_route):
+        release = threading.Event()
+        agent = MagicMock()
+        agent.invoke.side_effect = lambda inputs: {"output": "done" if release.wait(5) else "timed out", "intermediate_steps": []}
+        self.service._agent = agent
+        session_id = (await self.client.post("/sessions")).json()["session_id"]
+
+        first = asyncio.ensure_future(self.client.post(f"/sessions/{session_id}/query", json={"query": "what blocks PLAT-1?"}))
+        await asyncio.sleep(0.05)
+        second = await self.client.post(f"/sessions/{session_id}/query", json={"query": "and PLAT-2?"})
+        release.set()
+
+        self.assertEqual(second.status_code, 409)
+        self.assertEqual((await first).json()["output"], "done")
+        self.assertEqual(self.service.work.completed, 1)
+
+    @patch('jira_tools.submit_ticket', return_value=("PLAT-500", "https://jira/browse/PLAT-500"))
+    @patch('jira_tools.find_creation_duplicates', return_value=[{"key": "PLAT-12", "summary": "USB4 dock drops", "status": "Open", "url": "https://jira/browse/PLAT-12"}])
+    async def test_ticket_creation_is_a_draft_then_a_confirmed_submit(self, mock_duplicates, mock_submit):
+        draft = (await self.client.post("/tickets/drafts", json=TICKET_FIELDS)).json()
+        self.assertIn("---STEPS-TO-REPRODUCE---", draft["description_template"])
+        self.assertEqual(draft["fields"]["program"], "Strix Halo [PRG-000391]")
+        submit_url = f"/tickets/drafts/{draft['draft_id']}/submit"
+        filled = "---DESCRIPTION---\nDock drops.\n\n---STEPS-TO-REPRODUCE---\n1. Resume."
+
+        self.assertEqual((await self.client.post(submit_url, json={"description_text": filled, "confirm": True})).status_code, 409)
+        response = await self.client.post(submit_url, json={"description_text": filled, "confirm": True, "confirm_duplicates": True})
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["key"], "PLAT-500")
+        self.assertEqual(mock_submit.call_args.args[1:], ("Dock drops.", "1. Resume."))
+        self.assertEqual((await self.client.post(submit_url, json={"confirm": True})).status_code, 404)
+
+    async def test_invalid_ticket_fields_are_rejected(self):
+        response = await self.client.post("/tickets/drafts", json=dict(TICKET_FIELDS, program="NOPE"))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Invalid program code", response.json()["error"])
+
+    async def test_draining_service_refuses_new_work(self):
+        self.service.draining = True
+
+        self.assertEqual((await self.client.post("/sessions")).status_code, 503)
+        self.assertEqual((await self.client.get("/health")).json()["status"], "draining")
+
+
+class TestWorkQueue(unittest.IsolatedAsyncioTestCase):
+
+    async def test_full_queue_is_rejected_and_drain_waits_for_running_work(self):
+        work = WorkQueue(workers=1, max_queue=1)
+        work.start()
+        release = threading.Event()
+        running = asyncio.ensure_future(work.submit(release.wait, 5))
+        await asyncio.sleep(0.05)
+        queued = asyncio.ensure_future(work.submit(lambda: "queued"))
+        await asyncio.sleep(0)
+
+        with self.assertRaises(HTTPError) as raised:
+            await work.submit(lambda: "rejected")
+        self.assertEqual(raised.exception.status, 503)
+
+        release.set()
+        await work.drain(timeout=2)
+        self.assertTrue(running.result())
+        self.assertEqual(queued.result(), "queued")
+        self.assertEqual(work.rejected, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+
+from similarity_index import SummaryIndex
+
+
+class TestSummaryIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = SummaryIndex([
+            "Display flicker at 144Hz on eDP panel",
+            "System hangs on S3 resume with USB4 dock attached",
+            "Memory training fails at DDR5-6400",
+        ])
+
+    def test_rephrased_summary_ranks_first(self):
+        ranked = self.index.top_k("Hang on S3-resume when a USB4 dock is connected", k=3)
+
+        self.assertEqual(ranked[0][0], 1)
+        self.assertGreater(ranked[0][1], 0.3)
+
+    def test_unrelated_summary_is_filtered_by_min_score(self):
+        self.assertEqual(self.index.top_k("BIOS setup menu typo", k=3, min_score=0.3), [])
+
+    def test_scores_are_in_index_order_and_bounded(self):
+        scores = self.index.score("Memory training fails at DDR5-6400")
+
+        self.assertEqual(len(scores), 3)
+        self.assertAlmostEqual(scores[2], 1.0, places=6)
+        self.assertTrue(all(0.0 <= score <= 1.0 + 1e-9 for score in scores))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from summarization import clean_ticket_text, split_into_chunks, compact_ticket_text, count_tokens, get_token_budget, batch_by_tokens, reduce_summaries
+
+
+class TestSummarization(unittest.TestCase):
+
+    def setUp(self):
+        # Use the length-based estimate so results do not depend on a downloaded tokenizer.
+        patcher = patch('summarization._get_encoder', return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_clean_strips_markup_and_repeated_log_lines(self):
+        text = "h2. Failure\n{code:java}\n[ 12.001] PCIe link down at 0x1f00\n[ 12.002] PCIe link down at 0x1f04\n[ 12.003] PCIe link down at 0x1f08\n{code}\nSee [the dump|http://scandump/1] *now*"
+
+        cleaned = clean_ticket_text(text)
+
+        self.assertNotIn("{code", cleaned)
+        self.assertNotIn("h2.", cleaned)
+        self.assertEqual(cleaned.count("PCIe link down"), 1)
+        self.assertIn("repeated 2 more times", cleaned)
+        self.assertIn("See the dump", cleaned)
+
+    def test_chunks_respect_the_token_limit(self):
+        text = "\n".join(f"line {i} " + "x" * 40 for i in range(100)) + "\n" + "y" * 5000
+
+        chunks = split_into_chunks(text, 200)
+
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(count_tokens(chunk) <= 220 for chunk in chunks))
+        self.assertEqual("".join(chunks).count("y"), 5000)
+
+    def test_text_within_budget_is_not_sent_to_the_llm(self):
+        summarizer = MagicMock()
+
+        result = compact_ticket_text("Title: Hang\n\n-- Description --\nShort.", 1000, summarize_chunk=summarizer)
+
+        self.assertIn("Short.", result)
+        summarizer.assert_not_called()
+
+    def test_long_text_is_condensed_by_chunk_and_keeps_the_header(self):
+        details = "Project: PLAT\nTitle: S3 hang\n\n-- Description --\n" + "\n".join(f"step {i}: " + f"{('PCIe', 'SMU', 'USB', 'DF')[i % 4]} register dump " * 20 for i in range(200))
+        summarizer = MagicMock(side_effect=lambda chunk, position, total, question: f"note {position}")
+
+        with patch('summarization.SUMMARY_CHUNK_TOKENS', 500):
+            result = compact_ticket_text(details, 2000, summarize_chunk=summarizer)
+
+        self.assertTrue(result.startswith("Project: PLAT\nTitle: S3 hang"))
+        self.assertIn("note 1", result)
+        self.assertLessEqual(count_tokens(result), 2000)
+        self.assertGreater(summarizer.call_count, 1)
+
+    def test_budget_can_be_set_per_tool(self):
+        with patch.dict('os.environ', {"SUMMARIZE_TICKET_TOOL_TOKEN_BUDGET": "1234"}):
+            self.assertEqual(get_token_budget("summarize_ticket_tool"), 1234)
+
+
+class TestHierarchicalReduce(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch('summarization._get_encoder', return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_batches_are_token_bounded_and_keep_order(self):
+        texts = [f"summary {i} " + "x" * 400 for i in range(10)]
+
+        batches = batch_by_tokens(texts, 250)
+
+        self.assertEqual([text for batch in batches for text in batch], texts)
+        self.assertTrue(all(2 <= len(batch) <= 3 for batch in batches))
+
+    def test_small_sets_are_not_reduced(self):
+        reducer = MagicMock()
+
+        self.assertEqual(reduce_summaries(["a", "b"], 1000, reduce_batch=reducer), ["a", "b"])
+        reducer.assert_not_called()
+
+    def test_many_summaries_are_reduced_level_by_level_into_budget(self):
+        summaries = [f"Summary for PLAT-{i}: " + "root cause text " * 30 for i in range(200)]
+        levels = []
+        def reducer(batch, level):
+            levels.append(level)
+            return f"analysis of {len(batch)} items at level {level} " + "theme " * 60
+
+        reduced = reduce_summaries(summaries, 1000, reduce_batch=reducer)
+
+        self.assertLessEqual(sum(count_tokens(text) for text in reduced), 1000)
+        self.assertIn(1, levels)
+        self.assertGreater(max(levels), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from jira.resources import dict2resource
+
+from jira_tools import _get_single_ticket_summary
+from summary_store import SummaryStore
+
+
+def _issue(updated, comments, description="Board hangs on S3 resume."):
+    return dict2resource({
+        "key": "PLAT-1",
+        "fields": {
+            "project": {"key": "PLAT"}, "summary": "S3 hang", "status": {"name": "Open"}, "resolution": None,
+            "assignee": None, "created": "2024-01-01T00:00:00.000+0000", "updated": updated, "description": description,
+            "comment": {"total": len(comments), "comments": [
+                {"author": {"displayName": "Dev"}, "created": f"2024-01-{day:02d}T00:00:00.000+0000", "body": f"Update from day {day}."}
+                for day in comments
+            ]}
+        }
+    })
+
+
+class TestIncrementalSummaries(unittest.TestCase):
+
+    def setUp(self):
+        self.store = SummaryStore(filename=":memory:")
+        self.llm = MagicMock()
+        self.llm.invoke.side_effect = lambda prompt: MagicMock(content=f"answer #{self.llm.invoke.call_count}")
+        for target, value in (('jira_tools.get_summary_store', self.store), ('jira_tools.get_llm', self.llm)):
+            patcher = patch(target, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _summarize(self, issue):
+        return _get_single_ticket_summary("PLAT-1", "Provide a full 4-point summary.", issue=issue)
+
+    def test_unchanged_ticket_reuses_the_stored_summary(self):
+        first = self._summarize(_issue("2024-01-02T00:00:00.000+0000", [2]))
+        second = self._summarize(_issue("2024-01-02T00:00:00.000+0000", [2]))
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.llm.invoke.call_count, 1)
+        self.assertEqual(self.store.stats()["reused"], 1)
+
+    def test_new_comments_only_send_the_previous_summary_and_the_new_comments(self):
+        self._summarize(_issue("2024-01-02T00:00:00.000+0000", [2]))
+        updated = self._summarize(_issue("2024-01-05T00:00:00.000+0000", [2, 4, 5]))
+
+        prompt = self.llm.invoke.call_args.args[0]
+        self.assertIn("Previous Answer", prompt)
+        self.assertIn("answer #1", prompt)
+        self.assertIn("Update from day 4.", prompt)
+        self.assertNotIn("Update from day 2.", prompt)
+        self.assertNotIn("Board hangs on S3 resume.", prompt)
+        self.assertIn("answer #2", updated)
+        self.assertEqual(self.store.stats()["incremental"], 1)
+
+    def test_edited_fields_regenerate_from_scratch(self):
+        self._summarize(_issue("2024-01-02T00:00:00.000+0000", [2]))
+        self._summarize(_issue("2024-01-03T00:00:00.000+0000", [2, 3], description="Root caused to SMU firmware."))
+
+        prompt = self.llm.invoke.call_args.args[0]
+        self.assertNotIn("Previous Answer", prompt)
+        self.assertIn("Root caused to SMU firmware.", prompt)
+        self.assertEqual(self.store.stats()["full"], 2)
+
+    def test_tickets_without_updated_are_compared_by_content(self):
+        self._summarize(_issue(None, [2]))
+        self._summarize(_issue(None, [2]))
+        self._summarize(_issue(None, [2], description="Root caused to SMU firmware."))
+
+        self.assertEqual(self.llm.invoke.call_count, 2)
+        self.assertIn("Root caused to SMU firmware.", self.llm.invoke.call_args.args[0])
+        self.assertEqual((self.store.stats()["reused"], self.store.stats()["full"]), (1, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import httpx
+from jira.resources import dict2resource
+
+from jira_async import AsyncJiraClient, async_get_ticket_data_for_analysis, run_async
+from jira_utils import get_ticket_details, get_ticket_data_for_analysis, TICKET_DETAIL_FIELDS
+from ticket_cache import TicketCache
+
+
+def _raw_issue(key, updated="2024-01-03T10:00:00.000+0000"):
+    return {
+        "key": key,
+        "fields": {
+            "project": {"key": "PLAT"}, "summary": f"Summary of {key}", "status": {"name": "Open"},
+            "resolution": None, "assignee": None, "created": "2024-01-02T10:00:00.000+0000", "updated": updated,
+            "description": "Hangs on S3 resume.", "comment": {"comments": []}
+        }
+    }
+
+
+def _as_issue(raw):
+    issue = dict2resource(raw)
+    issue.raw = raw
+    return issue
+
+
+class TestTicketCache(unittest.TestCase):
+
+    def test_lru_evicts_least_recently_used(self):
+        cache = TicketCache(max_entries=2)
+        for key in ("PLAT-1", "PLAT-2"):
+            cache.put(key, TICKET_DETAIL_FIELDS, _raw_issue(key))
+        cache.lookup("PLAT-1", TICKET_DETAIL_FIELDS)
+        cache.put("PLAT-3", TICKET_DETAIL_FIELDS, _raw_issue("PLAT-3"))
+
+        self.assertIsNotNone(cache.lookup("PLAT-1", TICKET_DETAIL_FIELDS))
+        self.assertIsNone(cache.lookup("PLAT-2", TICKET_DETAIL_FIELDS))
+
+    def test_entry_only_serves_fields_it_holds(self):
+        cache = TicketCache()
+        cache.put("PLAT-1", "summary,updated", _raw_issue("PLAT-1"))
+
+        self.assertIsNotNone(cache.lookup("PLAT-1", "summary"))
+        self.assertIsNone(cache.lookup("PLAT-1", TICKET_DETAIL_FIELDS))
+
+    def test_disk_tier_survives_a_new_process_cache(self):
+        cache = TicketCache(filename=":memory:")
+        cache.put("PLAT-1", TICKET_DETAIL_FIELDS, _raw_issue("PLAT-1"))
+        cache._entries.clear()
+
+        entry = cache.lookup("PLAT-1", TICKET_DETAIL_FIELDS)
+
+        self.assertEqual(entry["raw"]["key"], "PLAT-1")
+        self.assertTrue(cache.needs_revalidation(entry))
+
+
+class TestCachedTicketFetch(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = TicketCache(revalidate_seconds=0)
+        patcher = patch('jira_utils.get_ticket_cache', return_value=self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = MagicMock()
+
+    def _serve(self, updated):
+        def issue(key, fields):
+            raw = _raw_issue(key, updated)
+            if fields == "updated":
+                raw["fields"] = {"updated": updated}
+            return _as_issue(raw)
+        self.client.issue.side_effect = issue
+        self.client._get_json.return_value = {"total": 0, "comments": []}
+
+    def test_unchanged_ticket_is_revalidated_with_updated_field_only(self):
+        self._serve("2024-01-03T10:00:00.000+0000")
+        first = get_ticket_details("PLAT-1", self.client)
+        second = get_ticket_details("PLAT-1", self.client)
+        data = get_ticket_data_for_analysis("PLAT-1", self.client)
+
+        self.assertEqual(first, second)
+        self.assertEqual(data["summary"], "Summary of PLAT-1")
+        requested_fields = [call.kwargs["fields"] for call in self.client.issue.call_args_list]
+        self.assertEqual(requested_fields, [TICKET_DETAIL_FIELDS, "updated", "updated"])
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 1))
+        self.assertGreater(stats["bytes_saved"], 0)
+
+    def test_changed_ticket_is_fetched_again(self):
+        self._serve("2024-01-03T10:00:00.000+0000")
+        get_ticket_details("PLAT-1", self.client)
+        self._serve("2024-02-01T10:00:00.000+0000")
+        details_text, _ = get_ticket_details("PLAT-1", self.client)
+
+        self.assertIn("Updated: 2024-02-01", details_text)
+        self.assertEqual(self.client.issue.call_args_list[-1].kwargs["fields"], TICKET_DETAIL_FIELDS)
+        self.assertEqual(self.cache.stats()["hits"], 0)
+
+    def _analyse_async(self, requests_seen):
+        """Runs the duplicate check's source fetch against a fake Jira that records every request."""
+        def handler(request):
+            requests_seen.append(request.url.params["fields"])
+            raw = _raw_issue("PLAT-1")
+            if request.url.params["fields"] == "updated":
+                raw["fields"] = {"updated": raw["fields"]["updated"]}
+            return httpx.Response(200, json=raw)
+
+        async def work():
+            client = AsyncJiraClient(server="https://jira.example.com", auth=("user", "secret"), transport=httpx.MockTransport(handler))
+            try:
+                return await async_get_ticket_data_for_analysis("PLAT-1", client)
+            finally:
+                await client.aclose()
+        with patch('jira_async.get_ticket_cache', return_value=self.cache):
+            return run_async(work())
+
+    def test_summarize_then_find_duplicates_fetches_the_ticket_once(self):
+        self._serve("2024-01-03T10:00:00.000+0000")
+        get_ticket_details("PLAT-1", self.client)
+        async_requests = []
+
+        self.cache.revalidate_seconds = 30
+        data = self._analyse_async(async_requests)
+        self.cache.revalidate_seconds = 0
+        self._analyse_async(async_requests)
+
+        self.assertEqual(data["summary"], "Summary of PLAT-1")
+        self.assertEqual([call.kwargs["fields"] for call in self.client.issue.call_args_list], [TICKET_DETAIL_FIELDS])
+        self.assertEqual(async_requests, ["updated"])
+        self.assertEqual(self.cache.stats()["hits"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
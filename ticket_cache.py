@@ -0,0 +1,163 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+from dotenv import load_dotenv
+
+from local_store import open_database
+
+load_dotenv()
+
+TICKET_CACHE_ENABLED = os.getenv("TICKET_CACHE_ENABLED", "true").lower() == "true"
+TICKET_CACHE_MAX_ENTRIES = int(os.getenv("TICKET_CACHE_MAX_ENTRIES", "256"))
+# Within this window a cached ticket is served without asking Jira whether it changed,
+# so a summarize -> find similar -> find duplicates burst costs one fetch instead of three.
+TICKET_CACHE_REVALIDATE_SECONDS = float(os.getenv("TICKET_CACHE_REVALIDATE_SECONDS", "30"))
+TICKET_CACHE_DISK_ENABLED = os.getenv("TICKET_CACHE_DISK_ENABLED", "false").lower() == "true"
+
+
+def _field_set(fields: str) -> frozenset:
+    return frozenset(field.strip() for field in fields.split(",") if field.strip())
+
+
+class TicketCache:
+    """
+    A two-tier cache of raw Jira issue payloads: an in-process LRU backed by an optional SQLite store.
+    Entries are keyed by issue key and remember the fields they were fetched with and the issue's
+    'updated' timestamp, which callers compare against Jira before reusing an entry.
+    """
+
+    def __init__(self, max_entries: int = TICKET_CACHE_MAX_ENTRIES, revalidate_seconds: float = TICKET_CACHE_REVALIDATE_SECONDS, filename: Optional[str] = None):
+        self.max_entries = max_entries
+        self.revalidate_seconds = revalidate_seconds
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.bytes_saved = 0
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if filename:
+            self._db = open_database(filename)
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS ticket_cache (
+                    key TEXT PRIMARY KEY,
+                    fields TEXT NOT NULL,
+                    updated TEXT NOT NULL,
+                    payload TEXT NOT NULL
+                )
+            """)
+            self._db.commit()
+
+    def _load_from_disk(self, issue_key: str) -> Optional[Dict[str, Any]]:
+        row = self._db.execute("SELECT fields, updated, payload FROM ticket_cache WHERE key = ?", (issue_key,)).fetchone()
+        if row is None:
+            return None
+        # Disk entries may be arbitrarily old, so they are always revalidated before use.
+        return {"fields": _field_set(row[0]), "updated": row[1], "raw": json.loads(row[2]), "size": len(row[2]), "validated_at": 0.0}
+
+    def lookup(self, issue_key: str, fields: str) -> Optional[Dict[str, Any]]:
+        """Returns the entry for the key if it holds every requested field, else None. Does not count a hit or miss."""
+        with self._lock:
+            entry = self._entries.get(issue_key)
+            if entry is None and self._db is not None:
+                entry = self._load_from_disk(issue_key)
+                if entry is not None:
+                    self._remember(issue_key, entry)
+            if entry is None or not _field_set(fields) <= entry["fields"]:
+                return None
+            self._entries.move_to_end(issue_key)
+            return entry
+
+    def needs_revalidation(self, entry: Dict[str, Any]) -> bool:
+        return time.time() - entry["validated_at"] > self.revalidate_seconds
+
+    def record_hit(self, issue_key: str, revalidated: bool) -> None:
+        """Counts a served entry; a revalidated entry is trusted for another revalidate_seconds."""
+        with self._lock:
+            entry = self._entries.get(issue_key)
+            if entry is None:
+                return
+            self.hits += 1
+            self.bytes_saved += entry["size"]
+            if revalidated:
+                self.revalidations += 1
+                entry["validated_at"] = time.time()
+
+    def record_miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    def put(self, issue_key: str, fields: str, raw: Dict[str, Any]) -> None:
+        """Stores a raw issue payload fetched with the given fields. Payloads without 'updated' cannot be revalidated and are skipped."""
+        updated = (raw.get("fields") or {}).get("updated")
+        if not updated:
+            return
+        payload = json.dumps(raw)
+        entry = {"fields": _field_set(fields), "updated": updated, "raw": raw, "size": len(payload), "validated_at": time.time()}
+        with self._lock:
+            self._remember(issue_key, entry)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO ticket_cache (key, fields, updated, payload) VALUES (?, ?, ?, ?)",
+                    (issue_key, ",".join(sorted(entry["fields"])), updated, payload)
+                )
+                self._db.commit()
+
+    def _remember(self, issue_key: str, entry: Dict[str, Any]) -> None:
+        self._entries[issue_key] = entry
+        self._entries.move_to_end(issue_key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, issue_keys: Iterable[str]) -> None:
+        with self._lock:
+            for issue_key in issue_keys:
+                self._entries.pop(issue_key, None)
+                if self._db is not None:
+                    self._db.execute("DELETE FROM ticket_cache WHERE key = ?", (issue_key,))
+            if self._db is not None:
+                self._db.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM ticket_cache")
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit/miss counters, the bytes not re-downloaded thanks to hits, and the entry count."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "revalidations": self.revalidations,
+                "bytes_saved": self.bytes_saved,
+                "entries": len(self._entries),
+            }
+
+
+_TICKET_CACHE = None
+_TICKET_CACHE_LOCK = threading.Lock()
+
+def get_ticket_cache() -> Optional[TicketCache]:
+    """Returns the process-wide ticket cache, or None when TICKET_CACHE_ENABLED is false."""
+    global _TICKET_CACHE
+    if not TICKET_CACHE_ENABLED:
+        return None
+    if _TICKET_CACHE is None:
+        with _TICKET_CACHE_LOCK:
+            if _TICKET_CACHE is None:
+                filename = "ticket_cache.sqlite3" if TICKET_CACHE_DISK_ENABLED else None
+                try:
+                    _TICKET_CACHE = TicketCache(filename=filename)
+                except Exception as e:
+                    print(f"WARNING: Could not open the on-disk ticket cache, keeping it in memory only: {e}")
+                    _TICKET_CACHE = TicketCache()
+    return _TICKET_CACHE
@@ -0,0 +1,68 @@
+import argparse
+import os
+import statistics
+import time
+from collections import Counter
+
+# With --live both paths are timed against the real services. The caches are turned off so the
+# second path does not get answers the first one already fetched.
+os.environ.setdefault("LLM_CACHE_MODE", "off")
+os.environ.setdefault("TICKET_CACHE_ENABLED", "false")
+os.environ.setdefault("SUMMARY_STORE_ENABLED", "false")
+
+from intent_router import route_query, run_route
+
+
+def load_queries(path):
+    """Reads one query per line; blank lines and lines starting with '#' are skipped."""
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+def time_call(function, *args):
+    started = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - started
+
+def benchmark(queries, live=False):
+    """
+    Reports how many of the queries the router handles without the agent and, with live=True,
+    how long each routed query takes through the agent versus directly.
+    """
+    routes = [(query, route_query(query)) for query in queries]
+    routed = [(query, route) for query, route in routes if route is not None]
+    print("--- Intent Router Benchmark ---")
+    print(f"Queries: {len(queries)}")
+    print(f"Routed:  {len(routed)} ({len(routed) / max(1, len(queries)):.0%})")
+    for tool_name, count in Counter(route[0] for _, route in routed).most_common():
+        print(f"  {tool_name}: {count}")
+    unrouted = [query for query, route in routes if route is None]
+    if unrouted:
+        print("Sent to the agent, e.g.:")
+        for query in unrouted[:10]:
+            print(f"  {query}")
+
+    if not live or not routed:
+        return
+    from jira_agent import get_jira_agent
+    agent = get_jira_agent()
+    savings = []
+    for query, route in routed:
+        try:
+            agent_seconds = time_call(agent.invoke, {"input": query, "chat_history": []})
+            router_seconds = time_call(run_route, route)
+        except Exception as e:
+            print(f"WARNING: Skipping '{query}': {e}")
+            continue
+        savings.append(agent_seconds - router_seconds)
+        print(f"{query}: agent {agent_seconds:.2f}s, routed {router_seconds:.2f}s")
+    if savings:
+        print(f"Latency saved per routed query: mean {statistics.mean(savings):.2f}s, median {statistics.median(savings):.2f}s")
+        print(f"Estimated total saved on this workload: {sum(savings):.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measures how many queries skip the agent and the latency that saves.")
+    parser.add_argument("queries_file", help="Text file with one real user query per line")
+    parser.add_argument("--live", action="store_true", help="Also time the routed queries through the agent and directly (needs Jira and Azure credentials)")
+    args = parser.parse_args()
+    benchmark(load_queries(args.queries_file), live=args.live)